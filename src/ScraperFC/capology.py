@@ -6,21 +6,51 @@ from selenium.webdriver.common.by import By
 from selenium.common.exceptions import StaleElementReferenceException
 import pandas as pd
 import requests
-from bs4 import BeautifulSoup
 from io import StringIO
 
 from ScraperFC.scraperfc_exceptions import InvalidCurrencyException, InvalidLeagueException, \
     InvalidYearException
-from ScraperFC.utils import get_module_comps
+from ScraperFC.utils import get_module_comps, ResponseCache, SeasonCatalog, rate_limit, make_soup,\
+    response_content
 
 comps = get_module_comps("CAPOLOGY")
 
 class Capology():
+    """ Scrapes data from Capology.
+
+    :param cache: Response cache to read pages through (default: None, no caching). Salary tables
+        are loaded interactively with Selenium and are never cached.
+    :type cache: ResponseCache | None
+    :param season_ttl: Seconds to keep each league's valid seasons in ``season_catalog`` before
+        fetching them again, or None to keep them for the lifetime of the object (default: 1 day)
+    :type season_ttl: float | None
+    :raises TypeError: If ``cache`` is not a ResponseCache or None, or ``season_ttl`` is not a
+        number or None
+    :raises ValueError: If ``season_ttl`` is negative
+    """
 
     # ==============================================================================================
-    def __init__(self) -> None:
+    def __init__(
+            self, cache: ResponseCache | None = None, season_ttl: float | None = 24 * 60 * 60
+    ) -> None:
+        if cache is not None and not isinstance(cache, ResponseCache):
+            raise TypeError('`cache` must be a ResponseCache or None.')
+        self.cache = cache
+        self.season_catalog = SeasonCatalog(ttl=season_ttl)
         self.valid_currencies = ['eur', 'gbp', 'usd']
 
+    # ==============================================================================================
+    def _get_content(self, url: str) -> bytes:
+        """ Private, gets a page's content through the cache.
+        """
+        def _fetch() -> bytes:
+            rate_limit(url)
+            return response_content(requests.get(url))
+
+        if self.cache is None:
+            return _fetch()
+        return self.cache.get_or_fetch(url, _fetch)  # type: ignore
+
     # ==============================================================================================
     def _webdriver_init(self) -> None:
         """ Initializes a new webdriver
@@ -73,12 +103,20 @@ class Capology():
         if league not in comps.keys():
             raise InvalidLeagueException(league, 'Capology', list(comps.keys()))
 
-        soup = BeautifulSoup(requests.get(self.get_league_url(league)).content, 'html.parser')
-        year_dropdown_tags = soup.find('select', {'id': 'nav-submenu2'})\
-            .find_all('option', value=True)  # type: ignore
-        seasons = [x.text for x in year_dropdown_tags]
+        return list(self._get_season_paths(league))
 
-        return seasons
+    # ==============================================================================================
+    def _get_season_paths(self, league: str) -> dict[str, str]:
+        """ Private, gets the URL path of each season of the league from the year dropdown on the
+        league page. Kept in ``season_catalog``.
+        """
+        def _fetch() -> dict[str, str]:
+            soup = make_soup(self._get_content(self.get_league_url(league)))
+            year_dropdown_tags = soup.find('select', {'id': 'nav-submenu2'})\
+                .find_all('option', value=True)  # type: ignore
+            return {x.text: x['value'] for x in year_dropdown_tags}
+
+        return self.season_catalog.get_or_fetch(league, _fetch)
 
     # ==============================================================================================
     def get_season_url(self, year: str, league: str) -> str:
@@ -99,12 +137,7 @@ class Capology():
         if year not in valid_seasons:
             raise InvalidYearException(year, league, valid_seasons)
 
-        soup = BeautifulSoup(requests.get(self.get_league_url(league)).content, 'html.parser')
-        year_dropdown_tags = soup.find('select', {'id': 'nav-submenu2'})\
-            .find_all('option', value=True)  # type: ignore
-        value = [x['value'] for x in year_dropdown_tags if x.text == year][0]
-
-        return f'https://capology.com{value}'
+        return f'https://capology.com{self._get_season_paths(league)[year]}'
 
     # ==============================================================================================
     def scrape_salaries(self, year: str, league: str, currency: str) -> pd.DataFrame:
@@ -129,7 +162,9 @@ class Capology():
 
         self._webdriver_init()
         try:
-            self.driver.get(self.get_season_url(year, league))
+            season_url = self.get_season_url(year, league)
+            rate_limit(season_url)
+            self.driver.get(season_url)
 
             # -- Show 100 players per page ---------------------------------------------------------
             done = False
@@ -150,22 +185,22 @@ class Capology():
 
             # -- Visit all of the player pages and get the salary tables ---------------------------
             pages_visited = list()
-            df = pd.DataFrame()
-            current_page = BeautifulSoup(self.driver.page_source, "html.parser")\
+            tables = list()
+            current_page = make_soup(self.driver.page_source)\
                 .find("li", {"class": "page-item active"}).text  # type: ignore
             while current_page not in pages_visited:
                 pages_visited.append(current_page)
 
-                # Get the salary table from the current page and and it df
+                # Get the salary table from the current page
                 table_el = self.driver.find_element(By.ID, "table")
-                temp = pd.read_html(StringIO(table_el.get_attribute("outerHTML")))[0]
-                df = pd.concat([df, temp], axis=0, ignore_index=True)
+                tables.append(pd.read_html(StringIO(table_el.get_attribute("outerHTML")))[0])
 
                 # Go the next page
                 next_btn = self.driver.find_element(By.LINK_TEXT, "Next")
                 self.driver.execute_script('arguments[0].click()', next_btn)
-                current_page = BeautifulSoup(self.driver.page_source, "html.parser")\
+                current_page = make_soup(self.driver.page_source)\
                     .find("li", {"class": "page-item active"}).text  # type: ignore
+            df = pd.concat(tables, axis=0, ignore_index=True)
 
             # Get the cleaned column names ---------------------------------------------------------
             table_header = table_el.find_element(By.TAG_NAME, "thead")
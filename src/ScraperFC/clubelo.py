@@ -2,13 +2,25 @@ from datetime import datetime as dt
 from io import StringIO
 import pandas as pd
 import requests
+from .utils import ResponseCache, rate_limit, response_content
 
 
 class ClubElo:
+    """ Scrapes data from the ClubElo API.
+
+    :param cache: Response cache to read API responses through (default: None, no caching)
+    :type cache: ResponseCache | None
+    :raises TypeError: If ``cache`` is not a ResponseCache or None
+    """
 
     # ==============================================================================================
-    @staticmethod
-    def _clubelo_query(url: str) -> pd.DataFrame:
+    def __init__(self, cache: ResponseCache | None = None) -> None:
+        if cache is not None and not isinstance(cache, ResponseCache):
+            raise TypeError("`cache` must be a ResponseCache or None.")
+        self.cache = cache
+
+    # ==============================================================================================
+    def _clubelo_query(self, url: str) -> pd.DataFrame:
         """ Query ClubElo API and return as DataFrame
 
         :param url: ClubElo API URL to query
@@ -19,8 +31,12 @@ class ClubElo:
         if not isinstance(url, str):
             raise TypeError("`url` must be a string.")
 
-        r = requests.get(url)
-        return pd.read_csv(StringIO(r.text))
+        def _fetch() -> bytes:
+            rate_limit(url)
+            return response_content(requests.get(url))
+
+        content = _fetch() if self.cache is None else self.cache.get_or_fetch(url, _fetch)
+        return pd.read_csv(StringIO(content.decode("utf-8")))  # type: ignore
 
     # ==============================================================================================
     @staticmethod
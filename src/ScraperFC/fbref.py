@@ -1,17 +1,20 @@
 import re
-import time
-from io import StringIO
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 import pandas as pd
 from bs4 import BeautifulSoup
 from tqdm import tqdm
-from botasaurus.browser import browser, ElementWithSelectorNotFoundException
+from typing import Any, Iterable, Iterator
+from botasaurus.browser import Driver, ElementWithSelectorNotFoundException
 
 from .scraperfc_exceptions import InvalidLeagueException, InvalidYearException,\
     NoMatchLinksException
-from .utils import get_module_comps
-from .fbref_scrape_match_helpers import _get_date, _get_stage, _get_team_names, _get_team_ids,\
-    _get_goals, _get_player_stats, _get_shots, _get_officials
+from .utils import get_module_comps, BrowserPool, CheckpointStore, ResponseCache, SeasonCatalog,\
+    rate_limit, set_rate_limit, remove_rate_limit, get_rate_limit, make_soup
+from .fbref_scrape_match_helpers import _index_match_page, _get_date, _get_stage,\
+    _get_team_names, _get_team_ids, _get_goals, _get_player_stats, _get_shots, _get_officials
 from .fbref_match import FBrefMatch
+from .fbref_helpers import _read_table, _get_match_id_from_url, _get_row_links
 from .fbref_scrape_stats_helpers import _scrape_big5_stats, _scrape_not_big5_stats
 
 stats_categories = {
@@ -28,34 +31,126 @@ stats_categories = {
     "misc": {"url": "misc", "html": "misc"},
 }
 
+batch_job_types = ["matches", "stats", "league table"]
+
 comps = get_module_comps("FBREF")
 
 
 class FBref:
+    """ Scrapes data from FBref.
+
+    Pages are loaded in a pool of warm browser sessions that is kept open for the lifetime of the
+    object. Call ``close()`` (or use the object as a context manager) when you are done to shut the
+    browsers down.
+
+    :param wait_time: Minimum seconds between page loads, to respect FBref's rate limit
+        (default: 6). This sets the process-wide rate limit for fbref.com, so it is shared by all
+        FBref objects and threads. The limit is only replaced if it is different, so creating
+        more FBref objects with the same ``wait_time`` doesn't reset it. 0 removes the limit.
+    :type wait_time: int
+    :param pool_size: Number of browser sessions to keep open (default: 1)
+    :type pool_size: int
+    :param cache: Response cache to read pages through (default: None, no caching)
+    :type cache: ResponseCache | None
+    :param season_ttl: Seconds to keep each league's valid seasons in ``season_catalog`` before
+        fetching them again, or None to keep them for the lifetime of the object (default: 1 day)
+    :type season_ttl: float | None
+    :raises TypeError: If ``wait_time`` is not a number, ``cache`` is not a ResponseCache or None,
+        or ``season_ttl`` is not a number or None
+    :raises ValueError: If ``wait_time`` or ``season_ttl`` is negative
+    """
+
     # ==============================================================================================
-    def __init__(self, wait_time: int = 6) -> None:
+    def __init__(
+            self, wait_time: int = 6, pool_size: int = 1, cache: ResponseCache | None = None,
+            season_ttl: float | None = 24 * 60 * 60
+    ) -> None:
+        if cache is not None and not isinstance(cache, ResponseCache):
+            raise TypeError("`cache` must be a ResponseCache or None.")
+        if not isinstance(wait_time, (int, float)):
+            raise TypeError("`wait_time` must be a number.")
+        if wait_time < 0:
+            raise ValueError("`wait_time` must not be negative.")
         # FBref rate limits bots -- https://www.sports-reference.com/bot-traffic.html
         self.wait_time = wait_time
-
-    # ==============================================================================================
-    @staticmethod
-    def _get_soup(url: str) -> BeautifulSoup:
-        """ Private, gets soup using botasaurus. """
-        @browser(
-            headless=False, block_images_and_css=False,
+        if wait_time == 0:
+            remove_rate_limit("fbref.com")
+        else:
+            set_rate_limit("fbref.com", calls=1, period=wait_time)
+        self.cache = cache
+        self.season_catalog = SeasonCatalog(ttl=season_ttl)
+        self._browser_pool = BrowserPool(
+            size=pool_size, headless=False, block_images_and_css=False,
             wait_for_complete_page_load=False,
-            output=None, create_error_logs=False,
         )
-        def _(driver, url):  # type: ignore
+
+    # ==============================================================================================
+    def __enter__(self) -> "FBref":
+        return self
+
+    # ==============================================================================================
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    # ==============================================================================================
+    def close(self) -> None:
+        """ Shuts down the browser sessions used by this scraper.
+        """
+        self._browser_pool.close()
+
+    # ==============================================================================================
+    def _get_html(self, url: str) -> str:
+        """ Private, gets page HTML using a pooled botasaurus session. Safe to call from multiple
+        threads, each call borrows its own session.
+        """
+        def _(driver: Driver) -> str:
+            rate_limit(url)
             driver.google_get(url)
             while True:
                 try:
                     driver.wait_for_element("body.fb", wait=10)
                     break
                 except ElementWithSelectorNotFoundException:
+                    rate_limit(url)  # reloads count against the rate limit too
                     driver.reload()
-            return BeautifulSoup(driver.page_html, "html.parser")
-        return _(url)
+            return driver.page_html
+
+        if self.cache is None:
+            return self._browser_pool.run(_)
+        return self.cache.get_or_fetch(url, lambda: self._browser_pool.run(_))\
+            .decode("utf-8")  # type: ignore
+
+    # ==============================================================================================
+    def _get_soup(self, url: str) -> BeautifulSoup:
+        """ Private, gets soup using a pooled botasaurus session. """
+        return make_soup(self._get_html(url))
+
+    # ==============================================================================================
+    def _prefetch_html(self, urls: list[str]) -> Iterator[tuple[str, str]]:
+        """ Private, yields ``(url, html)`` in the order of ``urls`` while loading the next pages
+        in the background.
+
+        One page is loaded per browser session in the pool. At most two pages per session are
+        loaded ahead of the consumer, so memory stays bounded if parsing falls behind.
+        """
+        lookahead = 2 * self._browser_pool.size
+        executor = ThreadPoolExecutor(max_workers=self._browser_pool.size)
+        pending: deque[tuple[str, Future]] = deque()
+        remaining = iter(urls)
+        try:
+            for url in remaining:
+                pending.append((url, executor.submit(self._get_html, url)))
+                if len(pending) >= lookahead:
+                    break
+            while len(pending) > 0:
+                url, future = pending.popleft()
+                html = future.result()
+                next_url = next(remaining, None)
+                if next_url is not None:
+                    pending.append((next_url, executor.submit(self._get_html, next_url)))
+                yield url, html
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
 
     # ==============================================================================================
     def get_valid_seasons(self, league: str) -> dict:
@@ -76,15 +171,29 @@ class FBref:
 
         url = comps[league]["FBREF"]["history url"]  # type: ignore
 
-        soup = self._get_soup(url)
+        def _fetch() -> dict:
+            soup = self._get_soup(url)
+            return {
+                x.text: "https://fbref.com" + x.find("a")["href"]
+                for x in soup.find_all("th", {"data-stat": re.compile("year"), "scope": "row"})
+                if x.find("a")
+            }
 
-        valid_seasons = {
-            x.text: "https://fbref.com" + x.find("a")["href"]
-            for x in soup.find_all("th", {"data-stat": re.compile("year"), "scope": "row"})
-            if x.find("a")
-        }
+        return self.season_catalog.get_or_fetch(league, _fetch)
 
-        return valid_seasons
+    # ==============================================================================================
+    def _get_fixtures_url(self, year: str, league: str) -> str:
+        """ Private, URL of the Scores & Fixtures page of a league season. """
+        valid_seasons = self.get_valid_seasons(league)
+        if not isinstance(year, str):
+            raise TypeError("`year` must be a string.")
+        if year not in valid_seasons:
+            raise InvalidYearException(year, league, list(valid_seasons.keys()))
+
+        season_url = valid_seasons[year]
+        fixtures_url = season_url.split("/")
+        fixtures_url.insert(-1, "schedule")
+        return "/".join(fixtures_url).replace("Stats", "Scores-and-Fixtures")
 
     # ==============================================================================================
     def get_match_links(self, year: str, league: str) -> list[str]:
@@ -100,18 +209,7 @@ class FBref:
         :return: FBref links to all matches for the chosen league season
         :rtype: list[str]
         """
-        valid_seasons = self.get_valid_seasons(league)
-        if not isinstance(year, str):
-            raise TypeError("`year` must be a string.")
-        if year not in valid_seasons:
-            raise InvalidYearException(year, league, list(valid_seasons.keys()))
-
-        # Get the URL for the fixtures page
-        season_url = valid_seasons[year]
-        fixtures_url = season_url.split("/")
-        fixtures_url.insert(-1, "schedule")
-        fixtures_url = "/".join(fixtures_url).replace("Stats", "Scores-and-Fixtures")
-
+        fixtures_url = self._get_fixtures_url(year, league)
         soup = self._get_soup(fixtures_url)
 
         match_els = [
@@ -122,13 +220,57 @@ class FBref:
 
         match_urls = ["https://fbref.com" + el.find("a").get("href") for el in match_els]
 
-        match_urls = list(set(match_urls))  # remove duplicate links
+        match_urls = list(dict.fromkeys(match_urls))  # remove duplicate links, keeping page order
 
         if len(match_urls) == 0:
             raise NoMatchLinksException(year, league, fixtures_url)
 
         return match_urls
 
+    # ==============================================================================================
+    def scrape_schedule(self, year: str, league: str) -> pd.DataFrame:
+        """Scrapes the Scores & Fixtures table of the chosen league season
+
+        The table has a row for every fixture of the season, played or not, with the columns that
+        FBref shows for the league (e.g. date, teams, score, xG, attendance, venue and referee).
+        A "Match URL" column is added with the link to each played match, the same links that
+        ``get_match_links()`` returns, so jobs that only need the fixture details don't have to
+        load any match pages.
+
+        :param year: .. include:: ./arg_docstrings/year_fbref.rst
+        :type year: str
+        :param league: .. include:: ./arg_docstrings/league.rst
+        :type league: str
+        :raises TypeError: If any of the parameters are the wrong type.
+        :raises InvalidYearException: If the year is not a valid year for the chosen league.
+        :raises NoMatchLinksException: If there is no fixtures table for the chosen league season.
+        :return: The fixtures, in the order of the page
+        :rtype: pd.DataFrame
+        """
+        fixtures_url = self._get_fixtures_url(year, league)
+        soup = self._get_soup(fixtures_url)
+
+        schedules = list()
+        for table_tag in soup.find_all("table", {"id": re.compile("^sched")}):
+            df, _ = _read_table(table_tag)
+            links = _get_row_links(table_tag, "score")
+            df["Match URL"] = [
+                "https://fbref.com" + link if link is not None and "/matches/" in link else None
+                for link in links
+            ]
+            schedules.append(df)
+        if len(schedules) == 0:
+            raise NoMatchLinksException(year, league, fixtures_url)
+        schedule = pd.concat(schedules, ignore_index=True)
+
+        # Drop the spacer rows and the header rows that are repeated down the table, and the
+        # fixtures that are in more than one of the tables
+        details = schedule.drop(columns="Match URL")
+        is_spacer = details.isna().all(axis=1)
+        is_header = (details == details.columns).mean(axis=1) > 0.5
+        schedule = schedule[~is_spacer & ~is_header]
+        return schedule.drop_duplicates().reset_index(drop=True)
+
     # ==============================================================================================
     def scrape_league_table(self, year: str, league: str) -> list[pd.DataFrame]:
         """Scrapes the league table of the chosen league season
@@ -155,7 +297,8 @@ class FBref:
         soup = self._get_soup(url)
 
         tables = list()
-        for df in pd.read_html(StringIO(str(soup))):
+        for table_tag in soup.find_all("table"):
+            df, _ = _read_table(table_tag)
             if ("Rk" in df.columns) and ("Squad" in df.columns):
                 # Remove all-NaN rows
                 df = df.dropna(axis=0, how="all").reset_index(drop=True)
@@ -176,16 +319,20 @@ class FBref:
         """
         if not isinstance(link, str):
             raise TypeError("`link` must be a string.")
-        soup = self._get_soup(link)
+        return self._parse_match(link, self._get_soup(link))
 
-        date = _get_date(soup)
-        stage = _get_stage(soup)
-        home_name, away_name = _get_team_names(soup)
-        home_id, away_id = _get_team_ids(soup)
-        home_goals, away_goals = _get_goals(soup)
-        player_stats = _get_player_stats(soup)
-        shots = _get_shots(soup)
-        officials = _get_officials(soup)
+    # ==============================================================================================
+    def _parse_match(self, link: str, soup: BeautifulSoup) -> FBrefMatch:
+        """ Private, extracts the match data from the soup of a match page. """
+        page = _index_match_page(soup)
+        date = _get_date(page)
+        stage = _get_stage(page)
+        home_name, away_name = _get_team_names(page)
+        home_id, away_id = _get_team_ids(page)
+        home_goals, away_goals = _get_goals(page)
+        player_stats = _get_player_stats(page, (home_id, away_id))
+        shots = _get_shots(page, (home_id, away_id))
+        officials = _get_officials(page)
 
         return FBrefMatch(
             url=link, date=date, stage=stage, home_team=home_name, away_team=away_name,
@@ -197,30 +344,117 @@ class FBref:
         )
 
     # ==============================================================================================
-    def scrape_matches(self, year: str, league: str) -> list[FBrefMatch]:
+    def scrape_matches(
+            self, year: str, league: str, concurrent: bool = False,
+            checkpoint: CheckpointStore | None = None
+    ) -> list[FBrefMatch]:
         """Scrapes the FBref standard stats page of the chosen league season.
 
         Works by gathering all of the match URL's from the homepage of the chosen league season on
         FBref and then calling scrape_match() on each one.
 
+        With ``concurrent=True`` the next match pages are loaded in the background (one per browser
+        session in the pool, see ``pool_size``) while the current page is being parsed, so a season
+        takes about as long as the rate limit allows instead of the sum of the load and parse
+        times. Page loads still go through the fbref.com rate limit.
+
+        With a ``checkpoint`` store, each match is saved as soon as it has been scraped and matches
+        that are already in the store are not scraped again, so a run that fails part way through
+        can be resumed by calling this again with the same store.
+
         :param year: .. include:: ./arg_docstrings/year_fbref.rst
         :type year: str
         :param league: .. include:: ./arg_docstrings/league.rst
         :type league: str
+        :param concurrent: Whether to load match pages in the background while parsing (default:
+            False)
+        :type concurrent: bool
+        :param checkpoint: Store to save finished matches to and resume from (default: None)
+        :type checkpoint: CheckpointStore | None
+        :raises TypeError: If ``concurrent`` is not a bool or ``checkpoint`` is not a
+            CheckpointStore or None.
         :return: List of match datas
         :rtype: list[FBrefMatch]
         """
-        matches = list()
+        if not isinstance(concurrent, bool):
+            raise TypeError("`concurrent` must be a bool.")
+        if checkpoint is not None and not isinstance(checkpoint, CheckpointStore):
+            raise TypeError("`checkpoint` must be a CheckpointStore or None.")
+        match_links = self.get_match_links(year, league)
+
+        namespace = f"fbref/matches/{league}/{year}"
+        done = checkpoint.items(namespace) if checkpoint is not None else dict()
+        todo = [link for link in match_links if link not in done]
+
+        matches = self._scrape_links(todo, concurrent)
+        for link, match in tqdm(matches, total=len(todo), desc=f"{year} {league} matches"):
+            done[link] = match
+            if checkpoint is not None:
+                checkpoint.save(namespace, link, match)
+
+        return [done[link] for link in match_links]
+
+    # ==============================================================================================
+    def scrape_new_matches(
+            self, year: str, league: str, known: Iterable[str] | CheckpointStore,
+            concurrent: bool = False
+    ) -> tuple[list[FBrefMatch], set[str]]:
+        """Scrapes only the matches of the chosen league season that haven't been scraped yet.
+
+        Meant for refreshing a season that is in progress: the fixtures page is loaded to get the
+        current match links, and only the matches that aren't in ``known`` are scraped. Matches
+        are compared by their FBref match ID, so links with a different slug still count as known.
+
+        ``known`` can be the match URLs that you already have, or the ``CheckpointStore`` that
+        ``scrape_matches()`` was run with. With a store, the new matches are also saved to it so
+        the next refresh skips them too.
+
+        :param year: .. include:: ./arg_docstrings/year_fbref.rst
+        :type year: str
+        :param league: .. include:: ./arg_docstrings/league.rst
+        :type league: str
+        :param known: Match URLs that have already been scraped, or a store to read them from
+        :type known: Iterable[str] | CheckpointStore
+        :param concurrent: Whether to load match pages in the background while parsing, see
+            ``scrape_matches()`` (default: False)
+        :type concurrent: bool
+        :raises TypeError: If ``concurrent`` is not a bool.
+        :return: (new matches, links of the current matches that were already known)
+        :rtype: tuple[list[FBrefMatch], set[str]]
+        """
+        if not isinstance(concurrent, bool):
+            raise TypeError("`concurrent` must be a bool.")
+        namespace = f"fbref/matches/{league}/{year}"
+        known_links = known.keys(namespace) if isinstance(known, CheckpointStore) else known
+        known_ids = {_get_match_id_from_url(link) for link in known_links}
+
         match_links = self.get_match_links(year, league)
-        for link in tqdm(match_links, desc=f"{year} {league} matches"):
-            start_time = time.time()
-            match = self.scrape_match(link)
-            elapsed = time.time() - start_time
-            if elapsed < self.wait_time:
-                time.sleep(self.wait_time - elapsed)
-            matches.append(match)
+        new_links = [link for link in match_links if _get_match_id_from_url(link) not in known_ids]
+        unchanged = set(match_links) - set(new_links)
+
+        new_matches = list()
+        matches = self._scrape_links(new_links, concurrent)
+        desc = f"{year} {league} new matches"
+        for link, match in tqdm(matches, total=len(new_links), desc=desc):
+            new_matches.append(match)
+            if isinstance(known, CheckpointStore):
+                known.save(namespace, link, match)
 
-        return matches
+        return new_matches, unchanged
+
+    # ==============================================================================================
+    def _scrape_links(
+            self, links: list[str], concurrent: bool
+    ) -> Iterator[tuple[str, FBrefMatch]]:
+        """ Private, yields ``(link, match)`` for each match link, prefetching the pages if
+        ``concurrent``.
+        """
+        if concurrent:
+            for link, html in self._prefetch_html(links):
+                yield link, self._parse_match(link, make_soup(html))
+        else:
+            for link in links:
+                yield link, self.scrape_match(link)
 
     # ==============================================================================================
     def scrape_stats(
@@ -266,27 +500,169 @@ class FBref:
         return stats
 
     # ==============================================================================================
-    def scrape_all_stats(self, year: str, league: str) -> dict:
+    def scrape_all_stats(
+            self, year: str, league: str, checkpoint: CheckpointStore | None = None
+    ) -> dict:
         """Scrapes all stat categories
 
         Runs scrape_stats() for each stats category on dumps the returned tuple
         of dataframes into a dict.
 
+        With a ``checkpoint`` store, each stat category is saved as soon as it has been scraped and
+        categories that are already in the store are not scraped again.
+
         :param year: .. include:: ./arg_docstrings/year_fbref.rst
         :type year: str
         :param league: .. include:: ./arg_docstrings/league.rst
         :type league: str
+        :param checkpoint: Store to save finished categories to and resume from (default: None)
+        :type checkpoint: CheckpointStore | None
+        :raises TypeError: If ``checkpoint`` is not a CheckpointStore or None.
         :return: {stat category: tuple of DataFrame, ...}, Tuple is (squad_stats, opponent_stats,
             player_stats)
         :rtype: dict
         """
+        if checkpoint is not None and not isinstance(checkpoint, CheckpointStore):
+            raise TypeError("`checkpoint` must be a CheckpointStore or None.")
+        namespace = f"fbref/stats/{league}/{year}"
+        done = checkpoint.items(namespace) if checkpoint is not None else dict()
+
         return_package = dict()
         for stat_category in tqdm(stats_categories, desc=f"{year} {league} stats"):
-            start_time = time.time()
-            stats = self.scrape_stats(year, league, stat_category)
-            elapsed = time.time() - start_time
-            if elapsed < self.wait_time:
-                time.sleep(self.wait_time - elapsed)
+            if stat_category in done:
+                stats = done[stat_category]
+            else:
+                stats = self.scrape_stats(year, league, stat_category)
+                if checkpoint is not None:
+                    checkpoint.save(namespace, stat_category, stats)
             return_package[stat_category] = stats
 
         return return_package
+
+    # ==============================================================================================
+    def scrape_batch(
+            self, jobs: list[tuple[str, str, str]], checkpoint: CheckpointStore | None = None,
+            concurrent: bool = False
+    ) -> dict[tuple[str, str, str], Any]:
+        """Scrapes many league seasons as one batch
+
+        Each job is a ``(league, year, job type)`` tuple, where the job type is one of
+        ``batch_job_types``:
+
+        * ``"matches"``, the result of ``scrape_matches()``
+        * ``"stats"``, the result of ``scrape_all_stats()``
+        * ``"league table"``, the result of ``scrape_league_table()``
+
+        Repeated jobs are only run once and every page is loaded at most once across the batch:
+        each league's history page is loaded once, and a match that is in more than one job is
+        only scraped once. The small pages that decide how much work there is (history and
+        fixtures pages) are all loaded first, so invalid leagues and years fail before the long
+        part of the batch starts, and the rest of the pages then go through the fbref.com rate
+        limit back to back. A progress bar with an ETA covers the whole batch.
+
+        With a ``checkpoint`` store, results are saved as they arrive under the same keys as
+        ``scrape_matches()`` and ``scrape_all_stats()`` use, so a failed batch can be resumed by
+        running it again with the same store.
+
+        :param jobs: (league, year, job type) of each job
+        :type jobs: list[tuple[str, str, str]]
+        :param checkpoint: Store to save finished results to and resume from (default: None)
+        :type checkpoint: CheckpointStore | None
+        :param concurrent: Whether to load match pages in the background while parsing, see
+            ``scrape_matches()`` (default: False)
+        :type concurrent: bool
+        :raises TypeError: If any of the parameters are the wrong type.
+        :raises ValueError: If a job type is not valid.
+        :raises InvalidLeagueException: If a league is not valid.
+        :raises InvalidYearException: If a year is not valid for its league.
+        :return: {job: result, ...}
+        :rtype: dict[tuple[str, str, str], Any]
+        """
+        if not isinstance(jobs, list) or \
+                not all(isinstance(job, tuple) and len(job) == 3 for job in jobs):
+            raise TypeError("`jobs` must be a list of (league, year, job type) tuples.")
+        if checkpoint is not None and not isinstance(checkpoint, CheckpointStore):
+            raise TypeError("`checkpoint` must be a CheckpointStore or None.")
+        if not isinstance(concurrent, bool):
+            raise TypeError("`concurrent` must be a bool.")
+        for _, _, job_type in jobs:
+            if job_type not in batch_job_types:
+                raise ValueError(
+                    f'"{job_type}" is not a valid job type. Must be one of {batch_job_types}.'
+                )
+        jobs = list(dict.fromkeys(jobs))
+
+        # Plan the batch: {job: (namespace, all keys, keys left to scrape, pages per key)}
+        plan: dict[tuple[str, str, str], tuple[str, list[str], list[str], int]] = dict()
+        planned_links: set[str] = set()
+        for job in jobs:
+            league, year, job_type = job
+            if job_type == "matches":
+                namespace = f"fbref/matches/{league}/{year}"
+                keys = self.get_match_links(year, league)
+                pages = 1
+            else:
+                valid_seasons = self.get_valid_seasons(league)
+                if not isinstance(year, str):
+                    raise TypeError("`year` must be a string.")
+                if year not in valid_seasons:
+                    raise InvalidYearException(year, league, list(valid_seasons.keys()))
+                if job_type == "stats":
+                    namespace = f"fbref/stats/{league}/{year}"
+                    keys = list(stats_categories.keys())
+                    pages = 2 if "big 5 combined" in league.lower() else 1
+                else:
+                    namespace = f"fbref/league_table/{league}/{year}"
+                    keys = ["league table"]
+                    pages = 1
+            done = set(checkpoint.keys(namespace)) if checkpoint is not None else set()
+            todo = [key for key in keys if key not in done and key not in planned_links]
+            if job_type == "matches":
+                planned_links.update(todo)
+            plan[job] = (namespace, keys, todo, pages)
+
+        total_pages = sum(len(todo) * pages for _, _, todo, pages in plan.values())
+        bucket = get_rate_limit("https://fbref.com/")
+        if bucket is None:
+            eta = "no rate limit set for fbref.com"
+        else:
+            seconds = max(total_pages - bucket.burst, 0) / bucket.rate
+            eta = f"about {tqdm.format_interval(seconds)} at the fbref.com rate limit"
+        tqdm.write(f"FBref batch: {len(jobs)} jobs, {total_pages} pages to load, {eta}.")
+
+        results: dict[tuple[str, str, str], Any] = dict()
+        matches: dict[str, FBrefMatch] = dict()
+        with tqdm(total=total_pages, desc="FBref batch", unit="page") as progress:
+            for job, (namespace, keys, todo, pages) in plan.items():
+                league, year, job_type = job
+                progress.set_postfix_str(f"{year} {league} {job_type}")
+                done = checkpoint.items(namespace) if checkpoint is not None else dict()
+
+                if job_type == "matches":
+                    for link, match in self._scrape_links(todo, concurrent):
+                        matches[link] = match
+                        progress.update(pages)
+                        if checkpoint is not None:
+                            checkpoint.save(namespace, link, match)
+                    # Matches that were scraped by an earlier job in the batch
+                    for link in keys:
+                        if link not in done and link not in todo and checkpoint is not None:
+                            checkpoint.save(namespace, link, matches[link])
+                    done.update(matches)
+                    results[job] = [done[link] for link in keys]
+                elif job_type == "stats":
+                    for stat_category in todo:
+                        done[stat_category] = self.scrape_stats(year, league, stat_category)
+                        progress.update(pages)
+                        if checkpoint is not None:
+                            checkpoint.save(namespace, stat_category, done[stat_category])
+                    results[job] = {stat_category: done[stat_category] for stat_category in keys}
+                else:
+                    if len(todo) > 0:
+                        done["league table"] = self.scrape_league_table(year, league)
+                        progress.update(pages)
+                        if checkpoint is not None:
+                            checkpoint.save(namespace, "league table", done["league table"])
+                    results[job] = done["league table"]
+
+        return results
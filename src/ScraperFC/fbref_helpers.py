@@ -1,6 +1,16 @@
 """ Helper functions for use in multiple functions in the FBref module
 """
 from bs4 import BeautifulSoup, Comment, Tag, NavigableString
+# TextParser isn't part of the public pandas API, but it's what pd.read_html() uses to turn the
+# cell text into a DataFrame, so _read_table() uses it to give exactly the same dtypes and columns.
+# test_read_table_matches_read_html() checks that this still holds for the installed pandas.
+from pandas.io.parsers import TextParser
+import pandas as pd
+import re
+from .utils import make_soup
+
+_RE_WHITESPACE = re.compile(r"[\r\n]+|\s{2,}")
+_ID_PATTERNS = {"team": re.compile(r"/squads/([^/]+)"), "player": re.compile(r"/players/([^/]+)")}
 
 
 # ==================================================================================================
@@ -25,6 +35,17 @@ def _get_team_id_from_url(url: str) -> str:
         raise ValueError(f"'squads' chunk not found in split URL {pieces}")
     return pieces[squads_idx + 1]
 
+# ==================================================================================================
+def _get_match_id_from_url(url: str) -> str:
+    pieces = url.split("/")
+    matches_idx = None
+    for i, piece in enumerate(pieces):
+        if piece == "matches":
+            matches_idx = i
+    if matches_idx is None:
+        raise ValueError(f"'matches' chunk not found in split URL {pieces}")
+    return pieces[matches_idx + 1]
+
 # ==================================================================================================
 def _find_commented_out_tables(soup: BeautifulSoup) -> list[str]:
     comments = soup.find_all(string = lambda el: isinstance(el, Comment))
@@ -32,20 +53,67 @@ def _find_commented_out_tables(soup: BeautifulSoup) -> list[str]:
     return table_comments
 
 # ==================================================================================================
-def _get_ids_from_table(table_tag: Tag, table_type: str) -> list[str]:
-    valid_types = ["team", "player"]
-    if table_type not in valid_types:
-        raise ValueError(f"Invalid table type: {table_type}. Valid types are {valid_types}")
-    rows = table_tag.find_all("tr")
-    urls = [el.find("a")["href"] for el in rows if el.find("a")]
-    if table_type == "team":
-        ids = [_get_team_id_from_url(url) for url in urls]
-    elif table_type == "player":
-        ids = [_get_player_id_from_url(url) for url in urls]
-    return ids
+def _get_ids_from_urls(urls: list[str | None], table_type: str) -> list[str | None]:
+    """ Private, team or player IDs from a list of URLs. URLs that are None or aren't a team/player
+    link give None, so the IDs stay lined up with the URLs.
+    """
+    if table_type not in _ID_PATTERNS:
+        raise ValueError(f"Invalid table type: {table_type}. Valid types are {list(_ID_PATTERNS)}")
+    pattern = _ID_PATTERNS[table_type]
+    return [
+        match.group(1) if url is not None and (match := pattern.search(url)) else None
+        for url in urls
+    ]
+
+class _CommentedTables:
+    """ Lazy index of the tables that an FBref page has commented out
+
+    The page's comments are scanned once, the first time a table is looked up, and mapped by the
+    IDs of the tables they contain. Only the comment holding the requested table is parsed, and
+    parsed comments are kept for later lookups on the same page.
+
+    Params:
+        soup: Soup of the FBref page
+    """
+    _TABLE_ID_RE = re.compile(r"<table\b[^>]*?(?<![\w-])id=[\"']([^\"']+)[\"']")
+
+    # ==============================================================================================
+    def __init__(self, soup: BeautifulSoup) -> None:
+        self._soup = soup
+        self._comments: dict[str, str] | None = None  # table ID -> comment text
+        self._parsed: dict[str, BeautifulSoup] = dict()  # comment text -> soup
+
+    # ==============================================================================================
+    def _index(self) -> dict[str, str]:
+        if self._comments is None:
+            self._comments = dict()
+            for comment in _find_commented_out_tables(self._soup):
+                for table_id in self._TABLE_ID_RE.findall(comment):
+                    self._comments.setdefault(table_id, comment)
+        return self._comments
+
+    # ==============================================================================================
+    def find(self, soup_find_args: dict) -> Tag | NavigableString | None:
+        """ Find a commented out table. ``soup_find_args`` are the same as for
+        ``_get_stats_table_tag()`` and the ID in ``attrs`` can be a string or a regex.
+        """
+        id_filter = soup_find_args.get("attrs", dict()).get("id")
+        for table_id, comment in self._index().items():
+            if isinstance(id_filter, str) and table_id != id_filter:
+                continue
+            if isinstance(id_filter, re.Pattern) and not id_filter.search(table_id):
+                continue
+            if comment not in self._parsed:
+                self._parsed[comment] = make_soup(comment)
+            table_tag = self._parsed[comment].find(**soup_find_args)
+            if table_tag is not None:
+                return table_tag
+        return None
 
 # ==================================================================================================
-def _get_stats_table_tag(soup: BeautifulSoup, soup_find_args: dict) -> Tag | NavigableString | None:
+def _get_stats_table_tag(
+        soup: BeautifulSoup, soup_find_args: dict, commented_tables: _CommentedTables | None = None
+) -> Tag | NavigableString | None:
     """ Find a stats table in the soup from an FBref page
 
     If no table is explicity found, will search for a commented out tables. (Champions League
@@ -54,15 +122,185 @@ def _get_stats_table_tag(soup: BeautifulSoup, soup_find_args: dict) -> Tag | Nav
     Params:
         soup
         soup_find_args: dict passed to soup.find(). Will probably be {'name': str, 'attrs': dict}
+        commented_tables: Index of the commented out tables of ``soup``. Pass the same index for
+            every table looked up on a page so the comments are only scanned and parsed once.
     """
     table_tag = soup.find(**soup_find_args)
 
     # If no tag was found, try looking in commented out tables
     if table_tag is None:
-        # Try to find commented out table
-        table_comments = _find_commented_out_tables(soup)
-        for comment in table_comments:
-            comment_soup = BeautifulSoup(comment, "html.parser")
-            table_tag = comment_soup.find(**soup_find_args)
+        if commented_tables is None:
+            commented_tables = _CommentedTables(soup)
+        table_tag = commented_tables.find(soup_find_args)
 
     return table_tag
+
+# ==================================================================================================
+def _is_hidden(tag: Tag) -> bool:
+    """ Private, whether an element is hidden with an inline ``display:none`` style """
+    return "display:none" in tag.get("style", "").replace(" ", "")  # type: ignore
+
+# ==================================================================================================
+def _child_tags(tag: Tag, names: tuple[str, ...]) -> list[Tag]:
+    """ Private, the direct children of a tag with one of the given names. Iterating the children
+    is a lot cheaper than ``find_all(names, recursive=False)`` for the thousands of rows and cells
+    in a stats table.
+    """
+    return [child for child in tag.children if isinstance(child, Tag) and child.name in names]
+
+# ==================================================================================================
+def _first_href(tag: Tag) -> str | None:
+    """ Private, href of the first link inside a tag """
+    for el in tag.descendants:
+        if isinstance(el, Tag) and el.name == "a":
+            return el["href"]  # type: ignore
+    return None
+
+# ==================================================================================================
+def _cell_text(cell: Tag, hidden: set[int]) -> str:
+    """ Private, visible text of a table cell with extra whitespace collapsed. ``hidden`` holds the
+    ``id()`` of the hidden elements in the table. Like ``pd.read_html()``, ``<br>`` tags count as
+    line breaks, so ``a<br>b`` reads as ``"a b"``.
+    """
+    parts = list()
+    for el in cell.descendants:
+        if isinstance(el, Tag):
+            if el.name == "br":
+                parts.append("\n")
+        elif isinstance(el, NavigableString) and not isinstance(el, Comment) \
+                and not (hidden and any(id(parent) in hidden for parent in el.parents)):
+            parts.append(el)
+    return _RE_WHITESPACE.sub(" ", "".join(parts).strip())
+
+# ==================================================================================================
+def _expand_rows(
+        rows: list[Tag], remainder: list, overflow: bool, hidden: set[int]
+) -> tuple[list[list[str]], list]:
+    """ Private, turns ``<tr>`` tags into rows of cell text, copying cells with a ``colspan`` or
+    ``rowspan`` into the cells that they span.
+
+    ``remainder`` holds the cells that still span down from the previous rows, as
+    (column, text, rows left) tuples. If ``overflow`` is False, rows that only exist because of a
+    rowspan are added at the end.
+    """
+    texts = list()
+    for tr in rows:
+        row: list[str] = list()
+        next_remainder = list()
+        index = 0
+        for cell in _child_tags(tr, ("td", "th")):
+            if id(cell) in hidden:
+                continue
+            while remainder and remainder[0][0] <= index:
+                prev_i, prev_text, prev_rowspan = remainder.pop(0)
+                row.append(prev_text)
+                if prev_rowspan > 1:
+                    next_remainder.append((prev_i, prev_text, prev_rowspan - 1))
+                index += 1
+            text = _cell_text(cell, hidden)
+            rowspan = int(cell.get("rowspan") or 1)  # type: ignore
+            colspan = int(cell.get("colspan") or 1)  # type: ignore
+            for _ in range(colspan):
+                row.append(text)
+                if rowspan > 1:
+                    next_remainder.append((index, text, rowspan - 1))
+                index += 1
+        for prev_i, prev_text, prev_rowspan in remainder:
+            row.append(prev_text)
+            if prev_rowspan > 1:
+                next_remainder.append((prev_i, prev_text, prev_rowspan - 1))
+        texts.append(row)
+        remainder = next_remainder
+
+    if not overflow:
+        while remainder:
+            texts.append([text for _, text, _ in remainder])
+            remainder = [(i, text, rowspan - 1) for i, text, rowspan in remainder if rowspan > 1]
+    return texts, remainder
+
+# ==================================================================================================
+def _table_rows(table_tag: Tag) -> tuple[list[Tag], list[Tag], list[Tag], set[int]]:
+    """ Private, splits a table into the header, body and footer rows that read_html keeps.
+
+    Hidden rows are left out. Also returns the ``id()`` of the hidden elements in the table.
+    """
+    head_rows, body_rows, foot_rows = list(), list(), list()
+    for child in _child_tags(table_tag, ("thead", "tbody", "tfoot", "tr")):
+        if child.name == "tr":
+            body_rows.append(child)
+        else:
+            section = {"thead": head_rows, "tbody": body_rows, "tfoot": foot_rows}[child.name]
+            section.extend(_child_tags(child, ("tr",)))
+
+    hidden = {id(el) for el in table_tag.find_all(style=True) if _is_hidden(el)}
+    head_rows = [tr for tr in head_rows if id(tr) not in hidden]
+    body_rows = [tr for tr in body_rows if id(tr) not in hidden]
+    foot_rows = [tr for tr in foot_rows if id(tr) not in hidden]
+    if len(head_rows) == 0:
+        # Without a <thead>, rows of only <th> cells at the top of the body are the header
+        while body_rows and all(
+            cell.name == "th" for cell in _child_tags(body_rows[0], ("td", "th"))
+        ):
+            head_rows.append(body_rows.pop(0))
+    return head_rows, body_rows, foot_rows, hidden
+
+# ==================================================================================================
+def _get_row_links(table_tag: Tag, data_stat: str) -> list[str | None]:
+    """ Private, href of the link in the ``data-stat`` cell of each row of a table
+
+    The list lines up with the rows of the DataFrame that ``_read_table()`` makes from the table.
+    Rows without that cell, or where the cell has no link, get None.
+
+    Params:
+        table_tag: The <table> tag
+        data_stat: ``data-stat`` attribute of the cell holding the link
+    """
+    _, body_rows, foot_rows, _ = _table_rows(table_tag)
+    links = list()
+    for tr in body_rows + foot_rows:
+        cell = next(
+            (c for c in _child_tags(tr, ("td", "th")) if c.get("data-stat") == data_stat), None
+        )
+        links.append(_first_href(cell) if cell is not None else None)
+    return links
+
+# ==================================================================================================
+def _read_table(table_tag: Tag) -> tuple[pd.DataFrame, list[str | None]]:
+    """ Converts a table tag to a DataFrame
+
+    Gives the same DataFrame as ``pd.read_html(StringIO(str(table_tag)))[0]``, including the
+    MultiIndex columns of tables with two header rows, but reads the cells straight from the tag
+    instead of serializing the table and parsing it again.
+
+    Also returns the href of the first link in each row of the DataFrame, or None for rows
+    without a link (e.g. the header rows repeated down FBref tables), so team and player IDs can be
+    read with ``_get_ids_from_urls()`` without a second pass over the table and always line up
+    with the DataFrame's rows.
+
+    Params:
+        table_tag: The <table> tag
+    """
+    head_rows, body_rows, foot_rows, hidden = _table_rows(table_tag)
+
+    hrefs = [_first_href(tr) for tr in body_rows + foot_rows]
+
+    head, remainder = _expand_rows(head_rows, list(), True, hidden)
+    body, remainder = _expand_rows(body_rows, remainder, len(foot_rows) > 0, hidden)
+    foot, _ = _expand_rows(foot_rows, remainder, False, hidden)
+
+    header: int | list[int] | None = None
+    if len(head) == 1:
+        header = 0
+    elif len(head) > 1:
+        header = [i for i, row in enumerate(head) if any(text for text in row)]
+    data = head + body + foot
+    if len(data) == 0:
+        return pd.DataFrame(), list()
+    width = max(len(row) for row in data)
+    data = [row + [""] * (width - len(row)) for row in data]
+
+    with TextParser(data, header=header, thousands=",") as parser:
+        df = parser.read()
+    # Rows that only exist because of a rowspan at the bottom of the table have no <tr> of their own
+    hrefs += [None] * (len(df) - len(hrefs))
+    return df, hrefs
@@ -1,5 +1,90 @@
+import json
+import shutil
 import pandas as pd
 from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+from .fbref_helpers import _get_match_id_from_url
+from .utils import import_pyarrow
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+SCALAR_FIELDS = [
+    "url", "date", "stage", "home_team", "away_team", "home_id", "away_id", "home_goals",
+    "away_goals", "referee", "ar1", "ar2", "fourth_official", "var",
+]
+TABLE_FIELDS = ["home_player_stats", "away_player_stats", "all_shots", "home_shots", "away_shots"]
+
+
+# ==================================================================================================
+def _df_to_arrow(df: pd.DataFrame) -> "pa.Table":
+    """ Private, converts a DataFrame to an Arrow table
+
+    Arrow column names have to be unique strings, so MultiIndex columns are flattened to
+    "level 0 / level 1" and the original column labels are kept in the schema metadata.
+    """
+    pa, _ = import_pyarrow()
+    labels = [list(c) if isinstance(c, tuple) else c for c in df.columns]
+    names: list[str] = list()
+    for c in df.columns:
+        name = " / ".join(str(x) for x in c) if isinstance(c, tuple) else str(c)
+        while name in names:
+            name += "_"
+        names.append(name)
+
+    flat_df = df.copy(deep=False)
+    flat_df.columns = names
+    table = pa.Table.from_pandas(flat_df, preserve_index=False)
+    metadata = {**(table.schema.metadata or dict()), b"scraperfc.columns": json.dumps(labels)}
+    return table.replace_schema_metadata(metadata)
+
+# ==================================================================================================
+def _arrow_to_df(table: "pa.Table") -> pd.DataFrame:
+    """ Private, converts an Arrow table made by _df_to_arrow() back to a DataFrame """
+    df = table.to_pandas()
+    metadata = table.schema.metadata or dict()
+    if b"scraperfc.columns" in metadata:
+        labels = json.loads(metadata[b"scraperfc.columns"])
+        if any(isinstance(label, list) for label in labels):
+            df.columns = pd.MultiIndex.from_tuples([tuple(label) for label in labels])
+        else:
+            df.columns = labels
+    return df
+
+# ==================================================================================================
+def _group_tables(frames: dict[str, pd.DataFrame]) -> dict[str, Any]:
+    """ Private, turns {table type: DataFrame} into the table attributes of an FBrefMatch """
+    attributes: dict[str, Any] = {"home_player_stats": dict(), "away_player_stats": dict()}
+    for table_type, df in frames.items():
+        field, _, key = table_type.partition(".")
+        if key:
+            attributes[field][key] = df
+        else:
+            attributes[field] = df
+    return attributes
+
+
+class _LazyTables:
+    """ Private, loads the tables of one match from a season written by write_season_parquet() """
+
+    # ==============================================================================================
+    def __init__(self, directory: Path, match_id: str, table_types: list[str]) -> None:
+        self.directory = directory
+        self.match_id = match_id
+        self.table_types = table_types
+
+    # ==============================================================================================
+    def __call__(self, field: str) -> Any:
+        _, pq = import_pyarrow()
+        frames = {
+            table_type: _arrow_to_df(pq.read_table(
+                self.directory / table_type / f"match_id={self.match_id}" / "part-0.parquet"
+            ))
+            for table_type in self.table_types
+            if table_type.partition(".")[0] == field
+        }
+        return _group_tables(frames).get(field, pd.DataFrame())
 
 
 @dataclass
@@ -26,3 +111,139 @@ class FBrefMatch():
 
     def __repr__(self) -> str:
         return f"FBrefMatch({self.date}, `{self.url}`)"
+
+    # ==============================================================================================
+    def __getattr__(self, name: str) -> Any:
+        # Only called for attributes that aren't set, i.e. the tables of a match that was read
+        # lazily with read_season_parquet() and haven't been loaded yet
+        loader = self.__dict__.get("_table_loader")
+        if loader is None or name not in TABLE_FIELDS:
+            raise AttributeError(f"'FBrefMatch' object has no attribute '{name}'")
+        value = loader(name)
+        setattr(self, name, value)
+        return value
+
+    # ==============================================================================================
+    def to_arrow(self) -> dict[str, "pa.Table"]:
+        """ Converts the match to Arrow tables
+
+        :raises ImportError: If pyarrow is not installed
+        :return: {table type: table, ...}. ``"match"`` is a one-row table of the match details,
+            the player stats tables are ``"home_player_stats.<key>"`` and
+            ``"away_player_stats.<key>"``, and the shots tables are ``"all_shots"``,
+            ``"home_shots"`` and ``"away_shots"``.
+        :rtype: dict[str, pa.Table]
+        """
+        pa, _ = import_pyarrow()
+        schema = pa.schema([(field, pa.string()) for field in SCALAR_FIELDS])
+        tables = {
+            "match": pa.Table.from_pylist(
+                [{field: getattr(self, field) for field in SCALAR_FIELDS}], schema=schema
+            )
+        }
+        for side in ["home", "away"]:
+            for key, df in getattr(self, f"{side}_player_stats").items():
+                tables[f"{side}_player_stats.{key}"] = _df_to_arrow(df)
+        for field in ["all_shots", "home_shots", "away_shots"]:
+            tables[field] = _df_to_arrow(getattr(self, field))
+        return tables
+
+    # ==============================================================================================
+    @classmethod
+    def from_arrow(cls, tables: dict[str, "pa.Table"]) -> "FBrefMatch":
+        """ Builds a match from the tables made by ``to_arrow()``
+
+        :param tables: {table type: table, ...}
+        :type tables: dict[str, pa.Table]
+        :return: The match
+        :rtype: FBrefMatch
+        """
+        details = tables["match"].to_pylist()[0]
+        frames = {k: _arrow_to_df(v) for k, v in tables.items() if k != "match"}
+        return cls(**{field: details[field] for field in SCALAR_FIELDS}, **_group_tables(frames))
+
+
+# ==================================================================================================
+def write_season_parquet(matches: list[FBrefMatch], directory: str | Path) -> None:
+    """ Writes matches to a directory of Parquet files
+
+    Each table type of ``FBrefMatch.to_arrow()`` becomes one dataset, partitioned by the FBref
+    match ID, at ``<directory>/<table type>/match_id=<ID>/part-0.parquet``. The match details of
+    every match are written to ``<directory>/match.parquet``. Each table type can be read as a
+    whole with e.g. ``pyarrow.dataset.dataset(<directory>/"all_shots", partitioning="hive")``.
+
+    The directory can be written to in more than one call, e.g. one chunk of a season at a time
+    or new matches as they are played. Matches are added to the ones already in
+    ``match.parquet``, and matches that were already written to the directory (by URL) are
+    overwritten, including removing the tables they had before.
+
+    :param matches: Matches to write
+    :type matches: list[FBrefMatch]
+    :param directory: Directory to write to. Created if it doesn't exist.
+    :type directory: str | Path
+    :raises ImportError: If pyarrow is not installed
+    """
+    pa, pq = import_pyarrow()
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    # Details of the matches already in the directory, by URL, so they are kept
+    index_path = directory / "match.parquet"
+    details = dict()
+    if index_path.exists():
+        details = {row["url"]: row for row in pq.read_table(index_path).to_pylist()}
+
+    for match in matches:
+        match_id = _get_match_id_from_url(match.url)
+        tables = match.to_arrow()
+        if match.url in details:
+            old = details[match.url]
+            for table_type in json.loads(old["tables"]):
+                shutil.rmtree(directory / table_type / f"match_id={old['match_id']}", True)
+        for table_type, table in tables.items():
+            if table_type == "match":
+                continue
+            path = directory / table_type / f"match_id={match_id}" / "part-0.parquet"
+            path.parent.mkdir(parents=True, exist_ok=True)
+            pq.write_table(table, path)
+        details[match.url] = {
+            **tables["match"].to_pylist()[0], "match_id": match_id,
+            "tables": json.dumps([k for k in tables if k != "match"]),
+        }
+
+    schema = pa.schema(
+        [(field, pa.string()) for field in SCALAR_FIELDS + ["match_id", "tables"]]
+    )
+    pq.write_table(pa.Table.from_pylist(list(details.values()), schema=schema), index_path)
+
+# ==================================================================================================
+def read_season_parquet(directory: str | Path, lazy: bool = True) -> list[FBrefMatch]:
+    """ Reads matches written by ``write_season_parquet()``
+
+    With ``lazy=True`` only the match details are read up front. The tables of a match are read
+    from disk the first time that the attribute holding them is accessed.
+
+    :param directory: Directory the season was written to
+    :type directory: str | Path
+    :param lazy: Whether to wait to read each match's tables until they are accessed (default:
+        True)
+    :type lazy: bool
+    :raises ImportError: If pyarrow is not installed
+    :return: The matches, in the order they were written
+    :rtype: list[FBrefMatch]
+    """
+    _, pq = import_pyarrow()
+    directory = Path(directory)
+
+    matches = list()
+    for details in pq.read_table(directory / "match.parquet").to_pylist():
+        loader = _LazyTables(directory, details["match_id"], json.loads(details["tables"]))
+        match = object.__new__(FBrefMatch)
+        for field in SCALAR_FIELDS:
+            setattr(match, field, details[field])
+        match.__dict__["_table_loader"] = loader
+        if not lazy:
+            for field in TABLE_FIELDS:
+                getattr(match, field)
+        matches.append(match)
+    return matches
@@ -1,147 +1,161 @@
 """ Helper functions for fbref.scrape_match()
 """
-from bs4 import BeautifulSoup
-from io import StringIO
-import re
+from bs4 import BeautifulSoup, Tag
+from dataclasses import dataclass, field
 import pandas as pd
-from .fbref_helpers import _get_ids_from_table
+from .fbref_helpers import _get_ids_from_urls, _read_table
+
+OFFICIAL_ROLES = ["Referee", "AR1", "AR2", "4th", "VAR"]
+
+
+@dataclass
+class _MatchPage:
+    """ The parts of a match page that the extractors below read, collected in one pass over the
+    soup by ``_index_match_page()``.
+    """
+    scorebox: Tag | None = None
+    scorebox_meta: Tag | None = None
+    venuetime: Tag | None = None
+    main: Tag | None = None
+    officials: Tag | None = None
+    tables: dict[str, Tag] = field(default_factory=dict)
+
+    # ==============================================================================================
+    @property
+    def team_els(self) -> list[Tag]:
+        """ The home and away team blocks of the scorebox """
+        return self.scorebox.find_all("div", recursive=False)  # type: ignore
 
 # ==================================================================================================
-def _get_date(soup: BeautifulSoup) -> str:
+def _index_match_page(soup: BeautifulSoup) -> _MatchPage:
+    """ Walks the match page once and indexes the scorebox, meta, tables by ID and officials
+    """
+    page = _MatchPage()
+    for el in soup.find_all(True):
+        name = el.name
+        if name == "table":
+            table_id = el.get("id")
+            if table_id is not None and table_id not in page.tables:
+                page.tables[table_id] = el
+        elif name == "div":
+            classes = el.get("class") or []
+            if page.scorebox is None and "scorebox" in classes:
+                page.scorebox = el
+            elif page.scorebox_meta is None and "scorebox_meta" in classes:
+                page.scorebox_meta = el
+            if page.main is None and el.get("role") == "main":
+                page.main = el
+        elif name == "span":
+            if page.venuetime is None and "venuetime" in (el.get("class") or []):
+                page.venuetime = el
+        elif name == "strong":
+            if page.officials is None and el.string == "Officials":
+                page.officials = el.parent
+    return page
+
+# ==================================================================================================
+def _get_date(page: _MatchPage) -> str:
     """ Gets match date
     """
-    scorebox_meta_tag = soup.find("div", {"class": "scorebox_meta"})
-    if scorebox_meta_tag is not None:
-        date = scorebox_meta_tag.find("strong").text  # type: ignore
+    if page.scorebox_meta is not None:
+        date = page.scorebox_meta.find("strong").text  # type: ignore
     else:
-        date = soup.find("span", {"class": "venuetime"})["data-venue-date"]  # type: ignore
+        date = page.venuetime["data-venue-date"]  # type: ignore
     return date
 
 # ==================================================================================================
-def _get_stage(soup: BeautifulSoup) -> str:
+def _get_stage(page: _MatchPage) -> str:
     """ Gets the stage description
     """
-    stage = soup.find("div", {"role": "main"}).find("div").text  # type: ignore
+    stage = page.main.find("div").text  # type: ignore
     return stage
 
 # ==================================================================================================
-def _get_team_names(soup: BeautifulSoup) -> tuple[str, str]:
+def _get_team_names(page: _MatchPage) -> tuple[str, str]:
     """ Gets home and away team names
     """
-    team_els = soup.find("div", {"class": "scorebox"}).find_all("div", recursive=False)  # type: ignore
-    home_el, away_el = team_els[0], team_els[1]
-    home_name = home_el.find("div").text.strip()
-    away_name = away_el.find("div").text.strip()
+    home_el, away_el = page.team_els[0], page.team_els[1]
+    home_name = home_el.find("div").text.strip()  # type: ignore
+    away_name = away_el.find("div").text.strip()  # type: ignore
     return home_name, away_name
 
 # ==================================================================================================
-def _get_team_ids(soup: BeautifulSoup) -> tuple[str, str]:
+def _get_team_ids(page: _MatchPage) -> tuple[str, str]:
     """ Gets home and away team IDs
     """
-    team_els = soup.find("div", {"class": "scorebox"}).find_all("div", recursive=False)  # type: ignore
-    home_el, away_el = team_els[0], team_els[1]
-    home_id = home_el.find("div").find("strong").find("a")["href"].split("/")[3]
-    away_id = away_el.find("div").find("strong").find("a")["href"].split("/")[3]
+    home_el, away_el = page.team_els[0], page.team_els[1]
+    home_id = home_el.find("div").find("strong").find("a")["href"].split("/")[3]  # type: ignore
+    away_id = away_el.find("div").find("strong").find("a")["href"].split("/")[3]  # type: ignore
     return home_id, away_id
 
 # ==================================================================================================
-def _get_goals(soup: BeautifulSoup) -> tuple[str, str]:
+def _get_goals(page: _MatchPage) -> tuple[str, str]:
     """ Gets home and away team goals
 
     Don't cast to int because games that were awarded to one team have `*` by that team's goals
     """
-    team_els = soup.find("div", {"class": "scorebox"}).find_all("div", recursive=False)  # type: ignore
-    home_el, away_el = team_els[0], team_els[1]
-    home_goals = home_el.find("div", {"class": "score"}).text
-    away_goals = away_el.find("div", {"class": "score"}).text
+    home_el, away_el = page.team_els[0], page.team_els[1]
+    home_goals = home_el.find("div", {"class": "score"}).text  # type: ignore
+    away_goals = away_el.find("div", {"class": "score"}).text  # type: ignore
     return home_goals, away_goals
 
 # ==================================================================================================
-def _get_player_stats(soup: BeautifulSoup) -> dict[str, dict[str, pd.DataFrame]]:
+def _get_team_player_stats(page: _MatchPage, team_id: str) -> dict[str, pd.DataFrame]:
+    """ Gets the player stats tables of one team
+    """
+    player_stats = dict()
+    for table_id, table in page.tables.items():
+        if f"stats_{team_id}" not in table_id:
+            continue
+        key = table_id.replace(f"stats_{team_id}", "").strip("_")
+        df, hrefs = _read_table(table)
+        df["Player ID"] = _get_ids_from_urls(hrefs, "player")
+        player_stats[key] = df
+    return player_stats
+
+# ==================================================================================================
+def _get_player_stats(
+        page: _MatchPage, team_ids: tuple[str, str]
+) -> dict[str, dict[str, pd.DataFrame]]:
     """ Gets player stats for home and away teams
     """
-    home_id, away_id = _get_team_ids(soup)
-
-    home_tables = soup.find_all("table", {"id": re.compile(f"stats_{home_id}")})
-    home_player_stats = dict()
-    for table in home_tables:
-        key = table["id"].replace(f"stats_{home_id}", "").strip("_")
-        df = pd.read_html(StringIO(str(table)))[0]
-        ids = _get_ids_from_table(table, "player")
-        not_nan_mask = ~df.xs("Age", level=1, axis=1).isna().to_numpy().squeeze()
-        df.loc[not_nan_mask, "Player ID"] = ids
-        home_player_stats[key] = df
-
-    away_tables = soup.find_all("table", {"id": re.compile(f"stats_{away_id}")})
-    away_player_stats = dict()
-    for table in away_tables:
-        key = table["id"].replace(f"stats_{away_id}", "").strip("_")
-        df = pd.read_html(StringIO(str(table)))[0]
-        ids = _get_ids_from_table(table, "player")
-        not_nan_mask = ~df.xs("Age", level=1, axis=1).isna().to_numpy().squeeze()
-        df.loc[not_nan_mask, "Player ID"] = ids
-        away_player_stats[key] = df
-
-    return {"home": home_player_stats, "away": away_player_stats}
+    home_id, away_id = team_ids
+    return {
+        "home": _get_team_player_stats(page, home_id),
+        "away": _get_team_player_stats(page, away_id),
+    }
 
 # ==================================================================================================
-def _get_shots(soup: BeautifulSoup) -> dict[str, pd.DataFrame]:
+def _get_shots(page: _MatchPage, team_ids: tuple[str, str]) -> dict[str, pd.DataFrame]:
     """ Gets shot data
     """
-    home_id, away_id = _get_team_ids(soup)
-    all_el = soup.find("table", {"id": "shots_all"})
-    all_shots = pd.read_html(StringIO(str(all_el)))[0] if all_el else pd.DataFrame()
+    home_id, away_id = team_ids
 
-    home_el = soup.find("table", {"id": re.compile(f"shots_{home_id}")})
-    home_shots = pd.read_html(StringIO(str(home_el)))[0] if home_el else pd.DataFrame()
+    def _read_shots(id_part: str) -> pd.DataFrame:
+        for table_id, table in page.tables.items():
+            if id_part in table_id:
+                return _read_table(table)[0]
+        return pd.DataFrame()
 
-    away_el = soup.find("table", {"id": re.compile(f"shots_{away_id}")})
-    away_shots = pd.read_html(StringIO(str(away_el)))[0] if away_el else pd.DataFrame()
-
-    return {"all": all_shots, "home": home_shots, "away": away_shots}
+    return {
+        "all": _read_shots("shots_all"),
+        "home": _read_shots(f"shots_{home_id}"),
+        "away": _read_shots(f"shots_{away_id}"),
+    }
 
 # ==================================================================================================
-def _get_officials(soup: BeautifulSoup) -> dict[str, str]:
+def _get_officials(page: _MatchPage) -> dict[str, str]:
     """ Gets officials' names
-    """
-    return_dict = {"Referee": "", "AR1": "", "AR2": "", "4th": "", "VAR": ""}
 
-    strong_officials_tag = soup.find("strong", string="Officials")
-    if not strong_officials_tag:
-        return return_dict
-
-    officials_tag = strong_officials_tag.parent
-    if not officials_tag:
+    Each official is listed as e.g. "Michael Oliver (Referee)", so the strings of the officials
+    block are read once and matched against each role.
+    """
+    return_dict = {role: "" for role in OFFICIAL_ROLES}
+    if page.officials is None:
         return return_dict
 
-    referee_tag = officials_tag.find(string=re.compile("Referee"))
-    if referee_tag:
-        referee = referee_tag.text
-        referee = referee.replace("\xa0", " ").replace(" (Referee)", "")
-        return_dict["Referee"] = referee
-
-    ar1_tag = officials_tag.find(string=re.compile("AR1"))
-    if ar1_tag:
-        ar1 = ar1_tag.text
-        ar1 = ar1.replace("\xa0", " ").replace(" (AR1)", "")
-        return_dict["AR1"] = ar1
-
-    ar2_tag = officials_tag.find(string=re.compile("AR2"))
-    if ar2_tag:
-        ar2 = ar2_tag.text
-        ar2 = ar2.replace("\xa0", " ").replace(" (AR2)", "")
-        return_dict["AR2"] = ar2
-
-    fourth_tag = officials_tag.find(string=re.compile("4th"))
-    if fourth_tag:
-        fourth = fourth_tag.text
-        fourth = fourth.replace("\xa0", " ").replace(" (4th)", "")
-        return_dict["4th"] = fourth
-
-    var_tag = officials_tag.find(string=re.compile("VAR"))
-    if var_tag:
-        var = var_tag.text
-        var = var.replace("\xa0", " ").replace(" (VAR)", "")
-        return_dict["VAR"] = var
-
+    for string in page.officials.strings:
+        for role in OFFICIAL_ROLES:
+            if return_dict[role] == "" and role in string:
+                return_dict[role] = string.replace("\xa0", " ").replace(f" ({role})", "")
     return return_dict
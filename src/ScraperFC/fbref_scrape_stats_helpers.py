@@ -1,11 +1,11 @@
 """ Helper functions for fbref.scrape_stats()
 """
 import pandas as pd
-from io import StringIO
 import re
 from typing import TYPE_CHECKING
 from bs4 import Tag
-from .fbref_helpers import _get_ids_from_table, _get_stats_table_tag
+from .fbref_helpers import _get_ids_from_urls, _get_stats_table_tag, _read_table,\
+    _CommentedTables
 
 if TYPE_CHECKING:
     from .fbref import FBref
@@ -20,17 +20,19 @@ def _scrape_not_big5_stats(
     stat_url = "/".join(season_url_split)
 
     soup = self._get_soup(stat_url)
+    commented_tables = _CommentedTables(soup)
 
     # Get the "for" table as df
     squad_table_tag = _get_stats_table_tag(
         soup,
-        {"name": "table", "attrs": {"id": re.compile(f"{stats_categories[stat_category]['html']}_for")}}
+        {"name": "table", "attrs": {"id": re.compile(f"{stats_categories[stat_category]['html']}_for")}},
+        commented_tables
     )
     if isinstance(squad_table_tag, Tag):
-        squad_df = pd.read_html(StringIO(str(squad_table_tag)))[0]
+        squad_df, squad_hrefs = _read_table(squad_table_tag)
 
         # Add team IDs for the "for" table
-        squad_ids = _get_ids_from_table(squad_table_tag, "team")
+        squad_ids = _get_ids_from_urls(squad_hrefs, "team")
         squad_df['Team ID'] = squad_ids
     elif squad_table_tag is None:
         print(f'\nWARNING: Squad stats table from {stat_url} is None.')
@@ -39,13 +41,14 @@ def _scrape_not_big5_stats(
     # Get the "against" table as df
     opp_table_tag = _get_stats_table_tag(
         soup,
-        {"name": "table", "attrs": {"id": re.compile(f"{stats_categories[stat_category]['html']}_against")}}
+        {"name": "table", "attrs": {"id": re.compile(f"{stats_categories[stat_category]['html']}_against")}},
+        commented_tables
     )
     if isinstance(opp_table_tag, Tag):
-        opp_df = pd.read_html(StringIO(str(opp_table_tag)))[0]
+        opp_df, opp_hrefs = _read_table(opp_table_tag)
 
         # Add team IDs for the "against" table
-        opps_ids = _get_ids_from_table(opp_table_tag, "team")
+        opps_ids = _get_ids_from_urls(opp_hrefs, "team")
         opp_df['Team ID'] = opps_ids
     elif opp_table_tag is None:
         print(f'\nWARNING: Opponent stats table from {stat_url} is None.')
@@ -54,14 +57,15 @@ def _scrape_not_big5_stats(
     # Create player stats df
     player_table_tag = _get_stats_table_tag(
         soup,
-        {"name": "table", "attrs": {"id": re.compile(f"stats_{stats_categories[stat_category]['html']}")}}
+        {"name": "table", "attrs": {"id": re.compile(f"stats_{stats_categories[stat_category]['html']}")}},
+        commented_tables
     )
     if isinstance(player_table_tag, Tag):
-        player_df = pd.read_html(StringIO(str(player_table_tag)))[0]
+        player_df, player_hrefs = _read_table(player_table_tag)
 
         # Add player IDs
-        player_ids = _get_ids_from_table(player_table_tag, "player")
-        player_df.loc[player_df[('Unnamed: 0_level_0', 'Rk')] != 'Rk', 'Player ID'] = player_ids
+        player_ids = _get_ids_from_urls(player_hrefs, "player")
+        player_df['Player ID'] = player_ids
     elif player_table_tag is None:
         print(f'\nWARNING: Player stats table from {stat_url} is None.')
         player_df = pd.DataFrame()
@@ -80,16 +84,18 @@ def _scrape_big5_stats(
 
     # Get squad stats
     soup = self._get_soup(squad_stats_url)
+    commented_tables = _CommentedTables(soup)
 
     squad_table_tag = _get_stats_table_tag(
         soup,
-        {"name": "table", "attrs": {"id": re.compile(f"{stats_categories[stat_category]['html']}_for")}}
+        {"name": "table", "attrs": {"id": re.compile(f"{stats_categories[stat_category]['html']}_for")}},
+        commented_tables
     )
     if isinstance(squad_table_tag, Tag):
-        squad_df = pd.read_html(StringIO(str(squad_table_tag)))[0]
+        squad_df, squad_hrefs = _read_table(squad_table_tag)
 
         # Add team IDs for squad stats
-        squad_ids = _get_ids_from_table(squad_table_tag, "team")
+        squad_ids = _get_ids_from_urls(squad_hrefs, "team")
         squad_df['Team ID'] = squad_ids
     elif squad_table_tag is None:
         print(f'\nWARNING: Squad stats table from {squad_stats_url} is None.')
@@ -98,13 +104,14 @@ def _scrape_big5_stats(
     # Get opponent stats
     opp_table_tag = _get_stats_table_tag(
         soup,
-        {"name": "table", "attrs": {"id": re.compile(f"{stats_categories[stat_category]['html']}_against")}}
+        {"name": "table", "attrs": {"id": re.compile(f"{stats_categories[stat_category]['html']}_against")}},
+        commented_tables
     )
     if isinstance(opp_table_tag, Tag):
-        opp_df = pd.read_html(StringIO(str(opp_table_tag)))[0]
+        opp_df, opp_hrefs = _read_table(opp_table_tag)
 
         # Add team IDs for opponent stats
-        opp_ids = _get_ids_from_table(opp_table_tag, "team")
+        opp_ids = _get_ids_from_urls(opp_hrefs, "team")
         opp_df['Team ID'] = opp_ids
     elif opp_table_tag is None:
         print(f'\nWARNING: Opponent stats table from {squad_stats_url} is None.')
@@ -118,17 +125,19 @@ def _scrape_big5_stats(
 
     # Scrape player stats
     soup = self._get_soup(player_stats_url)
+    commented_tables = _CommentedTables(soup)
 
     player_table_tag = _get_stats_table_tag(
         soup,
-        {"name": "table", "attrs": {"id": f"stats_{stats_categories[stat_category]['html']}"}}
+        {"name": "table", "attrs": {"id": f"stats_{stats_categories[stat_category]['html']}"}},
+        commented_tables
     )
     if isinstance(player_table_tag, Tag):
-        player_df = pd.read_html(StringIO(str(player_table_tag)))[0]
+        player_df, player_hrefs = _read_table(player_table_tag)
 
         # Add player IDs
-        player_ids = _get_ids_from_table(player_table_tag, "player")
-        player_df.loc[player_df[('Unnamed: 0_level_0', 'Rk')] != 'Rk', 'Player ID'] = player_ids
+        player_ids = _get_ids_from_urls(player_hrefs, "player")
+        player_df['Player ID'] = player_ids
     elif player_table_tag is None:
         print(f'\nWARNING: Player stats table from {player_stats_url} is None.')
         player_df = pd.DataFrame()
@@ -1,11 +1,18 @@
 import pandas as pd
 import numpy as np
+import threading
+import time
 import warnings
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from tqdm import tqdm
 from datetime import datetime, timezone, timedelta
+from typing import Any, Iterator
 
 from .scraperfc_exceptions import InvalidLeagueException, InvalidYearException
-from .utils import botasaurus_browser_get_json, get_module_comps
+from .utils import botasaurus_browser_get_json, get_module_comps, BrowserPool, ResponseCache,\
+    SeasonCatalog, CheckpointStore, flatten_dict_columns, import_pyarrow, records_to_arrow,\
+    write_partition
 from .sofascore_player import SofascorePlayer
 from .sofascore_helpers import _get_player_career_stats_df
 
@@ -24,13 +31,46 @@ from .sofascore_helpers import _get_player_career_stats_df
 
 API_PREFIX = "https://api.sofascore.com/api/v1"
 
+bundle_parts = [
+    "event", "lineups", "statistics", "graph", "shotmap", "average-positions", "heatmaps"
+]
+
 comps = get_module_comps("SOFASCORE")
 
 
 class Sofascore:
+    """ Scrapes data from the Sofascore API.
+
+    API requests are loaded in a pool of warm browser sessions that is kept open for the lifetime
+    of the object. Call ``close()`` (or use the object as a context manager) when you are done to
+    shut the browsers down.
+
+    :param pool_size: Number of browser sessions to keep open. Scrapers that make many requests
+        at once, like ``scrape_heatmaps()``, run this many of them concurrently (default: 1). All
+        requests to sofascore.com share a process-wide rate limit of 2 requests per second by
+        default, which can be changed with ``ScraperFC.utils.set_rate_limit()``.
+    :type pool_size: int
+    :param cache: Response cache to read API responses through (default: None, no caching)
+    :type cache: ResponseCache | None
+    :param season_ttl: Seconds to keep each league's valid seasons in ``season_catalog`` before
+        fetching them again, or None to keep them for the lifetime of the object (default: 1 day)
+    :type season_ttl: float | None
+    :raises TypeError: If ``cache`` is not a ResponseCache or None, or ``season_ttl`` is not a
+        number or None
+    :raises ValueError: If ``season_ttl`` is negative
+    """
 
     # ==============================================================================================
-    def __init__(self) -> None:
+    def __init__(
+            self, pool_size: int = 1, cache: ResponseCache | None = None,
+            season_ttl: float | None = 24 * 60 * 60
+    ) -> None:
+        if cache is not None and not isinstance(cache, ResponseCache):
+            raise TypeError("`cache` must be a ResponseCache or None.")
+        self.cache = cache
+        self.season_catalog = SeasonCatalog(ttl=season_ttl)
+        self._browser_pool = BrowserPool(size=pool_size)
+
         # To get these, query a player's season's stats (e.g.,
         # https://www.sofascore.com/api/v1/player/843665/unique-tournament/35/season/77333/statistics/overall)
         # and get all of the keys from the "statistics" dict. Make sure to sample both outfield
@@ -66,6 +106,61 @@ class Sofascore:
         ]
         self.concatenated_stat_names = "%2C".join(self.stat_names)
 
+    # ==============================================================================================
+    def __enter__(self) -> "Sofascore":
+        return self
+
+    # ==============================================================================================
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    # ==============================================================================================
+    def close(self) -> None:
+        """ Shuts down the browser sessions used by this scraper.
+        """
+        self._browser_pool.close()
+
+    # ==============================================================================================
+    def _get_json(self, url: str) -> dict:
+        """ Private, gets JSON from the Sofascore API using a pooled browser session. """
+        return botasaurus_browser_get_json(url, pool=self._browser_pool, cache=self.cache)
+
+    # ==============================================================================================
+    def _get_live_json(self, url: str) -> dict:
+        """ Private, _get_json() without the response cache, for data that changes while a match
+        is being played.
+        """
+        try:
+            return botasaurus_browser_get_json(url, pool=self._browser_pool)
+        except Exception as e:
+            # A failed live poll is retried on the next one, like an error response
+            return {"error": {"code": None, "message": repr(e)}}
+
+    # ==============================================================================================
+    def _get_json_many(self, urls: list[str], live: bool = False) -> list[dict]:
+        """ Private, gets JSON from many Sofascore API URLs, in the order of ``urls``. The requests
+        run concurrently, one per browser session in the pool, and every request still waits for
+        the process-wide rate limit. With ``live=True`` the response cache is skipped.
+        """
+        get_json = self._get_live_json if live else self._get_json
+        if self._browser_pool.size == 1 or len(urls) <= 1:
+            return [get_json(url) for url in urls]
+        with ThreadPoolExecutor(max_workers=self._browser_pool.size) as executor:
+            return list(executor.map(get_json, urls))
+
+    # ==============================================================================================
+    def _get_event_json(
+            self, match_id: int, endpoint: str, responses: dict[str, dict]
+    ) -> tuple[str, dict]:
+        """ Private, gets ``/event/{match_id}/{endpoint}`` (just ``/event/{match_id}`` if
+        ``endpoint`` is empty), unless it is already in ``responses``. Returns the URL and the
+        response.
+        """
+        url = f"{API_PREFIX}/event/{match_id}" + (f"/{endpoint}" if endpoint else "")
+        if endpoint not in responses:
+            responses[endpoint] = self._get_json(url)
+        return url, responses[endpoint]
+
     # ==============================================================================================
     def _check_and_convert_match_id(self, match: str | int) -> int:
         """ Helper function that will take a Sofascore match URL or match ID and return a match ID
@@ -97,14 +192,20 @@ class Sofascore:
             raise InvalidLeagueException(league, "Sofascore", list(comps.keys()))
 
         url = f"{API_PREFIX}/unique-tournament/{comps[league]['SOFASCORE']}/seasons/"
-        response = botasaurus_browser_get_json(url)
-        seasons = {x["year"]: x["id"] for x in response["seasons"]}
-        return seasons
+
+        def _fetch() -> dict:
+            response = self._get_json(url)
+            return {x["year"]: x["id"] for x in response["seasons"]}
+
+        return self.season_catalog.get_or_fetch(league, _fetch)
 
     # ==============================================================================================
     def get_match_dicts(self, year: str, league:str) -> list[dict]:
         """ Returns the matches from the Sofascore API for a given league season.
 
+        The pages of matches are requested one per browser session in the pool at a time (see
+        ``pool_size``), until a page comes back empty.
+
         :param year: .. include:: ./arg_docstrings/year_sofascore.rst
         :type year: str
         :param league: .. include:: ./arg_docstrings/league.rst
@@ -120,19 +221,22 @@ class Sofascore:
         if year not in valid_seasons.keys():
             raise InvalidYearException(year, league, list(valid_seasons.keys()))
 
+        # The number of pages isn't known up front, so request them in batches of one page per
+        # browser session and stop at the first page without events
+        url = (
+            f"{API_PREFIX}/unique-tournament/{comps[league]['SOFASCORE']}/"
+            f"season/{valid_seasons[year]}/events/last/{{}}"
+        )
         matches = list()
         i = 0
         while 1:
-            response = botasaurus_browser_get_json(
-                f"{API_PREFIX}/unique-tournament/{comps[league]['SOFASCORE']}/"
-                f"season/{valid_seasons[year]}/events/last/{i}"
-            )
-            if "events" not in response:
-                break
-            matches += response["events"]
-            i += 1
-
-        return matches
+            pages = range(i, i + self._browser_pool.size)
+            responses = self._get_json_many([url.format(page) for page in pages])
+            for response in responses:
+                if "events" not in response:
+                    return matches
+                matches += response["events"]
+            i += len(pages)
 
     # ==============================================================================================
     def get_match_id_from_url(self, match_url: str) -> int:
@@ -173,7 +277,12 @@ class Sofascore:
         :rtype: dict
         """
         match_id = self._check_and_convert_match_id(match_id)
-        response = botasaurus_browser_get_json(f"{API_PREFIX}/event/{match_id}")
+        return self._get_match_dict(match_id, dict())
+
+    # ==============================================================================================
+    def _get_match_dict(self, match_id: int, responses: dict[str, dict]) -> dict:
+        """ Private, get_match_dict() reading through ``responses`` """
+        _, response = self._get_event_json(match_id, "", responses)
         data = response["event"]
         return data
 
@@ -224,8 +333,12 @@ class Sofascore:
         :rtype: dict
         """
         match_id = self._check_and_convert_match_id(match_id)
-        url = f"{API_PREFIX}/event/{match_id}/lineups"
-        response = botasaurus_browser_get_json(url)
+        return self._get_match_player_ids(match_id, dict())
+
+    # ==============================================================================================
+    def _get_match_player_ids(self, match_id: int, responses: dict[str, dict]) -> dict:
+        """ Private, get_match_player_ids() reading through ``responses`` """
+        url, response = self._get_event_json(match_id, "lineups", responses)
 
         if "error" not in response:
             teams = ["home", "away"]
@@ -263,7 +376,7 @@ class Sofascore:
             raise InvalidYearException(year, league, list(valid_seasons.keys()))
 
         url = f"{API_PREFIX}/unique-tournament/{comps[league]['SOFASCORE']}/season/{valid_seasons[year]}/players"
-        response = botasaurus_browser_get_json(url)
+        response = self._get_json(url)
         player_ids = [x["playerId"] for x in response["players"]]
 
         return player_ids
@@ -277,6 +390,9 @@ class Sofascore:
         ) -> pd.DataFrame:
         """ Get every player statistic that can be asked in league pages on Sofascore.
 
+        After the first page, the remaining pages are requested concurrently, one per browser
+        session in the pool (see ``pool_size``).
+
         :param year: .. include:: ./arg_docstrings/year_sofascore.rst
         :type year: str
         :param league: .. include:: ./arg_docstrings/league.rst
@@ -307,21 +423,21 @@ class Sofascore:
         season_id = valid_seasons[year]
         league_id = comps[league]["SOFASCORE"]
 
-        # Get all player stats from Sofascore API
-        offset = 0
-        results = list()
-        while 1:
-            request_url = "https://api.sofascore.com/api/v1" +\
+        # Get all player stats from Sofascore API. The first page says how many pages there are,
+        # the rest are requested concurrently.
+        def _request_url(offset: int) -> str:
+            return "https://api.sofascore.com/api/v1" +\
                 f"/unique-tournament/{league_id}/season/{season_id}/statistics" +\
                 f"?limit=100&offset={offset}" +\
                 f"&accumulation={accumulation}" +\
                 f"&fields={self.concatenated_stat_names}" +\
                 f"&filters=position.in.{positions}"
-            response = botasaurus_browser_get_json(request_url)
+
+        response = self._get_json(_request_url(0))
+        results = list(response["results"])
+        urls = [_request_url(100 * page) for page in range(1, response["pages"])]
+        for response in self._get_json_many(urls):
             results += response["results"]
-            if (response["page"] == response["pages"]) or (response["pages"] == 0):
-                break
-            offset += 100
 
         # Convert the player dicts to a dataframe. Dataframe will be empty if there aren't any
         # player stats
@@ -329,10 +445,11 @@ class Sofascore:
             df = pd.DataFrame()
         else:
             df = pd.DataFrame.from_dict(results)  # type: ignore
-            df["player id"] = df["player"].apply(pd.Series)["id"]
-            df["player"] = df["player"].apply(pd.Series)["name"]
-            df["team id"] = df["team"].apply(pd.Series)["id"]
-            df["team"] = df["team"].apply(pd.Series)["name"]
+            ids = flatten_dict_columns(df[["player", "team"]], sep=".")
+            df["player id"] = ids["player.id"]
+            df["player"] = ids["player.name"]
+            df["team id"] = ids["team.id"]
+            df["team"] = ids["team.name"]
 
         return df
 
@@ -347,8 +464,12 @@ class Sofascore:
         :rtype: pd.DataFrame
         """
         match_id = self._check_and_convert_match_id(match_id)
-        url = f"{API_PREFIX}/event/{match_id}/graph"
-        response = botasaurus_browser_get_json(url)
+        return self._scrape_match_momentum(match_id, dict())
+
+    # ==============================================================================================
+    def _scrape_match_momentum(self, match_id: int, responses: dict[str, dict]) -> pd.DataFrame:
+        """ Private, scrape_match_momentum() reading through ``responses`` """
+        url, response = self._get_event_json(match_id, "graph", responses)
 
         if "error" not in response:
             match_momentum_df = pd.DataFrame(response["graphPoints"])
@@ -370,19 +491,22 @@ class Sofascore:
         :rtype: pd.DataFrame
         """
         match_id = self._check_and_convert_match_id(match_id)
-        url = f"{API_PREFIX}/event/{match_id}/statistics"
-        response = botasaurus_browser_get_json(url)
+        return self._scrape_team_match_stats(match_id, dict())
+
+    # ==============================================================================================
+    def _scrape_team_match_stats(self, match_id: int, responses: dict[str, dict]) -> pd.DataFrame:
+        """ Private, scrape_team_match_stats() reading through ``responses`` """
+        url, response = self._get_event_json(match_id, "statistics", responses)
 
         if "error" not in response:
-            df = pd.DataFrame()
+            records = list()
             for period in response["statistics"]:
-                period_name = period["period"]
                 for group in period["groups"]:
-                    group_name = group["groupName"]
-                    temp = pd.DataFrame.from_dict(group["statisticsItems"])
-                    temp["period"] = [period_name,] * temp.shape[0]
-                    temp["group"] = [group_name,] * temp.shape[0]
-                    df = pd.concat([df, temp], ignore_index=True)
+                    records += [
+                        {**item, "period": period["period"], "group": group["groupName"]}
+                        for item in group["statisticsItems"]
+                    ]
+            df = pd.DataFrame(records)
         else:
             warnings.warn(
                 f"Encountered {response['error']['code']}: {response['error']['message']} from "
@@ -401,9 +525,16 @@ class Sofascore:
         :rtype: pd.DataFrame
         """
         match_id = self._check_and_convert_match_id(match_id)
-        match_dict = self.get_match_dict(match_id)  # used to get home and away team names and IDs
-        url = f"{API_PREFIX}/event/{match_id}/lineups"
-        response = botasaurus_browser_get_json(url)
+        return self._scrape_player_match_stats(match_id, dict())
+
+    # ==============================================================================================
+    def _scrape_player_match_stats(
+            self, match_id: int, responses: dict[str, dict]
+    ) -> pd.DataFrame:
+        """ Private, scrape_player_match_stats() reading through ``responses`` """
+        # Used to get home and away team names and IDs
+        match_dict = self._get_match_dict(match_id, responses)
+        url, response = self._get_event_json(match_id, "lineups", responses)
 
         if "error" not in response:
             home_players = response["home"]["players"]
@@ -414,18 +545,10 @@ class Sofascore:
             for p in away_players:
                 p["teamId"] = match_dict["awayTeam"]["id"]
                 p["teamName"] = match_dict["awayTeam"]["name"]
-                players = home_players + away_players
-
-            temp = pd.DataFrame(players)
-            columns = list()
-            for c in temp.columns:
-                if isinstance(temp.loc[0, c], dict):
-                    # Break dicts into series
-                    columns.append(temp[c].apply(pd.Series, dtype=object))
-                else:
-                    # Else they're already series
-                    columns.append(temp[c])  # type: ignore
-            df = pd.concat(columns, axis=1)
+            players = home_players + away_players
+
+            # Break dicts into columns
+            df = flatten_dict_columns(pd.DataFrame(players), sep=None)
         else:
             warnings.warn(
                 f"Encountered {response['error']['code']}: {response['error']['message']} from "
@@ -446,20 +569,30 @@ class Sofascore:
         :rtype: pd.DataFrame
         """
         match_id = self._check_and_convert_match_id(match_id)
-        home_name, away_name = self.get_team_names(match_id)
-        url = f"{API_PREFIX}/event/{match_id}/average-positions"
-        response = botasaurus_browser_get_json(url)
+        return self._scrape_player_average_positions(match_id, dict())
+
+    # ==============================================================================================
+    def _scrape_player_average_positions(
+            self, match_id: int, responses: dict[str, dict]
+    ) -> pd.DataFrame:
+        """ Private, scrape_player_average_positions() reading through ``responses`` """
+        match_dict = self._get_match_dict(match_id, responses)
+        home_name, away_name = match_dict["homeTeam"]["name"], match_dict["awayTeam"]["name"]
+        url, response = self._get_event_json(match_id, "average-positions", responses)
 
         if "error" not in response:
-            df = pd.DataFrame()
+            teams = list()
             for key, name in [("home", home_name), ("away", away_name)]:
                 temp = pd.DataFrame(response[key])
                 temp["team"] = [name,] * temp.shape[0]
-                temp = pd.concat(
-                    [temp["player"].apply(pd.Series), temp.drop(columns=["player"])],
+                teams.append(pd.concat(
+                    [
+                        flatten_dict_columns(temp[["player"]], ["player"], sep=None),
+                        temp.drop(columns=["player"])
+                    ],
                     axis=1
-                )
-                df = pd.concat([df, temp], axis=0, ignore_index=True)
+                ))
+            df = pd.concat(teams, axis=0, ignore_index=True)
         else:
             warnings.warn(
                 f"Encountered {response['error']['code']}: {response['error']['message']} from "
@@ -470,31 +603,54 @@ class Sofascore:
         return df
 
     # ==============================================================================================
-    def scrape_heatmaps(self, match_id: str | int) -> dict:
+    def scrape_heatmaps(self, match_id: str | int, as_array: bool = False) -> dict:
         """ Get the x-y coordinates to create a player heatmap for all players in the match.
 
         Players who didn't play will have an empty list of coordinates.
 
+        With ``as_array=True`` each heatmap is a contiguous float32 NumPy array of shape (n, 2)
+        instead of a list of (x, y) tuples, which takes 8 bytes per point instead of about 64 and
+        can be aggregated with ``bin_heatmaps()``.
+
+        The heatmaps are requested concurrently, one request per browser session in the pool (see
+        ``pool_size``), and within the sofascore.com rate limit (2 requests per second by default,
+        see ``ScraperFC.utils.set_rate_limit()``).
+
         :param match_id: Sofascore match URL or match ID
         :type match_id: str | int
+        :param as_array: Whether to return each heatmap as a float32 array of shape (n, 2)
+            (default: False)
+        :type as_array: bool
+        :raises TypeError: If ``as_array`` is not a bool
         :return: Dict of players, their IDs and their heatmap coordinates, {player name: {'id':
             player_id, 'heatmap': heatmap}, ...}
         :rtype: dict
         """
+        if not isinstance(as_array, bool):
+            raise TypeError("`as_array` must be a bool.")
         match_id = self._check_and_convert_match_id(match_id)
-        players = self.get_match_player_ids(match_id)
-        for player in players:
-            player_id = players[player]
-            url = f"{API_PREFIX}/event/{match_id}/player/{player_id}/heatmap"
-
-            response = botasaurus_browser_get_json(url)
+        return self._scrape_heatmaps(match_id, dict(), as_array)
 
+    # ==============================================================================================
+    def _scrape_heatmaps(
+            self, match_id: int, responses: dict[str, dict], as_array: bool = False
+    ) -> dict:
+        """ Private, scrape_heatmaps() reading through ``responses`` """
+        players = self._get_match_player_ids(match_id, responses)
+        urls = [
+            f"{API_PREFIX}/event/{match_id}/player/{player_id}/heatmap"
+            for player_id in players.values()
+        ]
+        for player, response in zip(list(players), self._get_json_many(urls)):
+            player_id = players[player]
             if "error" not in response:
                 heatmap = [(z["x"], z["y"]) for z in response["heatmap"]]
             else:
                 # Players that didn't play have empty heatmaps. Don't print warning because there
                 # would be a lot of them.
                 heatmap = list()
+            if as_array:
+                heatmap = np.array(heatmap, dtype=np.float32).reshape(-1, 2)
 
             players[player] = {"id": player_id, "heatmap": heatmap}
 
@@ -509,8 +665,12 @@ class Sofascore:
         :rtype: pd.DataFrame
         """
         match_id = self._check_and_convert_match_id(match_id)
-        url = f"{API_PREFIX}/event/{match_id}/shotmap"
-        response = botasaurus_browser_get_json(url)
+        return self._scrape_match_shots(match_id, dict())
+
+    # ==============================================================================================
+    def _scrape_match_shots(self, match_id: int, responses: dict[str, dict]) -> pd.DataFrame:
+        """ Private, scrape_match_shots() reading through ``responses`` """
+        url, response = self._get_event_json(match_id, "shotmap", responses)
         if "error" not in response:
             df = pd.DataFrame.from_dict(response["shotmap"])
         else:
@@ -522,6 +682,320 @@ class Sofascore:
 
         return df
 
+    # ==============================================================================================
+    def scrape_match_bundle(
+            self, match_id: str | int, parts: list[str] | None = None
+    ) -> dict[str, Any]:
+        """ Scrape several kinds of data for a match, loading each API endpoint only once
+
+        Calling the single scrapers one after the other loads some endpoints more than once, e.g.
+        ``scrape_player_match_stats()``, ``scrape_player_average_positions()`` and
+        ``scrape_heatmaps()`` all load the match or its lineups on their own. Here every endpoint
+        that the requested parts need is loaded once and shared between them.
+
+        The parts are named after the endpoint they come from, and each gives the same output as
+        the matching scraper:
+
+        * ``"event"``: ``get_match_dict()``
+        * ``"lineups"``: ``scrape_player_match_stats()``
+        * ``"statistics"``: ``scrape_team_match_stats()``
+        * ``"graph"``: ``scrape_match_momentum()``
+        * ``"shotmap"``: ``scrape_match_shots()``
+        * ``"average-positions"``: ``scrape_player_average_positions()``
+        * ``"heatmaps"``: ``scrape_heatmaps()``
+
+        :param match_id: Sofascore match URL or match ID
+        :type match_id: str | int
+        :param parts: Parts to scrape (default: None, all of them)
+        :type parts: list[str] | None
+        :raises TypeError: If any of the parameters are the wrong type.
+        :raises ValueError: If any of the parts are not valid.
+        :return: {part: output, ...}, in the order of ``parts``
+        :rtype: dict[str, Any]
+        """
+        match_id = self._check_and_convert_match_id(match_id)
+        if parts is None:
+            parts = list(bundle_parts)
+        if not isinstance(parts, list) or not all(isinstance(part, str) for part in parts):
+            raise TypeError("`parts` must be a list of strings or None.")
+        invalid_parts = [part for part in parts if part not in bundle_parts]
+        if len(invalid_parts) > 0:
+            raise ValueError(f"{invalid_parts} are not valid parts. Must be in {bundle_parts}.")
+
+        return self._scrape_match_bundle(match_id, parts, dict())
+
+    # ==============================================================================================
+    def _scrape_match_bundle(
+            self, match_id: int, parts: list[str], responses: dict[str, dict]
+    ) -> dict[str, Any]:
+        """ Private, scrape_match_bundle() with checked parts, reading through ``responses`` """
+        scrapers = {
+            "event": self._get_match_dict,
+            "lineups": self._scrape_player_match_stats,
+            "statistics": self._scrape_team_match_stats,
+            "graph": self._scrape_match_momentum,
+            "shotmap": self._scrape_match_shots,
+            "average-positions": self._scrape_player_average_positions,
+            "heatmaps": self._scrape_heatmaps,
+        }
+        return {part: scrapers[part](match_id, responses) for part in dict.fromkeys(parts)}
+
+    # ==============================================================================================
+    def crawl_season(
+            self, year: str, league: str, directory: str | Path,
+            datasets: list[str] | None = None, checkpoint: CheckpointStore | None = None
+    ) -> dict[int, dict[str, int]]:
+        """ Scrape the per-match datasets of every finished match in a league season to Parquet
+
+        Each dataset is one of the DataFrame parts of ``scrape_match_bundle()`` and is written as
+        soon as its match is done, partitioned by match ID, to
+        ``<directory>/<dataset>/match_id=<ID>/part-0.parquet``. A whole dataset can be read with
+        e.g. ``pyarrow.parquet.read_table(<directory>/"shotmap")``. Columns of dicts are flattened
+        into "column.key" columns and lists are stored as JSON strings. All of the partitions of a
+        dataset share one schema, see ``ScraperFC.utils.write_partition()``.
+
+        Finished matches are recorded in ``checkpoint``, which by default is a SQLite manifest at
+        ``<directory>/_manifest.sqlite``. Running the crawl again skips the matches in the
+        manifest, so a crawl that crashed or was stopped carries on where it left off. A match
+        that fails, including when any endpoint returns an error other than 404 (e.g. 403, 429 or
+        5xx), is skipped with a warning and isn't recorded, so it's tried again next time. A 404
+        means the match has no data for that dataset and is recorded as 0 rows.
+
+        Matches are scraped one per browser session in the pool at a time (see ``pool_size``),
+        and within the sofascore.com rate limit (2 requests per second by default, see
+        ``ScraperFC.utils.set_rate_limit()``).
+
+        :param year: .. include:: ./arg_docstrings/year_sofascore.rst
+        :type year: str
+        :param league: .. include:: ./arg_docstrings/league.rst
+        :type league: str
+        :param directory: Directory to write to. Created if it doesn't exist.
+        :type directory: str | Path
+        :param datasets: Datasets to scrape (default: None, ``["statistics", "lineups",
+            "shotmap", "graph"]``)
+        :type datasets: list[str] | None
+        :param checkpoint: Manifest of the finished matches (default: None, a manifest in
+            ``directory``)
+        :type checkpoint: CheckpointStore | None
+        :raises TypeError: If any of the parameters are the wrong type.
+        :raises ValueError: If any of the datasets are not valid.
+        :raises InvalidYearException: If the year is not valid for the league.
+        :raises ImportError: If pyarrow is not installed
+        :return: Rows written for each dataset of every match in the manifest, including those
+            from earlier runs, {match ID: {dataset: rows, ...}, ...}
+        :rtype: dict[int, dict[str, int]]
+        """
+        valid_datasets = ["statistics", "lineups", "graph", "shotmap", "average-positions"]
+        if not isinstance(directory, (str, Path)):
+            raise TypeError("`directory` must be a string or Path.")
+        if datasets is None:
+            datasets = ["statistics", "lineups", "shotmap", "graph"]
+        if not isinstance(datasets, list) or not all(isinstance(d, str) for d in datasets):
+            raise TypeError("`datasets` must be a list of strings or None.")
+        invalid_datasets = [d for d in datasets if d not in valid_datasets]
+        if len(invalid_datasets) > 0:
+            raise ValueError(
+                f"{invalid_datasets} are not valid datasets. Must be in {valid_datasets}."
+            )
+        if checkpoint is not None and not isinstance(checkpoint, CheckpointStore):
+            raise TypeError("`checkpoint` must be a CheckpointStore or None.")
+        import_pyarrow()
+        datasets = list(dict.fromkeys(datasets))
+
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        manifest = CheckpointStore(directory / "_manifest.sqlite") if checkpoint is None \
+            else checkpoint
+        namespace = f"sofascore/crawl/{league}/{year}"
+
+        try:
+            done = {int(k): v for k, v in manifest.items(namespace).items()}
+            match_ids = [
+                match["id"] for match in self.get_match_dicts(year, league)
+                if match.get("status", dict()).get("type") == "finished"
+            ]
+            match_ids = [i for i in dict.fromkeys(match_ids) if i not in done]
+            # Schema of each dataset so far. Writes are one at a time so that all of the
+            # partitions of a dataset keep the same schema, see write_partition().
+            schemas: dict[str, Any] = dict()
+            write_lock = threading.Lock()
+
+            def _crawl(match_id: int) -> dict[str, int]:
+                responses: dict[str, dict] = dict()
+                bundle = self._scrape_match_bundle(match_id, datasets, responses)  # type: ignore
+                # A 404 means the match has no data for an endpoint. Anything else (e.g. 403, 429
+                # or 5xx) may go away, so the match isn't recorded and is tried again next time.
+                errors = [
+                    f"{endpoint or 'event'} ({response['error'].get('code')})"
+                    for endpoint, response in responses.items()
+                    if "error" in response and response["error"].get("code") != 404
+                ]
+                if len(errors) > 0:
+                    raise RuntimeError(f"Error responses from {', '.join(errors)}")
+                rows = dict()
+                for dataset, df in bundle.items():
+                    rows[dataset] = df.shape[0]
+                    if df.shape[0] == 0:
+                        continue
+                    table = records_to_arrow(df)
+                    with write_lock:
+                        schemas[dataset] = write_partition(
+                            table, directory / dataset, f"match_id={match_id}",  # type: ignore
+                            schemas.get(dataset)
+                        )
+                manifest.save(namespace, str(match_id), rows)
+                return rows
+
+            with ThreadPoolExecutor(max_workers=self._browser_pool.size) as executor:
+                futures = {executor.submit(_crawl, match_id): match_id for match_id in match_ids}
+                for future in tqdm(
+                        as_completed(futures), total=len(futures), desc=f"{year} {league} matches"
+                ):
+                    match_id = futures[future]
+                    try:
+                        done[match_id] = future.result()
+                    except Exception as e:
+                        warnings.warn(f"Failed to crawl match {match_id}: {e!r}. Skipping it.")
+        finally:
+            if checkpoint is None:
+                manifest.close()
+
+        return done
+
+    # ==============================================================================================
+    def track_live(
+            self, match_ids: list[str | int], interval: float = 30, max_interval: float = 120,
+            max_failures: int = 5
+    ) -> Iterator[dict[str, Any]]:
+        """ Follow in-progress matches, yielding only what has changed since the last poll
+
+        Each poll loads the event, statistics, graph (momentum) and shotmap endpoints of the
+        matches that are due, concurrently through the browser sessions in the pool (see
+        ``pool_size``) and within the sofascore.com rate limit (2 requests per second by default,
+        see ``ScraperFC.utils.set_rate_limit()``). Live responses always skip the response cache.
+
+        The responses are compared with the previous poll of the same match and an update is
+        yielded for each part that changed:
+
+        * ``"event"``: {field: new value, ...} for the top-level fields of the match dict (see
+          ``get_match_dict()``) that changed
+        * ``"statistics"``: list of the statistics items that are new or changed, with the
+          ``period`` and ``group`` columns of ``scrape_team_match_stats()``
+        * ``"graph"``: list of the momentum points that are new or changed
+        * ``"shotmap"``: list of the shots that are new or changed
+
+        The first update of each part holds everything loaded so far. A match is polled every
+        ``interval`` seconds while it keeps changing. After each poll without changes (e.g. at
+        half time) the wait for that match doubles, up to ``max_interval``. A match stops being
+        tracked once its status is finished, canceled or postponed, after the updates of its last
+        poll. The generator ends once every match has stopped.
+
+        Polls where the event endpoint fails (e.g. 403, 429 or 5xx responses) back off the same
+        way and are retried. A match is only dropped, with a warning, after ``max_failures`` of
+        them in a row.
+
+        Example
+        -------
+        >>> for update in ss.track_live([12437649, 12437650]):
+        ...     if update["part"] == "shotmap":
+        ...         print(update["match_id"], len(update["changes"]), "new shots")
+
+        :param match_ids: Sofascore match URLs or match IDs
+        :type match_ids: list[str | int]
+        :param interval: Seconds between polls of a match that is changing (default: 30)
+        :type interval: float
+        :param max_interval: Longest wait between polls of a match that isn't changing (default:
+            120)
+        :type max_interval: float
+        :param max_failures: Failed polls in a row after which a match is dropped (default: 5)
+        :type max_failures: int
+        :raises TypeError: If any of the parameters are the wrong type.
+        :raises ValueError: If ``interval`` is negative, ``max_interval`` is less than
+            ``interval`` or ``max_failures`` is less than 1.
+        :return: Updates, {"match_id": int, "part": str, "changes": dict | list}
+        :rtype: Iterator[dict[str, Any]]
+        """
+        if not isinstance(match_ids, list):
+            raise TypeError("`match_ids` must be a list.")
+        if not isinstance(interval, (int, float)) or not isinstance(max_interval, (int, float)):
+            raise TypeError("`interval` and `max_interval` must be numbers.")
+        if interval < 0 or max_interval < interval:
+            raise ValueError(
+                "`interval` must not be negative and `max_interval` must not be less than it."
+            )
+        if not isinstance(max_failures, int):
+            raise TypeError("`max_failures` must be an int.")
+        if max_failures < 1:
+            raise ValueError("`max_failures` must be at least 1.")
+        match_ids = list(dict.fromkeys(self._check_and_convert_match_id(m) for m in match_ids))
+        return self._track_live(match_ids, interval, max_interval, max_failures)  # type: ignore
+
+    # ==============================================================================================
+    def _track_live(
+            self, match_ids: list[int], interval: float, max_interval: float, max_failures: int
+    ) -> Iterator[dict[str, Any]]:
+        """ Private, the generator of track_live(), so its arguments are checked when it's called
+        instead of when it's first iterated
+        """
+        parts = ["event", "statistics", "graph", "shotmap"]  # The event part is /event/{id}
+        seen: dict[int, dict[str, dict]] = {m: {part: dict() for part in parts} for m in match_ids}
+        waits = {m: float(interval) for m in match_ids}
+        failures = {m: 0 for m in match_ids}
+        next_poll = {m: 0.0 for m in match_ids}
+
+        while len(next_poll) > 0:
+            now = time.monotonic()
+            due = [m for m, t in next_poll.items() if t <= now]
+            if len(due) == 0:
+                time.sleep(min(next_poll.values()) - now)
+                continue
+
+            urls = [
+                f"{API_PREFIX}/event/{m}" + (f"/{part}" if part != "event" else "")
+                for m in due for part in parts
+            ]
+            responses = self._get_json_many(urls, live=True)
+            for i, match_id in enumerate(due):
+                changed = False
+                status = None
+                for j, part in enumerate(parts):
+                    url, response = urls[i * len(parts) + j], responses[i * len(parts) + j]
+                    if "error" in response:
+                        if part == "event":
+                            failures[match_id] += 1
+                            if failures[match_id] >= max_failures:
+                                warnings.warn(
+                                    f"Encountered {response['error'].get('code')}: "
+                                    f"{response['error'].get('message')} from {url}, "
+                                    f"{failures[match_id]} polls in a row. Stopped tracking "
+                                    f"match {match_id}."
+                                )
+                                status = "failed"
+                        # The other endpoints are missing until there is data for them
+                        continue
+
+                    records = _live_records(part, response)
+                    if part == "event":
+                        failures[match_id] = 0
+                        status = response["event"].get("status", dict()).get("type")
+                    changes = {
+                        key: record for key, record in records.items()
+                        if seen[match_id][part].get(key) != record
+                    }
+                    seen[match_id][part] = records
+                    if len(changes) > 0:
+                        changed = True
+                        yield {
+                            "match_id": match_id, "part": part,
+                            "changes": changes if part == "event" else list(changes.values())
+                        }
+
+                if status in ["finished", "canceled", "postponed", "failed"]:
+                    del next_poll[match_id]
+                    continue
+                waits[match_id] = interval if changed else min(waits[match_id] * 2, max_interval)
+                next_poll[match_id] = time.monotonic() + waits[match_id]
+
     # ==============================================================================================
     def scrape_team_league_stats(self, year: str, league: str) -> pd.DataFrame:
         """ Get "general" league stats for all teams in the given league year.
@@ -532,6 +1006,8 @@ class Sofascore:
         :type league: str
         :raises TypeError: If any of the parameters are the wrong type.
         :raises InvalidYearException: If the year is not valid for the league.
+        :return: One row per team. The first columns are ``teamName`` and ``teamId``, followed by
+            the stats columns in the order they were first seen.
         :rtype: pd.DataFrame
         """
         if not isinstance(year, str):
@@ -546,43 +1022,29 @@ class Sofascore:
         year_id = valid_seasons[year]
 
         # Find all teams in the league that season
-        teams_list = botasaurus_browser_get_json(
+        teams_list = self._get_json(
             f"{API_PREFIX}/unique-tournament/{league_id}/season/{year_id}/teams"
         )["teams"]
 
-        # Iterate over teams and build dataframe of stats
-        df = pd.DataFrame()
+        # Iterate over teams and collect a row of stats for each
+        rows = list()
         for team in (pbar := tqdm(teams_list, ncols=100)):
             team_id = team["id"]
             pbar.set_description(f"{year} {league}, team ID {team_id}")
-            result = botasaurus_browser_get_json(
+            result = self._get_json(
                 f"{API_PREFIX}/team/{team_id}/unique-tournament/{league_id}/season/{year_id}/"
                 "statistics/overall"
             )
 
-            if "statistics" in result:
-                # Team has league stats, build series with them
-                team_stats_dict = result["statistics"]
-                team_row = pd.Series(team_stats_dict)
-            else:
-                # This team has no stats, build an empty series for their row
-                team_row = pd.Series()
-
-            # Insert team name and ID into series and convert to DataFrame row
-            team_row["teamId"] = team_id
-            team_row["teamName"] = team["name"]
-            team_row = team_row.to_frame().T
-
-            # Append the team row to the main DataFrame
-            df = pd.concat([df, team_row], axis=0, ignore_index=True)
+            # Teams without league stats only get the team ID and name, the rest of their row is
+            # NaN
+            rows.append(
+                {**result.get("statistics", dict()), "teamId": team_id, "teamName": team["name"]}
+            )
 
         # Reorder columns so that team name and ID are first
-        df = pd.concat(
-            [df["teamName"], df["teamId"], df.drop(columns=["teamName", "teamId"])],
-            axis=1
-        )
-
-        return df
+        df = pd.DataFrame(rows, columns=None if rows else ["teamId", "teamName"])
+        return df[["teamName", "teamId"] + df.columns.drop(["teamName", "teamId"]).tolist()]
 
     # ==============================================================================================
     def scrape_player_details(self, year: str, league: str) -> list[SofascorePlayer]:
@@ -592,72 +1054,212 @@ class Sofascore:
         Please note, the player's team is their current team, not necessarily their team in the
         given year and league.
 
+        Players are scraped concurrently, one per browser session in the pool (see
+        ``pool_size``), and within the sofascore.com rate limit (2 requests per second by default,
+        see ``ScraperFC.utils.set_rate_limit()``). A player that fails to scrape doesn't stop the
+        others. A warning is shown and the player is returned as a placeholder
+        with only ``id`` and ``error`` set.
+
         :param year: .. include:: ./arg_docstrings/year_sofascore.rst
         :type year: str
         :param league: .. include:: ./arg_docstrings/league.rst
         :type league: str
+        :return: The players, in the order of ``get_league_player_ids()``
         :rtype: list[SofascorePlayer]
         """
         player_ids = self.get_league_player_ids(year, league)
         if len(player_ids) == 0:
             print(f"WARNING: No players found for {year} {league}.")
 
-        player_details = list()
-        pbar = tqdm(player_ids, ncols=100)
-        for player_id in pbar:
-            pbar.set_description(f"{year} {league}, player ID {player_id}")
-
-            url = f"{API_PREFIX}/player/{player_id}"
-            response = botasaurus_browser_get_json(url)
-            player_dict = response["player"]
-
-            player_name = player_dict["name"]
-            team_name = player_dict["team"]["name"]
-            team_id = player_dict["team"]["id"]
-            position = player_dict["position"] if "position" in player_dict else None
-            positions_detailed = (
-                player_dict["positionsDetailed"] if "positionsDetailed" in player_dict else None
-            )
-            weight = player_dict["weight"] if "weight" in player_dict else None
-            height = player_dict["height"] if "height" in player_dict else None
-            # Need to do UNIX time=0 then plus DOB timestamp because sometimes Windows is dumb with
-            # negative UNIX timestamps I guess. This should work on all platforms.
-            dob = (
-                datetime.fromtimestamp(0, timezone.utc)
-                + timedelta(seconds=player_dict["dateOfBirthTimestamp"])
-                if "dateOfBirthTimestamp" in player_dict else None
-            )
-            preferred_foot = (
-                player_dict["preferredFoot"] if "preferredFoot" in player_dict else None
-            )
-            country = (
-                player_dict["country"]["name"] if "country" in player_dict
-                and "name" in player_dict["country"] else None
-            )
-            contract_until = (
-                datetime.fromtimestamp(0, timezone.utc)
-                + timedelta(seconds=player_dict["contractUntilTimestamp"])
-                if "contractUntilTimestamp" in player_dict else None
-            )
-            market_value = (
-                player_dict["proposedMarketValueRaw"]["value"]
-                if "proposedMarketValueRaw" in player_dict
-                and "value" in player_dict["proposedMarketValueRaw"] else None
-            )
-            market_value_currency = (
-                player_dict["proposedMarketValueRaw"]["currency"]
-                if "proposedMarketValueRaw" in player_dict
-                and "currency" in player_dict["proposedMarketValueRaw"] else None
-            )
-            career_stats = _get_player_career_stats_df(player_id, API_PREFIX)
-
-            player = SofascorePlayer(
-                id=player_id, name=player_name, team_name=team_name, team_id=team_id,
-                position=position, positions_detailed=positions_detailed, weight=weight,
-                height=height, dob=dob, preferred_foot=preferred_foot, country=country,
-                contract_until=contract_until, market_value=market_value,
-                market_value_currency=market_value_currency, career_stats=career_stats
-            )
-            player_details.append(player)
+        player_details: list[SofascorePlayer | None] = [None] * len(player_ids)
+        players = self._scrape_players(player_ids)
+        for i, player in tqdm(players, total=len(player_ids), desc=f"{year} {league}", ncols=100):
+            player_details[i] = player
+
+        return player_details  # type: ignore
+
+    # ==============================================================================================
+    def iter_player_details(self, year: str, league: str) -> Iterator[SofascorePlayer]:
+        """ Like ``scrape_player_details()``, but yields each player as soon as it has been
+        scraped, so the players can be used or saved while the rest are still loading.
+
+        Players come out in the order they finish, not the order of
+        ``get_league_player_ids()``.
+
+        :param year: .. include:: ./arg_docstrings/year_sofascore.rst
+        :type year: str
+        :param league: .. include:: ./arg_docstrings/league.rst
+        :type league: str
+        :rtype: Iterator[SofascorePlayer]
+        """
+        player_ids = self.get_league_player_ids(year, league)
+        if len(player_ids) == 0:
+            print(f"WARNING: No players found for {year} {league}.")
+
+        for _, player in self._scrape_players(player_ids):
+            yield player
+
+    # ==============================================================================================
+    def _scrape_players(self, player_ids: list[int]) -> Iterator[tuple[int, SofascorePlayer]]:
+        """ Private, scrapes players in the pool's sessions and yields ``(index in player_ids,
+        player)`` as each one finishes. Failed players are yielded as placeholders.
+        """
+        def _scrape(player_id: int) -> SofascorePlayer:
+            try:
+                return self._scrape_player(player_id)
+            except Exception as e:
+                warnings.warn(f"Failed to scrape player {player_id}: {e!r}. Returning placeholder.")
+                return SofascorePlayer(
+                    id=player_id, name=None, team_name=None, team_id=None, position=None,
+                    positions_detailed=None, weight=None, height=None, dob=None,
+                    preferred_foot=None, country=None, contract_until=None, market_value=None,
+                    market_value_currency=None, career_stats=pd.DataFrame(), error=repr(e)
+                )
+
+        executor = ThreadPoolExecutor(max_workers=self._browser_pool.size)
+        try:
+            futures = {
+                executor.submit(_scrape, player_id): i for i, player_id in enumerate(player_ids)
+            }
+            for future in as_completed(futures):
+                yield futures[future], future.result()
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    # ==============================================================================================
+    def _scrape_player(self, player_id: int) -> SofascorePlayer:
+        """ Private, scrapes the details of one player """
+        url = f"{API_PREFIX}/player/{player_id}"
+        response = self._get_json(url)
+        player_dict = response["player"]
+
+        player_name = player_dict["name"]
+        team_name = player_dict["team"]["name"]
+        team_id = player_dict["team"]["id"]
+        position = player_dict["position"] if "position" in player_dict else None
+        positions_detailed = (
+            player_dict["positionsDetailed"] if "positionsDetailed" in player_dict else None
+        )
+        weight = player_dict["weight"] if "weight" in player_dict else None
+        height = player_dict["height"] if "height" in player_dict else None
+        # Need to do UNIX time=0 then plus DOB timestamp because sometimes Windows is dumb with
+        # negative UNIX timestamps I guess. This should work on all platforms.
+        dob = (
+            datetime.fromtimestamp(0, timezone.utc)
+            + timedelta(seconds=player_dict["dateOfBirthTimestamp"])
+            if "dateOfBirthTimestamp" in player_dict else None
+        )
+        preferred_foot = (
+            player_dict["preferredFoot"] if "preferredFoot" in player_dict else None
+        )
+        country = (
+            player_dict["country"]["name"] if "country" in player_dict
+            and "name" in player_dict["country"] else None
+        )
+        contract_until = (
+            datetime.fromtimestamp(0, timezone.utc)
+            + timedelta(seconds=player_dict["contractUntilTimestamp"])
+            if "contractUntilTimestamp" in player_dict else None
+        )
+        market_value = (
+            player_dict["proposedMarketValueRaw"]["value"]
+            if "proposedMarketValueRaw" in player_dict
+            and "value" in player_dict["proposedMarketValueRaw"] else None
+        )
+        market_value_currency = (
+            player_dict["proposedMarketValueRaw"]["currency"]
+            if "proposedMarketValueRaw" in player_dict
+            and "currency" in player_dict["proposedMarketValueRaw"] else None
+        )
+        career_stats = _get_player_career_stats_df(
+            player_id, API_PREFIX, self._browser_pool, self.cache
+        )
+
+        return SofascorePlayer(
+            id=player_id, name=player_name, team_name=team_name, team_id=team_id,
+            position=position, positions_detailed=positions_detailed, weight=weight,
+            height=height, dob=dob, preferred_foot=preferred_foot, country=country,
+            contract_until=contract_until, market_value=market_value,
+            market_value_currency=market_value_currency, career_stats=career_stats
+        )
+
 
-        return player_details
+# ==================================================================================================
+def _live_records(part: str, response: dict) -> dict:
+    """ Private, the records of a live response keyed so that track_live() can tell which of
+    them changed between polls
+    """
+    if part == "event":
+        return dict(response["event"])
+    if part == "statistics":
+        return {
+            (period["period"], group["groupName"], item["name"]): {
+                **item, "period": period["period"], "group": group["groupName"]
+            }
+            for period in response["statistics"] for group in period["groups"]
+            for item in group["statisticsItems"]
+        }
+    if part == "graph":
+        return {point["minute"]: point for point in response["graphPoints"]}
+    return {shot.get("id", i): shot for i, shot in enumerate(response["shotmap"])}
+
+# ==================================================================================================
+def bin_heatmaps(
+        heatmaps: dict | list[dict], bins: int | tuple[int, int] = 10
+) -> dict[int, np.ndarray]:
+    """ Bins heatmaps into a fixed grid of counts for each player
+
+    Takes the output of ``Sofascore.scrape_heatmaps()`` for one match, or a list of them for a
+    whole season, and adds up the points of each player across all of the matches. Heatmaps can
+    be lists of (x, y) tuples or arrays from ``scrape_heatmaps(as_array=True)``. Sofascore
+    coordinates go from 0 to 100 and the grid covers that whole range.
+
+    All of the points are binned at once, so a season of hundreds of players takes one pass over
+    the coordinates instead of one histogram per player per match.
+
+    Example
+    -------
+    >>> heatmaps = [ss.scrape_heatmaps(match_id, as_array=True) for match_id in match_ids]
+    >>> grids = bin_heatmaps(heatmaps, bins=(12, 8))
+    >>> grids[player_id].shape
+    (12, 8)
+
+    :param heatmaps: Heatmaps of one match, or a list of heatmaps of many matches
+    :type heatmaps: dict | list[dict]
+    :param bins: Number of bins along x and y, or one number for both (default: 10)
+    :type bins: int | tuple[int, int]
+    :raises TypeError: If any of the parameters are the wrong type.
+    :raises ValueError: If ``bins`` is not positive.
+    :return: {player ID: counts, ...}, where counts has shape (x bins, y bins) and is indexed
+        ``[x bin, y bin]`` like ``np.histogram2d()``. Players whose heatmaps are all empty get a
+        grid of zeros.
+    :rtype: dict[int, np.ndarray]
+    """
+    if isinstance(heatmaps, dict):
+        heatmaps = [heatmaps]
+    if not isinstance(heatmaps, list) or not all(isinstance(h, dict) for h in heatmaps):
+        raise TypeError("`heatmaps` must be a dict or a list of dicts.")
+    nx, ny = (bins, bins) if isinstance(bins, int) else bins
+    if not isinstance(nx, int) or not isinstance(ny, int):
+        raise TypeError("`bins` must be an int or a tuple of 2 ints.")
+    if nx < 1 or ny < 1:
+        raise ValueError("`bins` must be positive.")
+
+    player_index: dict[int, int] = dict()
+    points, owners = list(), list()
+    for match_heatmaps in heatmaps:
+        for player in match_heatmaps.values():
+            i = player_index.setdefault(player["id"], len(player_index))
+            coords = np.asarray(player["heatmap"], dtype=np.float32).reshape(-1, 2)
+            points.append(coords)
+            owners.append(np.full(coords.shape[0], i, dtype=np.int64))
+    if len(player_index) == 0:
+        return dict()
+
+    coords = np.concatenate(points)
+    ix = np.clip((coords[:, 0] * (nx / 100)).astype(np.int64), 0, nx - 1)
+    iy = np.clip((coords[:, 1] * (ny / 100)).astype(np.int64), 0, ny - 1)
+    flat = (np.concatenate(owners) * nx + ix) * ny + iy
+    counts = np.bincount(flat, minlength=len(player_index) * nx * ny)
+    counts = counts.reshape(len(player_index), nx, ny)
+    return {player_id: counts[i] for player_id, i in player_index.items()}
@@ -1,23 +1,30 @@
 import pandas as pd
 from .utils.botasaurus_getters import botasaurus_browser_get_json
+from .utils.browser_pool import BrowserPool
+from .utils.response_cache import ResponseCache
+from .utils.flatten_dict_columns import flatten_dict_columns
 
 # ==================================================================================================
-def _get_player_career_stats_df(player_id: int, api_prefix: str) -> pd.DataFrame:
+def _get_player_career_stats_df(
+        player_id: int, api_prefix: str, pool: BrowserPool | None = None,
+        cache: ResponseCache | None = None
+) -> pd.DataFrame:
     if not isinstance(player_id, int):
         raise TypeError("player_id must be an integer.")
 
-    response = botasaurus_browser_get_json(f"{api_prefix}/player/{player_id}/statistics")
+    response = botasaurus_browser_get_json(
+        f"{api_prefix}/player/{player_id}/statistics", pool=pool, cache=cache
+    )
 
     if "seasons" not in response:
         return pd.DataFrame()
 
     df = pd.DataFrame(response["seasons"])
 
-    # Explode any columns that are dictionaries
-    while dict in set(type(df.loc[0,col]) for col in df.columns):
-        for col in df.columns:
-            if isinstance(df.loc[0,col], dict):
-                temp = df[col].apply(pd.Series).add_prefix(f"{col}.")
-                df = df.drop(columns=[col]).join(temp)
+    # Explode any columns that are dictionaries, until there are no nested dicts left
+    while len(dict_cols := [col for col in df.columns if isinstance(df.loc[0, col], dict)]) > 0:
+        temp = flatten_dict_columns(df[dict_cols], sep=".")
+        df = df.drop(columns=dict_cols).join(temp)
 
     return df
+
@@ -5,9 +5,9 @@ import pandas as pd
 @dataclass
 class SofascorePlayer:
     id: int
-    name: str
-    team_name: str
-    team_id: int
+    name: str | None
+    team_name: str | None
+    team_id: int | None
     position: str | None
     positions_detailed: list[str] | None
     weight: int | None
@@ -19,6 +19,7 @@ class SofascorePlayer:
     market_value: int | None
     market_value_currency: str | None
     career_stats: pd.DataFrame
+    error: str | None = None  # Set on placeholders for players that failed to scrape
 
     def __repr__(self) -> str:
         return f"SofascorePlayer(id={self.id}, name={self.name})"
@@ -1,11 +1,11 @@
 from tqdm import tqdm
 import requests
-from bs4 import BeautifulSoup
 import pandas as pd
 import cloudscraper
 import warnings
 from .scraperfc_exceptions import InvalidLeagueException, InvalidYearException
-from ScraperFC.utils import get_module_comps, botasaurus_request_get_soup
+from ScraperFC.utils import get_module_comps, botasaurus_request_get_soup, ResponseCache, \
+    SeasonCatalog, rate_limit, make_soup, response_content
 
 TRANSFERMARKT_ROOT = "https://www.transfermarkt.us"
 
@@ -13,6 +13,43 @@ comps = get_module_comps("TRANSFERMARKT")
 
 
 class Transfermarkt():
+    """ Scrapes data from Transfermarkt.
+
+    :param cache: Response cache to read pages through (default: None, no caching)
+    :type cache: ResponseCache | None
+    :param season_ttl: Seconds to keep each league's valid seasons in ``season_catalog`` before
+        fetching them again, or None to keep them for the lifetime of the object (default: 1 day)
+    :type season_ttl: float | None
+    :raises TypeError: If ``cache`` is not a ResponseCache or None, or ``season_ttl`` is not a
+        number or None
+    :raises ValueError: If ``season_ttl`` is negative
+    """
+
+    # ==============================================================================================
+    def __init__(
+            self, cache: ResponseCache | None = None, season_ttl: float | None = 24 * 60 * 60
+    ) -> None:
+        if cache is not None and not isinstance(cache, ResponseCache):
+            raise TypeError("`cache` must be a ResponseCache or None.")
+        self.cache = cache
+        self.season_catalog = SeasonCatalog(ttl=season_ttl)
+
+    # ==============================================================================================
+    def _get_content(
+            self, url: str, session: cloudscraper.CloudScraper | None = None,
+            headers: dict | None = None
+    ) -> bytes:
+        """ Private, gets a page's content through the cache. Uses ``session`` if given, else
+        plain requests.
+        """
+        def _fetch() -> bytes:
+            rate_limit(url)
+            getter = requests.get if session is None else session.get
+            return response_content(getter(url, headers=headers))
+
+        if self.cache is None:
+            return _fetch()
+        return self.cache.get_or_fetch(url, _fetch)  # type: ignore
 
     # ==============================================================================================
     def get_valid_seasons(self, league: str) -> dict:
@@ -30,13 +67,18 @@ class Transfermarkt():
         if league not in comps.keys():
             raise InvalidLeagueException(league, "Transfermarkt", list(comps.keys()))
 
-        season_select_tag = None
-        while not season_select_tag:
-            soup = botasaurus_request_get_soup(comps[league]["TRANSFERMARKT"])
-            season_select_tag = soup.find("select", {"name": "saison_id"})
-        season_tags = season_select_tag.find_all("option")  # type: ignore
-        valid_seasons = {x.text: x["value"] for x in season_tags}
-        return valid_seasons
+        def _fetch() -> dict:
+            season_select_tag = None
+            while not season_select_tag:
+                soup = botasaurus_request_get_soup(comps[league]["TRANSFERMARKT"], cache=self.cache)
+                season_select_tag = soup.find("select", {"name": "saison_id"})
+                if not season_select_tag and self.cache is not None:
+                    # Don't keep serving a page that was missing the dropdown
+                    self.cache.invalidate(comps[league]["TRANSFERMARKT"])
+            season_tags = season_select_tag.find_all("option")  # type: ignore
+            return {x.text: x["value"] for x in season_tags}
+
+        return self.season_catalog.get_or_fetch(league, _fetch)
 
     # ==============================================================================================
     def get_club_links(self, year: str, league: str) -> list[str]:
@@ -59,9 +101,11 @@ class Transfermarkt():
 
         scraper = cloudscraper.CloudScraper()
         try:
-            soup = BeautifulSoup(
-                scraper.get(f"{comps[league]['TRANSFERMARKT']}/plus/?saison_id={valid_seasons[year]}").content,
-                "html.parser"
+            soup = make_soup(
+                self._get_content(
+                    f"{comps[league]['TRANSFERMARKT']}/plus/?saison_id={valid_seasons[year]}",
+                    scraper
+                )
             )
             items_table_tag = soup.find("table", {"class": "items"})
             if items_table_tag is None:
@@ -92,7 +136,7 @@ class Transfermarkt():
         try:
             club_links = self.get_club_links(year, league)
             for club_link in tqdm(club_links, desc=f"{year} {league} player links"):
-                soup = BeautifulSoup(scraper.get(club_link).content, "html.parser")
+                soup = make_soup(self._get_content(club_link, scraper))
                 player_table = soup.find("table", {"class": "items"})
                 if player_table is not None:
                     player_els = player_table.find_all("td", {"class": "hauptlink"})  # type: ignore
@@ -120,7 +164,7 @@ class Transfermarkt():
         fixtures_url = f"{comps[league]['TRANSFERMARKT'].replace('startseite', 'gesamtspielplan')}/saison_id/{valid_seasons[year]}"
         scraper = cloudscraper.CloudScraper()
         try:
-            soup = BeautifulSoup(scraper.get(fixtures_url).content, "html.parser")
+            soup = make_soup(self._get_content(fixtures_url, scraper))
             match_tags = soup.find_all("a", {"class": "ergebnis-link"})
             match_links = ["https://www.transfermarkt.us" + x["href"] for x in match_tags]
             return match_links
@@ -139,12 +183,11 @@ class Transfermarkt():
         :rtype: pd.DataFrame
         """
         player_links = self.get_player_links(year, league)
-        df = pd.DataFrame()
-        for player_link in tqdm(player_links, desc=f"{year} {league} players"):
-            player = self.scrape_player(player_link)
-            df = pd.concat([df, player], axis=0, ignore_index=True)
-
-        return df
+        players = [
+            self.scrape_player(player_link)
+            for player_link in tqdm(player_links, desc=f"{year} {league} players")
+        ]
+        return pd.concat(players, axis=0, ignore_index=True) if players else pd.DataFrame()
 
     # ==============================================================================================
     def scrape_player(self, player_link: str) -> pd.DataFrame:
@@ -156,14 +199,14 @@ class Transfermarkt():
         :return: 1-row dataframe with all of the player details
         :rtype: pd.DataFrame
         """
-        r = requests.get(
+        content = self._get_content(
             player_link,
             headers={
                 "user-agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 " +\
                     "(KHTML, like Gecko) Chrome/55.0.2883.87 Safari/537.36"
             }
         )
-        soup = BeautifulSoup(r.content, "html.parser")
+        soup = make_soup(content)
 
         # Name
         name_tag = soup.find("h1", {"class": "data-header__headline-wrapper"})
@@ -3,9 +3,9 @@ import json
 import pandas as pd
 from tqdm import tqdm
 import requests
-from bs4 import BeautifulSoup
 import warnings
-from ScraperFC.utils import get_module_comps
+from ScraperFC.utils import get_module_comps, ResponseCache, SeasonCatalog, rate_limit, make_soup,\
+    flatten_dict_columns, response_content
 
 comps = get_module_comps("UNDERSTAT")
 
@@ -16,6 +16,38 @@ def _json_from_script(text: str) -> dict:
 
 
 class Understat:
+    """ Scrapes data from Understat.
+
+    :param cache: Response cache to read pages through (default: None, no caching)
+    :type cache: ResponseCache | None
+    :param season_ttl: Seconds to keep each league's valid seasons in ``season_catalog`` before
+        fetching them again, or None to keep them for the lifetime of the object (default: 1 day)
+    :type season_ttl: float | None
+    :raises TypeError: If ``cache`` is not a ResponseCache or None, or ``season_ttl`` is not a
+        number or None
+    :raises ValueError: If ``season_ttl`` is negative
+    """
+
+    # ==============================================================================================
+    def __init__(
+            self, cache: ResponseCache | None = None, season_ttl: float | None = 24 * 60 * 60
+    ) -> None:
+        if cache is not None and not isinstance(cache, ResponseCache):
+            raise TypeError('`cache` must be a ResponseCache or None.')
+        self.cache = cache
+        self.season_catalog = SeasonCatalog(ttl=season_ttl)
+
+    # ==============================================================================================
+    def _get_content(self, url: str) -> bytes | None:
+        """ Private, gets a page's content through the cache. Returns None for 404s, which are not
+        cached.
+        """
+        def _fetch() -> bytes | None:
+            rate_limit(url)
+            r = requests.get(url)
+            return None if r.status_code == 404 else response_content(r)
+
+        return _fetch() if self.cache is None else self.cache.get_or_fetch(url, _fetch)
 
     # ==============================================================================================
     def get_season_link(self, year: str, league: str) -> str:
@@ -56,10 +88,13 @@ class Understat:
         if league not in comps.keys():
             raise InvalidLeagueException(league, 'Understat', list(comps.keys()))
 
-        soup = BeautifulSoup(requests.get(comps[league]["UNDERSTAT"]).content, 'html.parser')
-        valid_season_tags = soup.find('select', {'name': 'season'}).find_all('option')  # type: ignore
-        valid_seasons = [x.text for x in valid_season_tags]
-        return valid_seasons
+        def _fetch() -> list[str]:
+            soup = make_soup(self._get_content(comps[league]["UNDERSTAT"]))
+            valid_season_tags = soup.find('select', {'name': 'season'})\
+                .find_all('option')  # type: ignore
+            return [x.text for x in valid_season_tags]
+
+        return self.season_catalog.get_or_fetch(league, _fetch)
 
     # ==============================================================================================
     def get_match_links(self, year: str, league: str) -> list[str]:
@@ -104,7 +139,7 @@ class Understat:
         :rtype: tuple[dict, dict, dict]
         """
         season_link = self.get_season_link(year, league)
-        soup = BeautifulSoup(requests.get(season_link).content, 'html.parser')
+        soup = make_soup(self._get_content(season_link))
 
         scripts = soup.find_all('script')
         dates_data_tag = [x for x in scripts if 'datesData' in x.text][0]
@@ -130,20 +165,16 @@ class Understat:
         """
         _, teams_data, _ = self.scrape_season_data(year, league)
 
-        df = pd.DataFrame()
+        team_matches = list()
         for x in teams_data.values():
             # Create matches df for each team
-            matches = pd.DataFrame.from_dict(x['history'])
-            newcols = list()
-            for c in matches.columns:
-                if isinstance(matches.loc[0, c], dict):
-                    newcols.append(matches[c].apply(pd.Series).add_prefix(f'{c}_'))
-                else:
-                    newcols.append(matches[c])  # type: ignore
-            matches = pd.concat(newcols, axis=1)
+            matches = flatten_dict_columns(pd.DataFrame.from_dict(x['history']))
             matches['id'] = [x['id'],] * matches.shape[0]
             matches['title'] = [x['title'],] * matches.shape[0]
-            df = pd.concat([df, matches], axis=0, ignore_index=True)
+            team_matches.append(matches)
+        if len(team_matches) == 0:
+            return pd.DataFrame(), pd.DataFrame(), pd.DataFrame()
+        df = pd.concat(team_matches, axis=0, ignore_index=True)
 
         # Rename columns to match Understat
         colmapping = {
@@ -209,8 +240,8 @@ class Understat:
         if not isinstance(as_df, bool):
             raise TypeError('`as_df` must be a boolean.')
 
-        r = requests.get(link)
-        if r.status_code == 404:
+        content = self._get_content(link)
+        if content is None:
             warnings.warn(f"404 error for {link}. Returning empty dicts/DataFrames.")
             if as_df:
                 shots_data, match_info, rosters_data = pd.DataFrame(), pd.DataFrame(), \
@@ -218,7 +249,7 @@ class Understat:
             else:
                 shots_data, match_info, rosters_data = dict(), dict(), dict()   # type: ignore
         else:
-            soup = BeautifulSoup(r.content, 'html.parser')
+            soup = make_soup(content)
 
             scripts = soup.find_all('script')
             shots_data_tag = [x for x in scripts if 'shotsData' in x.text][0]
@@ -287,7 +318,7 @@ class Understat:
         if not isinstance(as_df, bool):
             raise TypeError('`as_df` must be a boolean.')
 
-        scripts = BeautifulSoup(requests.get(team_link).content, 'html.parser').find_all('script')
+        scripts = make_soup(self._get_content(team_link)).find_all('script')
 
         dates_data_tag = [x for x in scripts if 'datesData' in x.text][0]
         stats_data_tag = [x for x in scripts if 'statisticsData' in x.text][0]
@@ -298,14 +329,7 @@ class Understat:
         player_data = _json_from_script(player_data_tag.text)
 
         if as_df:
-            matches_data = pd.DataFrame.from_dict(matches_data)  # type: ignore
-            newcols = list()
-            for c in matches_data.columns:  # type: ignore
-                if isinstance(matches_data.loc[0, c], dict):  # type: ignore
-                    newcols.append(matches_data[c].apply(pd.Series).add_prefix(f'{c}_'))
-                else:
-                    newcols.append(matches_data[c])  # type: ignore
-            matches_data = pd.concat(newcols, axis=1)
+            matches_data = flatten_dict_columns(pd.DataFrame.from_dict(matches_data))  # type: ignore
 
             for key, value in team_data.items():
                 table = list()
@@ -1,11 +1,27 @@
 __all__ = [
-    "get_proxy", "xpath_soup", "botasaurus_request_get_json", "botasaurus_browser_get_json",
-    "botasaurus_request_get_soup", "botasaurus_browser_get_soup", "load_comps", "get_module_comps",
+    "get_proxy", "xpath_soup", "xpath_soup_batch", "botasaurus_request_get_json",
+    "botasaurus_browser_get_json", "botasaurus_request_get_soup", "botasaurus_browser_get_soup",
+    "load_comps", "get_module_comps",
+    "BrowserPool", "ResponseCache", "Uncached", "response_content",
+    "RateLimiter", "TokenBucket", "rate_limit", "set_rate_limit",
+    "remove_rate_limit", "get_rate_limit",
+    "set_html_parser", "get_html_parser", "make_soup", "SeasonCatalog",
+    "CheckpointStore", "flatten_dict_columns", "import_pyarrow", "records_to_arrow",
+    "unify_arrow_schemas", "write_partition",
 ]
 
 from .get_proxy import get_proxy
-from .xpath_soup import xpath_soup
+from .xpath_soup import xpath_soup, xpath_soup_batch
 from .botasaurus_getters import botasaurus_request_get_json, botasaurus_browser_get_json,\
     botasaurus_request_get_soup, botasaurus_browser_get_soup
 from .load_comps import load_comps
 from .get_module_comps import get_module_comps
+from .browser_pool import BrowserPool
+from .response_cache import ResponseCache, Uncached, response_content
+from .rate_limiter import RateLimiter, TokenBucket, rate_limit, set_rate_limit,\
+    remove_rate_limit, get_rate_limit
+from .html_parser import set_html_parser, get_html_parser, make_soup
+from .season_catalog import SeasonCatalog
+from .checkpoint_store import CheckpointStore
+from .flatten_dict_columns import flatten_dict_columns
+from .arrow import import_pyarrow, records_to_arrow, unify_arrow_schemas, write_partition
@@ -0,0 +1,174 @@
+from pathlib import Path
+from typing import Any
+import json
+import os
+import pandas as pd
+from .flatten_dict_columns import flatten_dict_columns
+
+
+# ==================================================================================================
+def import_pyarrow() -> tuple[Any, Any]:
+    """ Import pyarrow and pyarrow.parquet, which are an optional dependency of ScraperFC.
+
+    :raises ImportError: If pyarrow is not installed, with the command to install it
+    :return: The pyarrow and pyarrow.parquet modules
+    :rtype: tuple[Any, Any]
+    """
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError as e:
+        raise ImportError(
+            "Arrow and Parquet support needs pyarrow. Install it with "
+            "`pip install ScraperFC[parquet]`."
+        ) from e
+    return pyarrow, pyarrow.parquet
+
+# ==================================================================================================
+def records_to_arrow(df: pd.DataFrame) -> Any:
+    """ Convert a DataFrame of JSON records (e.g. from an API) to an Arrow table.
+
+    Columns of dicts are flattened into "column.key" columns until none are left, and lists are
+    stored as JSON strings. Columns that still mix types (e.g. numbers and strings) are stored as
+    strings.
+
+    :param df: The DataFrame
+    :type df: pd.DataFrame
+    :raises TypeError: If ``df`` is not a DataFrame
+    :raises ImportError: If pyarrow is not installed
+    :return: The Arrow table
+    :rtype: pyarrow.Table
+    """
+    if not isinstance(df, pd.DataFrame):
+        raise TypeError("`df` must be a DataFrame.")
+    pa, _ = import_pyarrow()
+    while len(dict_cols := [
+        col for col in df.columns if df[col].map(lambda v: isinstance(v, dict)).any()
+    ]) > 0:
+        df = flatten_dict_columns(df, dict_cols, sep=".")
+
+    columns = dict()
+    for col in df.columns:
+        values = df[col]
+        if values.dtype == object:
+            values = values.map(lambda v: json.dumps(v) if isinstance(v, list) else v)
+        try:
+            columns[str(col)] = pa.array(values, from_pandas=True)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            columns[str(col)] = pa.array(
+                values.map(lambda v: None if pd.isna(v) else str(v)), type=pa.string()
+            )
+    return pa.table(columns)
+
+# ==================================================================================================
+def unify_arrow_schemas(schemas: list) -> Any:
+    """ Merge Arrow schemas into one that every table with one of the schemas can be cast to.
+
+    The fields are in the order they are first seen. A field whose types differ gets the widest of
+    them (e.g. double for int64 and double, or the other type for null), and fields with types that
+    can't be merged (e.g. int64 and string) are strings.
+
+    :param schemas: The schemas
+    :type schemas: list[pyarrow.Schema]
+    :raises ImportError: If pyarrow is not installed
+    :return: The merged schema
+    :rtype: pyarrow.Schema
+    """
+    pa, _ = import_pyarrow()
+    try:
+        return pa.unify_schemas(schemas, promote_options="permissive")
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        pass
+    fields: dict[str, Any] = dict()
+    for schema in schemas:
+        for field in schema:
+            if field.name not in fields:
+                fields[field.name] = field
+                continue
+            try:
+                fields[field.name] = pa.unify_schemas(
+                    [pa.schema([fields[field.name]]), pa.schema([field])],
+                    promote_options="permissive"
+                ).field(0)
+            except (pa.ArrowInvalid, pa.ArrowTypeError):
+                fields[field.name] = pa.field(field.name, pa.string())
+    return pa.schema(list(fields.values()))
+
+# ==================================================================================================
+def _cast_table(table: Any, schema: Any) -> Any:
+    """ Private, casts an Arrow table to a schema, with nulls for the columns it doesn't have. """
+    pa, _ = import_pyarrow()
+    return pa.table(
+        [
+            table[field.name].cast(field.type) if field.name in table.column_names
+            else pa.nulls(table.num_rows, field.type)
+            for field in schema
+        ],
+        schema=schema
+    )
+
+# ==================================================================================================
+def _write_parquet(table: Any, path: Path) -> None:
+    """ Private, writes a Parquet file next to ``path`` and moves it into place, so a crash never
+    leaves a partial file. Names starting with "." are ignored by readers.
+    """
+    _, pq = import_pyarrow()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_name(f".{path.name}.tmp")
+    pq.write_table(table, temp_path)
+    os.replace(temp_path, path)
+
+# ==================================================================================================
+def write_partition(
+        table: Any, directory: str | Path, partition: str, schema: Any | None = None
+) -> Any:
+    """ Write an Arrow table to ``<directory>/<partition>/part-0.parquet`` so that every partition
+    in ``directory`` has the same schema.
+
+    Readers such as ``pyarrow.parquet.read_table(directory)`` take the schema of one of the files
+    for the whole dataset, so partitions whose columns or types differ (e.g. a stat that is an int
+    in one match and a float in the next) can't be read together. The table is cast to the schema
+    of the dataset. If it has new columns, or types that have to be widened (see
+    :func:`unify_arrow_schemas`), the schema grows and the existing partitions are rewritten with
+    it.
+
+    Calls for the same ``directory`` must not run at the same time.
+
+    :param table: The table
+    :type table: pyarrow.Table
+    :param directory: Directory of the dataset
+    :type directory: str | Path
+    :param partition: Name of the partition, e.g. "match_id=123"
+    :type partition: str
+    :param schema: Schema of the dataset, as returned by the last call for ``directory``
+        (default: None, read it from the existing partitions)
+    :type schema: pyarrow.Schema | None
+    :raises TypeError: If ``directory`` or ``partition`` are the wrong type
+    :raises ImportError: If pyarrow is not installed
+    :return: Schema of the dataset after the write
+    :rtype: pyarrow.Schema
+    """
+    if not isinstance(directory, (str, Path)):
+        raise TypeError("`directory` must be a string or Path.")
+    if not isinstance(partition, str):
+        raise TypeError("`partition` must be a string.")
+    _, pq = import_pyarrow()
+    directory = Path(directory)
+    path = directory / partition / "part-0.parquet"
+    others = [p for p in directory.glob("*/part-0.parquet") if p != path]
+
+    if schema is None:
+        existing = {p: pq.read_schema(p) for p in others}
+        schema = unify_arrow_schemas(list(existing.values()) + [table.schema])
+        stale = [p for p, p_schema in existing.items() if not p_schema.equals(schema)]
+    else:
+        new_schema = unify_arrow_schemas([schema, table.schema])
+        stale = list() if new_schema.equals(schema) else others
+        schema = new_schema
+
+    # Bring the existing partitions up to date if the schema has grown
+    for p in stale:
+        _write_parquet(_cast_table(pq.read_table(p), schema), p)
+
+    _write_parquet(_cast_table(table, schema), path)
+    return schema
@@ -3,44 +3,130 @@ from botasaurus.browser import browser
 import json
 from bs4 import BeautifulSoup
 import time
+from typing import Callable
+from .browser_pool import BrowserPool
+from .response_cache import ResponseCache, Uncached, response_content
+from .rate_limiter import rate_limit
+from .html_parser import make_soup
 
 
 # ==================================================================================================
-def botasaurus_request_get_json(url: str, delay: int = 0) -> dict:
-    """Use Botasaurus REQUESTS module to get JSON from page.
-
-    :param url: The URL to request
-    :type url: str
-    :param delay: Seconds to wait after the request (default: 0)
-    :type delay: int
-    :raises TypeError: If any of the parameters are the wrong type
-    :raises ValueError: If ``delay`` is negative
-    :return: JSON data
-    :rtype: dict
-    """
+def _check_common_args(
+        url: str, delay: int, pool: BrowserPool | None, cache: ResponseCache | None
+) -> None:
+    """ Private, type checks the arguments shared by all of the getters. """
     if not isinstance(url, str):
         raise TypeError("`url` must be a string.")
     if not isinstance(delay, int):
         raise TypeError("`delay` must be an int.")
     if delay < 0:
         raise ValueError("`delay` must be non-negative.")
+    if pool is not None and not isinstance(pool, BrowserPool):
+        raise TypeError("`pool` must be a BrowserPool or None.")
+    if cache is not None and not isinstance(cache, ResponseCache):
+        raise TypeError("`cache` must be a ResponseCache or None.")
+
+# ==================================================================================================
+def _check_browser_args(
+        headless: bool, block_images_and_css: bool, wait_for_complete_page_load: bool
+) -> None:
+    """ Private, type checks the browser settings. """
+    if not isinstance(headless, bool):
+        raise TypeError("`headless` must be a bool.")
+    if not isinstance(block_images_and_css, bool):
+        raise TypeError("`block_images_and_css` must be a bool.")
+    if not isinstance(wait_for_complete_page_load, bool):
+        raise TypeError("`wait_for_complete_page_load` must be a bool.")
+
+# ==================================================================================================
+def _request_get_content(url: str, delay: int) -> bytes:
+    """ Private, gets the response body of a URL with the Botasaurus REQUESTS module. """
+    rate_limit(url)
 
     @request(output=None, create_error_logs=False)
-    def _get_json(request, url):  # type: ignore
+    def _get_content(request, url):  # type: ignore
         response = request.get(url)
         if delay > 0:
             time.sleep(delay)
-        return response.json()
+        return response_content(response)
+
+    return _get_content(url)
+
+# ==================================================================================================
+def _browser_get_page(
+        url: str, attr: str, headless: bool, block_images_and_css: bool,
+        wait_for_complete_page_load: bool, delay: int, pool: BrowserPool | None
+) -> str:
+    """ Private, loads a URL with the Botasaurus BROWSER module and returns the page's ``attr``
+    ("page_text" or "page_html").
+    """
+    rate_limit(url)
+    if pool is not None:
+        return pool.get_text(url, delay) if attr == "page_text" else pool.get_html(url, delay)
+
+    @browser(
+        headless=headless, block_images_and_css=block_images_and_css,
+        wait_for_complete_page_load=wait_for_complete_page_load,
+        output=None, create_error_logs=False
+    )
+    def _get_page(driver, url):  # type: ignore
+        driver.get(url)
+        if delay > 0:
+            time.sleep(delay)
+        return getattr(driver, attr)
 
-    return _get_json(url)
+    return _get_page(url)
+
+# ==================================================================================================
+def _load_json(
+        url: str, cache: ResponseCache | None, fetch: Callable[[], bytes | str]
+) -> dict:
+    """ Private, gets JSON through the cache. Error payloads and non-2xx responses are never
+    cached.
+    """
+    if cache is not None:
+        content = cache.get(url)
+        if content is not None:
+            return json.loads(content)
+    content = fetch()
+    data = json.loads(content)
+    if cache is not None and not isinstance(content, Uncached) \
+            and not (isinstance(data, dict) and "error" in data):
+        cache.set(url, content)
+    return data
+
+# ==================================================================================================
+def botasaurus_request_get_json(
+        url: str, delay: int = 0, cache: ResponseCache | None = None
+) -> dict:
+    """Use Botasaurus REQUESTS module to get JSON from page.
+
+    :param url: The URL to request
+    :type url: str
+    :param delay: Seconds to wait after the request (default: 0)
+    :type delay: int
+    :param cache: Response cache to read through (default: None, no caching)
+    :type cache: ResponseCache | None
+    :raises TypeError: If any of the parameters are the wrong type
+    :raises ValueError: If ``delay`` is negative
+    :return: JSON data
+    :rtype: dict
+    """
+    _check_common_args(url, delay, None, cache)
+    return _load_json(url, cache, lambda: _request_get_content(url, delay))
 
 # ==================================================================================================
 def botasaurus_browser_get_json(
         url: str, headless: bool = True, block_images_and_css: bool = True,
-        wait_for_complete_page_load: bool = True, delay: int = 0
+        wait_for_complete_page_load: bool = True, delay: int = 0, pool: BrowserPool | None = None,
+        cache: ResponseCache | None = None
 ) -> dict:
     """Use Botasaurus BROWSER module to get JSON from page
 
+    If ``pool`` is given, the page is loaded in one of the pool's warm browser sessions and the
+    browser settings of the pool are used instead of ``headless``, ``block_images_and_css`` and
+    ``wait_for_complete_page_load``.
+
     :param url: The URL to scrape
     :type url: str
     :param headless: Whether to run the browser in headless mode
@@ -51,74 +137,61 @@ def botasaurus_browser_get_json(
     :type wait_for_complete_page_load: bool
     :param delay: Seconds to wait after the request (default: 0)
     :type delay: int
+    :param pool: Browser pool to borrow a session from (default: None, start a new browser)
+    :type pool: BrowserPool | None
+    :param cache: Response cache to read through (default: None, no caching)
+    :type cache: ResponseCache | None
     :raises TypeError: If any of the parameters are the wrong type
     :raises ValueError: If ``delay`` is negative
     :return: JSON data
     :rtype: dict
     """
-    if not isinstance(url, str):
-        raise TypeError("`url` must be a string.")
-    if not isinstance(headless, bool):
-        raise TypeError("`headless` must be a bool.")
-    if not isinstance(block_images_and_css, bool):
-        raise TypeError("`block_images_and_css` must be a bool.")
-    if not isinstance(wait_for_complete_page_load, bool):
-        raise TypeError("`wait_for_complete_page_load` must be a bool.")
-    if not isinstance(delay, int):
-        raise TypeError("`delay` must be an int.")
-    if delay < 0:
-        raise ValueError("`delay` must be non-negative.")
-
-    @browser(
-        headless=headless, block_images_and_css=block_images_and_css,
-        wait_for_complete_page_load=wait_for_complete_page_load,
-        output=None, create_error_logs=False
+    _check_common_args(url, delay, pool, cache)
+    _check_browser_args(headless, block_images_and_css, wait_for_complete_page_load)
+    return _load_json(
+        url, cache,
+        lambda: _browser_get_page(
+            url, "page_text", headless, block_images_and_css, wait_for_complete_page_load, delay,
+            pool
+        )
     )
-    def _get_json(driver, url):  # type: ignore
-        driver.get(url)
-        if delay > 0:
-            time.sleep(delay)
-        return json.loads(driver.page_text)
-
-    return _get_json(url)
 
 # ==================================================================================================
-def botasaurus_request_get_soup(url: str, delay: int = 0) -> BeautifulSoup:
+def botasaurus_request_get_soup(
+        url: str, delay: int = 0, cache: ResponseCache | None = None
+) -> BeautifulSoup:
     """Use Botasaurus REQUESTS module to get Soup from page.
 
     :param url: The URL to request
     :type url: str
     :param delay: Seconds to wait after the request (default: 0)
     :type delay: int
+    :param cache: Response cache to read through (default: None, no caching)
+    :type cache: ResponseCache | None
     :raises TypeError: If any of the parameters are the wrong type
     :raises ValueError: If ``delay`` is negative
     :return: BeautifulSoup object
     :rtype: BeautifulSoup
     """
-    if not isinstance(url, str):
-        raise TypeError("`url` must be a string.")
-    if not isinstance(delay, int):
-        raise TypeError("`delay` must be an int.")
-    if delay < 0:
-        raise ValueError("`delay` must be non-negative.")
-
-    @request(output=None, create_error_logs=False)
-    def _get_soup(request, url):  # type: ignore
-        response = request.get(url)
-        if delay > 0:
-            time.sleep(delay)
-        soup = BeautifulSoup(response.content, "html.parser")
-        return soup
-
-    return _get_soup(url)
+    _check_common_args(url, delay, None, cache)
+    if cache is None:
+        content = _request_get_content(url, delay)
+    else:
+        content = cache.get_or_fetch(url, lambda: _request_get_content(url, delay))  # type: ignore
+    return make_soup(content)
 
 # ==================================================================================================
 def botasaurus_browser_get_soup(
         url: str, headless: bool = False, block_images_and_css: bool = False,
-        wait_for_complete_page_load: bool = True, delay: int = 0
+        wait_for_complete_page_load: bool = True, delay: int = 0, pool: BrowserPool | None = None,
+        cache: ResponseCache | None = None
 ) -> BeautifulSoup:
     """ Use Botasaurus BROWSER module to get Soup from page.
 
+    If ``pool`` is given, the page is loaded in one of the pool's warm browser sessions and the
+    browser settings of the pool are used instead of ``headless``, ``block_images_and_css`` and
+    ``wait_for_complete_page_load``.
+
     :param url: The URL to scrape
     :type url: str
     :param headless: Whether to run the browser in headless mode
@@ -129,33 +202,23 @@ def botasaurus_browser_get_soup(
     :type wait_for_complete_page_load: bool
     :param delay: Seconds to wait after the request (default: 0)
     :type delay: int
+    :param pool: Browser pool to borrow a session from (default: None, start a new browser)
+    :type pool: BrowserPool | None
+    :param cache: Response cache to read through (default: None, no caching)
+    :type cache: ResponseCache | None
     :raises TypeError: If any of the parameters are the wrong type
     :raises ValueError: If ``delay`` is negative
     :return: BeautifulSoup object
     :rtype: BeautifulSoup
     """
-    if not isinstance(url, str):
-        raise TypeError("`url` must be a string.")
-    if not isinstance(headless, bool):
-        raise TypeError("`headless` must be a bool.")
-    if not isinstance(block_images_and_css, bool):
-        raise TypeError("`block_images_and_css` must be a bool.")
-    if not isinstance(wait_for_complete_page_load, bool):
-        raise TypeError("`wait_for_complete_page_load` must be a bool.")
-    if not isinstance(delay, int):
-        raise TypeError("`delay` must be an int.")
-    if delay < 0:
-        raise ValueError("`delay` must be non-negative.")
+    _check_common_args(url, delay, pool, cache)
+    _check_browser_args(headless, block_images_and_css, wait_for_complete_page_load)
 
-    @browser(
-        headless=headless, block_images_and_css=block_images_and_css,
-        wait_for_complete_page_load=wait_for_complete_page_load,
-        output=None, create_error_logs=False
-    )
-    def _get_soup(driver, url):  # type: ignore
-        driver.get(url)
-        if delay > 0:
-            time.sleep(delay)
-        return BeautifulSoup(driver.page_html, "html.parser")
+    def _fetch() -> str:
+        return _browser_get_page(
+            url, "page_html", headless, block_images_and_css, wait_for_complete_page_load, delay,
+            pool
+        )
 
-    return _get_soup(url)
+    html = _fetch() if cache is None else cache.get_or_fetch(url, _fetch)
+    return make_soup(html)
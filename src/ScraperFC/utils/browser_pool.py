@@ -0,0 +1,248 @@
+from botasaurus.browser import Driver
+from bs4 import BeautifulSoup
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, TypeVar
+import json
+import threading
+import time
+from .html_parser import make_soup
+
+T = TypeVar("T")
+
+
+class BrowserPool:
+    """ Pool of long-lived Botasaurus browser sessions.
+
+    Starting Chrome is by far the slowest part of a single browser request, so instead of
+    launching a new browser for every URL the scrapers borrow a warm session from this pool and
+    hand it back when they are done. Sessions are started lazily, up to ``size`` of them, and any
+    session whose browser has died is replaced with a new one the next time it is needed.
+
+    Example
+    -------
+    >>> with BrowserPool(size=2) as pool:
+    ...     data = pool.get_json("https://api.sofascore.com/api/v1/event/11605966")
+
+    :param size: Maximum number of browser sessions to keep open (default: 1)
+    :type size: int
+    :param headless: Whether to run the browsers in headless mode
+    :type headless: bool
+    :param block_images_and_css: Whether to block images and CSS
+    :type block_images_and_css: bool
+    :param wait_for_complete_page_load: Whether to wait for pages to load completely
+    :type wait_for_complete_page_load: bool
+    :raises TypeError: If any of the parameters are the wrong type
+    :raises ValueError: If ``size`` is less than 1
+    """
+
+    # ==============================================================================================
+    def __init__(
+            self, size: int = 1, headless: bool = True, block_images_and_css: bool = True,
+            wait_for_complete_page_load: bool = True
+    ) -> None:
+        if not isinstance(size, int):
+            raise TypeError("`size` must be an int.")
+        if size < 1:
+            raise ValueError("`size` must be at least 1.")
+        if not isinstance(headless, bool):
+            raise TypeError("`headless` must be a bool.")
+        if not isinstance(block_images_and_css, bool):
+            raise TypeError("`block_images_and_css` must be a bool.")
+        if not isinstance(wait_for_complete_page_load, bool):
+            raise TypeError("`wait_for_complete_page_load` must be a bool.")
+
+        self.size = size
+        self.headless = headless
+        self.block_images_and_css = block_images_and_css
+        self.wait_for_complete_page_load = wait_for_complete_page_load
+
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(size)
+        self._idle: list[Driver] = list()
+        self._sessions: list[Driver] = list()
+        self._closed = False
+
+    # ==============================================================================================
+    def __enter__(self) -> "BrowserPool":
+        return self
+
+    # ==============================================================================================
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    # ==============================================================================================
+    def _start_session(self) -> Driver:
+        """ Private, launches a new browser session with the pool's settings. """
+        driver = Driver(
+            headless=self.headless, block_images_and_css=self.block_images_and_css,
+            wait_for_complete_page_load=self.wait_for_complete_page_load,
+        )
+        with self._lock:
+            self._sessions.append(driver)
+        return driver
+
+    # ==============================================================================================
+    def _discard_session(self, driver: Driver) -> None:
+        """ Private, closes a session and forgets about it. """
+        with self._lock:
+            if driver in self._sessions:
+                self._sessions.remove(driver)
+        try:
+            driver.close()
+        except Exception:
+            pass  # the browser is already gone
+
+    # ==============================================================================================
+    @staticmethod
+    def _is_alive(driver: Driver) -> bool:
+        """ Private, checks that the browser process behind a session is still running.
+
+        Reads ``_browser.stopped`` when the Botasaurus release has it. Since that is Botasaurus
+        internals, other releases fall back to asking the browser for its current URL, which
+        fails once the browser is gone.
+        """
+        stopped = getattr(getattr(driver, "_browser", None), "stopped", None)
+        if isinstance(stopped, bool):
+            return not stopped
+        try:
+            driver.current_url
+            return True
+        except Exception:
+            return False
+
+    # ==============================================================================================
+    @contextmanager
+    def session(self) -> Iterator[Driver]:
+        """ Borrow a browser session from the pool.
+
+        Blocks until a session is free. The session is handed back to the pool when the ``with``
+        block exits. Sessions that died while borrowed are closed and replaced on the next borrow.
+
+        :raises RuntimeError: If the pool has been closed
+        :return: A Botasaurus driver
+        :rtype: Iterator[Driver]
+        """
+        if self._closed:
+            raise RuntimeError("BrowserPool has been closed.")
+
+        self._slots.acquire()
+        driver = None
+        try:
+            with self._lock:
+                # The pool may have been closed while waiting for a free session
+                if self._closed:
+                    raise RuntimeError("BrowserPool has been closed.")
+                driver = self._idle.pop() if len(self._idle) > 0 else None
+            if driver is not None and not self._is_alive(driver):
+                self._discard_session(driver)
+                driver = None
+            if driver is None:
+                driver = self._start_session()
+
+            yield driver
+        finally:
+            if driver is not None:
+                if self._closed or not self._is_alive(driver):
+                    self._discard_session(driver)
+                else:
+                    with self._lock:
+                        self._idle.append(driver)
+            self._slots.release()
+
+    # ==============================================================================================
+    def run(self, func: Callable[[Driver], T]) -> T:
+        """ Run ``func`` with a borrowed session, reconnecting once if the session dies.
+
+        :param func: Function that takes a driver and returns a result
+        :type func: Callable[[Driver], T]
+        :return: Result of ``func``
+        :rtype: T
+        """
+        with self.session() as driver:
+            try:
+                return func(driver)
+            except Exception:
+                if self._is_alive(driver):
+                    raise
+                # The browser crashed mid-request, fall through and retry on a new session
+        with self.session() as driver:
+            return func(driver)
+
+    # ==============================================================================================
+    def get_text(self, url: str, delay: int = 0) -> str:
+        """ Load a URL in a pooled browser and return the page text.
+
+        :param url: The URL to scrape
+        :type url: str
+        :param delay: Seconds to wait after the request (default: 0)
+        :type delay: int
+        :return: Text of the page body
+        :rtype: str
+        """
+        def _get_text(driver: Driver) -> str:
+            driver.get(url)
+            if delay > 0:
+                time.sleep(delay)
+            return driver.page_text
+
+        return self.run(_get_text)
+
+    # ==============================================================================================
+    def get_html(self, url: str, delay: int = 0) -> str:
+        """ Load a URL in a pooled browser and return the page HTML.
+
+        :param url: The URL to scrape
+        :type url: str
+        :param delay: Seconds to wait after the request (default: 0)
+        :type delay: int
+        :return: HTML of the page
+        :rtype: str
+        """
+        def _get_html(driver: Driver) -> str:
+            driver.get(url)
+            if delay > 0:
+                time.sleep(delay)
+            return driver.page_html
+
+        return self.run(_get_html)
+
+    # ==============================================================================================
+    def get_json(self, url: str, delay: int = 0) -> dict:
+        """ Load a URL in a pooled browser and parse the page text as JSON.
+
+        :param url: The URL to scrape
+        :type url: str
+        :param delay: Seconds to wait after the request (default: 0)
+        :type delay: int
+        :return: JSON data
+        :rtype: dict
+        """
+        return json.loads(self.get_text(url, delay))
+
+    # ==============================================================================================
+    def get_soup(self, url: str, delay: int = 0) -> BeautifulSoup:
+        """ Load a URL in a pooled browser and parse the page HTML.
+
+        :param url: The URL to scrape
+        :type url: str
+        :param delay: Seconds to wait after the request (default: 0)
+        :type delay: int
+        :return: BeautifulSoup object
+        :rtype: BeautifulSoup
+        """
+        return make_soup(self.get_html(url, delay))
+
+    # ==============================================================================================
+    def close(self) -> None:
+        """ Close the browser sessions in the pool. The pool can't be used afterwards.
+
+        Idle sessions are closed right away. Sessions that are borrowed at the time (e.g. by a
+        ``run()`` in another thread) are left alone until they are handed back, and are closed
+        then.
+        """
+        with self._lock:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+        for driver in idle:
+            self._discard_session(driver)
@@ -0,0 +1,137 @@
+from pathlib import Path
+from typing import Any
+import pickle
+import sqlite3
+import threading
+import time
+
+
+class CheckpointStore:
+    """ SQLite file of finished results, so long scrapes can pick up where they left off.
+
+    Results are pickled and stored under a namespace (e.g. one league season) and a key (e.g. a
+    match URL). Scrapers that take a ``checkpoint`` argument save each result as soon as it is
+    done and skip every key that is already in the store when they are run again.
+
+    Stored results are unpickled when they are loaded, so only open stores that you created.
+
+    Example
+    -------
+    >>> store = CheckpointStore("epl_2023.sqlite")
+    >>> matches = FBref().scrape_matches("2023-2024", "England Premier League", checkpoint=store)
+
+    :param path: Path of the SQLite file. Created if it doesn't exist.
+    :type path: str | Path
+    :raises TypeError: If ``path`` is not a string or Path
+    """
+
+    # ==============================================================================================
+    def __init__(self, path: str | Path) -> None:
+        if not isinstance(path, (str, Path)):
+            raise TypeError("`path` must be a string or Path.")
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        with self._db:
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS checkpoints ("
+                "namespace TEXT, key TEXT, value BLOB, created REAL, PRIMARY KEY (namespace, key))"
+            )
+
+    # ==============================================================================================
+    def __enter__(self) -> "CheckpointStore":
+        return self
+
+    # ==============================================================================================
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    # ==============================================================================================
+    def save(self, namespace: str, key: str, value: Any) -> None:
+        """ Store a finished result, replacing any result already stored under the same key.
+
+        :param namespace: Namespace of the result, e.g.
+            ``"fbref/matches/England Premier League/2023-2024"``
+        :type namespace: str
+        :param key: Key of the result within the namespace, e.g. the match URL
+        :type key: str
+        :param value: The result. Must be picklable.
+        :type value: Any
+        """
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO checkpoints (namespace, key, value, created) "
+                "VALUES (?, ?, ?, ?)",
+                (namespace, key, blob, time.time())
+            )
+
+    # ==============================================================================================
+    def load(self, namespace: str, key: str) -> Any:
+        """ Load a stored result.
+
+        :param namespace: Namespace of the result
+        :type namespace: str
+        :param key: Key of the result within the namespace
+        :type key: str
+        :raises KeyError: If nothing is stored under the key
+        :return: The result
+        :rtype: Any
+        """
+        with self._lock:
+            row = self._db.execute(
+                "SELECT value FROM checkpoints WHERE namespace = ? AND key = ?", (namespace, key)
+            ).fetchone()
+        if row is None:
+            raise KeyError(f"No checkpoint for {key} in {namespace}.")
+        return pickle.loads(row[0])
+
+    # ==============================================================================================
+    def keys(self, namespace: str) -> list[str]:
+        """ Keys of the results stored in a namespace, in the order they were saved.
+
+        :param namespace: Namespace to list
+        :type namespace: str
+        :rtype: list[str]
+        """
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT key FROM checkpoints WHERE namespace = ? ORDER BY created", (namespace,)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    # ==============================================================================================
+    def items(self, namespace: str) -> dict[str, Any]:
+        """ Load every result stored in a namespace.
+
+        :param namespace: Namespace to load
+        :type namespace: str
+        :return: {key: result, ...}
+        :rtype: dict[str, Any]
+        """
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT key, value FROM checkpoints WHERE namespace = ? ORDER BY created",
+                (namespace,)
+            ).fetchall()
+        return {key: pickle.loads(value) for key, value in rows}
+
+    # ==============================================================================================
+    def clear(self, namespace: str | None = None) -> None:
+        """ Delete the results of a namespace, or every result if ``namespace`` is None.
+
+        :param namespace: Namespace to delete (default: None, everything)
+        :type namespace: str | None
+        """
+        with self._lock, self._db:
+            if namespace is None:
+                self._db.execute("DELETE FROM checkpoints")
+            else:
+                self._db.execute("DELETE FROM checkpoints WHERE namespace = ?", (namespace,))
+
+    # ==============================================================================================
+    def close(self) -> None:
+        """ Close the SQLite connection. """
+        with self._lock:
+            self._db.close()
@@ -0,0 +1,47 @@
+import pandas as pd
+
+
+def flatten_dict_columns(
+        df: pd.DataFrame, columns: list | None = None, sep: str | None = "_"
+) -> pd.DataFrame:
+    """ Expand columns of dicts into one column per key.
+
+    Gives the same columns and dtypes as ``df[column].apply(pd.Series)``, but builds each expanded
+    column in one pass over the values instead of making a Series for every row, which is orders
+    of magnitude faster on large tables. Rows that aren't dicts (e.g. NaN) become missing values.
+    Only one level is expanded, dicts nested inside the values stay as they are.
+
+    Example
+    -------
+    >>> df = pd.DataFrame({"player": [{"id": 1, "name": "A"}], "rating": [7.1]})
+    >>> flatten_dict_columns(df, sep=".")
+       player.id player.name  rating
+    0          1           A     7.1
+
+    :param df: The DataFrame
+    :type df: pd.DataFrame
+    :param columns: Columns to expand (default: None, every column whose first value is a dict)
+    :type columns: list | None
+    :param sep: Expanded columns are named ``f"{column}{sep}{key}"``, or just ``key`` if ``sep``
+        is None (default: "_")
+    :type sep: str | None
+    :raises TypeError: If ``df`` is not a DataFrame
+    :return: A new DataFrame with each expanded column replaced by its keys' columns, in place
+    :rtype: pd.DataFrame
+    """
+    if not isinstance(df, pd.DataFrame):
+        raise TypeError("`df` must be a DataFrame.")
+    if columns is None:
+        columns = [c for c in df.columns if len(df) > 0 and isinstance(df[c].iloc[0], dict)]
+    if len(columns) == 0:
+        return df.copy()
+
+    pieces = list()
+    for c in df.columns:
+        if c not in columns:
+            pieces.append(df[c])
+            continue
+        records = [value if isinstance(value, dict) else dict() for value in df[c].tolist()]
+        expanded = pd.DataFrame(records, index=df.index)
+        pieces.append(expanded if sep is None else expanded.add_prefix(f"{c}{sep}"))
+    return pd.concat(pieces, axis=1)
@@ -1,5 +1,5 @@
 import requests
-from bs4 import BeautifulSoup
+from .html_parser import make_soup
 import random
 import pandas as pd
 from io import StringIO
@@ -16,7 +16,7 @@ def get_proxy() -> str:
     :rtype: str
     """
     r = requests.get("https://sslproxies.org/")
-    soup = BeautifulSoup(r.content, "html.parser")
+    soup = make_soup(r.content)
     df = pd.read_html(StringIO(str(soup.find("table"))))[0]
     df = df.loc[~df["Port"].isna(),:]
     rand_row_idx = random.randint(0, df.shape[0]-1)
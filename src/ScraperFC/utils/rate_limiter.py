@@ -0,0 +1,192 @@
+from urllib.parse import urlsplit
+import threading
+import time
+
+
+class TokenBucket:
+    """ Thread-safe token bucket that allows ``calls`` requests every ``period`` seconds.
+
+    Up to ``burst`` requests can go through back to back before callers start waiting. Callers
+    reserve their token under a lock and then sleep outside of it, so concurrent threads are
+    served in the order they arrived and the combined rate never goes over the limit.
+
+    :param calls: Number of requests allowed per ``period``
+    :type calls: float
+    :param period: Length of the period in seconds
+    :type period: float
+    :param burst: Number of requests that may be made back to back (default: 1)
+    :type burst: int
+    :raises TypeError: If any of the parameters are the wrong type
+    :raises ValueError: If any of the parameters are not positive
+    """
+
+    # ==============================================================================================
+    def __init__(self, calls: float, period: float, burst: int = 1) -> None:
+        if not isinstance(calls, (int, float)) or not isinstance(period, (int, float)):
+            raise TypeError("`calls` and `period` must be numbers.")
+        if not isinstance(burst, int):
+            raise TypeError("`burst` must be an int.")
+        if calls <= 0 or period <= 0 or burst < 1:
+            raise ValueError("`calls`, `period` and `burst` must be positive.")
+
+        self.rate = calls / period
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    # ==============================================================================================
+    def acquire(self) -> float:
+        """ Block until a request is allowed.
+
+        :return: Seconds spent waiting
+        :rtype: float
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+class RateLimiter:
+    """ Token buckets keyed by domain.
+
+    A bucket set for a domain also covers its subdomains, so a limit on ``"sofascore.com"``
+    applies to ``api.sofascore.com`` and ``www.sofascore.com`` together. Hosts without a limit
+    aren't throttled.
+    """
+
+    # ==============================================================================================
+    def __init__(self) -> None:
+        self._buckets: dict[str, TokenBucket] = dict()
+        self._lock = threading.Lock()
+
+    # ==============================================================================================
+    def set_rate(self, domain: str, calls: float, period: float, burst: int = 1) -> None:
+        """ Limit requests to ``domain`` (and its subdomains) to ``calls`` every ``period`` seconds.
+
+        If the domain already has a bucket with the same rate and burst, it is kept as it is, so
+        setting the same limit again doesn't hand out a fresh set of tokens.
+
+        :param domain: Domain to limit, e.g. ``"fbref.com"``
+        :type domain: str
+        :param calls: Number of requests allowed per ``period``
+        :type calls: float
+        :param period: Length of the period in seconds
+        :type period: float
+        :param burst: Number of requests that may be made back to back (default: 1)
+        :type burst: int
+        :raises TypeError: If ``domain`` is not a string
+        """
+        if not isinstance(domain, str):
+            raise TypeError("`domain` must be a string.")
+        bucket = TokenBucket(calls, period, burst)
+        domain = domain.lower().removeprefix("www.")
+        with self._lock:
+            current = self._buckets.get(domain)
+            if current is None or current.rate != bucket.rate or current.burst != bucket.burst:
+                self._buckets[domain] = bucket
+
+    # ==============================================================================================
+    def remove_rate(self, domain: str) -> None:
+        """ Stop limiting requests to ``domain``.
+
+        :param domain: Domain to stop limiting
+        :type domain: str
+        """
+        with self._lock:
+            self._buckets.pop(domain.lower().removeprefix("www."), None)
+
+    # ==============================================================================================
+    def bucket(self, url: str) -> TokenBucket | None:
+        """ The bucket that requests to ``url`` are counted against, if there is one.
+
+        :param url: URL that will be requested
+        :type url: str
+        :rtype: TokenBucket | None
+        """
+        labels = (urlsplit(url).hostname or "").lower().split(".")
+        with self._lock:
+            for i in range(len(labels) - 1):
+                bucket = self._buckets.get(".".join(labels[i:]))
+                if bucket is not None:
+                    return bucket
+        return None
+
+    # ==============================================================================================
+    def wait(self, url: str) -> float:
+        """ Block until a request to ``url`` is allowed.
+
+        :param url: URL that will be requested
+        :type url: str
+        :return: Seconds spent waiting
+        :rtype: float
+        """
+        bucket = self.bucket(url)
+        return 0.0 if bucket is None else bucket.acquire()
+
+
+_rate_limiter = RateLimiter()
+# https://www.sports-reference.com/bot-traffic.html, no more than 10 requests per minute
+_rate_limiter.set_rate("fbref.com", calls=10, period=60)
+# Sofascore doesn't publish a limit, keep concurrent scrapers to a conservative 2 requests a second
+_rate_limiter.set_rate("sofascore.com", calls=2, period=1, burst=2)
+
+
+# ==================================================================================================
+def rate_limit(url: str) -> float:
+    """ Block until the process-wide rate limit for the host of ``url`` allows a request.
+
+    Every ScraperFC fetch goes through this, so the limits hold across scraper objects and threads.
+
+    :param url: URL that will be requested
+    :type url: str
+    :return: Seconds spent waiting
+    :rtype: float
+    """
+    return _rate_limiter.wait(url)
+
+# ==================================================================================================
+def set_rate_limit(domain: str, calls: float, period: float, burst: int = 1) -> None:
+    """ Set the process-wide rate limit for a domain and its subdomains.
+
+    Example
+    -------
+    >>> set_rate_limit("sofascore.com", calls=5, period=1, burst=5)
+
+    :param domain: Domain to limit, e.g. ``"sofascore.com"``
+    :type domain: str
+    :param calls: Number of requests allowed per ``period``
+    :type calls: float
+    :param period: Length of the period in seconds
+    :type period: float
+    :param burst: Number of requests that may be made back to back (default: 1)
+    :type burst: int
+    """
+    _rate_limiter.set_rate(domain, calls, period, burst)
+
+# ==================================================================================================
+def get_rate_limit(url: str) -> TokenBucket | None:
+    """ The process-wide bucket that requests to ``url`` are counted against, if there is one.
+
+    :param url: URL that will be requested
+    :type url: str
+    :return: The bucket, whose ``rate`` is in requests per second, or None if the host isn't
+        limited
+    :rtype: TokenBucket | None
+    """
+    return _rate_limiter.bucket(url)
+
+# ==================================================================================================
+def remove_rate_limit(domain: str) -> None:
+    """ Remove the process-wide rate limit for a domain, so its requests aren't throttled.
+
+    :param domain: Domain to stop limiting, e.g. ``"fbref.com"``
+    :type domain: str
+    """
+    _rate_limiter.remove_rate(domain)
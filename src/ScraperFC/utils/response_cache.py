@@ -0,0 +1,320 @@
+from pathlib import Path
+from typing import Any, Callable
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+import hashlib
+import re
+import sqlite3
+import threading
+import time
+
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "ScraperFC"
+
+
+# ==================================================================================================
+def normalize_url(url: str) -> str:
+    """ Normalize a URL so that equivalent URLs share a cache entry.
+
+    Lowercases the scheme and host, drops default ports and the fragment, and sorts the query
+    parameters.
+
+    :param url: URL to normalize
+    :type url: str
+    :raises TypeError: If ``url`` is not a string
+    :return: Normalized URL
+    :rtype: str
+    """
+    if not isinstance(url, str):
+        raise TypeError("`url` must be a string.")
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if parts.port is not None and (scheme, parts.port) not in [("http", 80), ("https", 443)]:
+        host = f"{host}:{parts.port}"
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)), safe="~,")
+    return urlunsplit((scheme, host, parts.path or "/", query, ""))
+
+
+# ==================================================================================================
+def url_source(url: str) -> str:
+    """ Name of the site a URL belongs to, used to look up TTL policies.
+
+    This is the registered domain name without subdomains or the TLD, e.g. ``"sofascore"`` for
+    ``https://api.sofascore.com/...`` and ``"transfermarkt"`` for ``https://www.transfermarkt.us``.
+
+    :param url: URL to get the source of
+    :type url: str
+    :return: Source name
+    :rtype: str
+    """
+    labels = (urlsplit(url).hostname or "").lower().split(".")
+    return labels[-2] if len(labels) >= 2 else labels[0]
+
+
+class Uncached(bytes):
+    """ A response body that should be passed on but not cached, e.g. a 403 or 5xx error page or a
+    Cloudflare challenge. ``ResponseCache.get_or_fetch()`` returns it without storing it.
+    """
+
+
+# ==================================================================================================
+def response_content(response: Any) -> bytes:
+    """ Body of an HTTP response, marked as ``Uncached`` unless the status code is 2xx.
+
+    :param response: Response with ``status_code`` and ``content``, e.g. from requests
+    :type response: Any
+    :return: The response body
+    :rtype: bytes
+    """
+    content = response.content
+    return content if 200 <= response.status_code < 300 else Uncached(content)
+
+
+class ResponseCache:
+    """ Read-through on-disk cache of HTTP response bodies.
+
+    Entries are keyed on the SHA-256 of the normalized URL and stored as files under
+    ``directory``, with a small SQLite index that tracks their size and age. Once the total size
+    of the cache goes over ``max_size`` bytes, the least recently used entries are evicted.
+
+    How long an entry stays fresh is decided when it is read, so TTL policies can be changed
+    without clearing the cache. ``ttl_policies`` maps a source name (see :func:`url_source`) to
+    either a TTL that applies to the whole source or to a dict of ``{regex: ttl}`` rules that are
+    searched against the normalized URL in order. The first matching rule wins and URLs that
+    don't match any rule fall back to ``default_ttl``. A TTL of ``None`` means the entry never
+    expires and a TTL of ``0`` means responses are never cached.
+
+    Example
+    -------
+    >>> cache = ResponseCache(
+    ...     ttl_policies={
+    ...         "sofascore": {r"/event/\\d+$": None, r"/seasons/": 24 * 60 * 60},
+    ...         "clubelo": 60 * 60,
+    ...     }
+    ... )
+    >>> ss = Sofascore(cache=cache)
+
+    :param directory: Directory to store the cache in (default: ``~/.cache/ScraperFC``)
+    :type directory: str | Path | None
+    :param max_size: Maximum total size of the cached bodies in bytes (default: 1 GiB)
+    :type max_size: int
+    :param default_ttl: Seconds that entries stay fresh when no policy matches (default: 1 day)
+    :type default_ttl: float | None
+    :param ttl_policies: TTL policies by source, see above (default: None)
+    :type ttl_policies: dict | None
+    :raises TypeError: If any of the parameters are the wrong type
+    :raises ValueError: If ``max_size`` or any TTL is negative
+    """
+
+    # ==============================================================================================
+    def __init__(
+            self, directory: str | Path | None = None, max_size: int = 2**30,
+            default_ttl: float | None = 24 * 60 * 60, ttl_policies: dict | None = None
+    ) -> None:
+        if directory is not None and not isinstance(directory, (str, Path)):
+            raise TypeError("`directory` must be a string, Path, or None.")
+        if not isinstance(max_size, int):
+            raise TypeError("`max_size` must be an int.")
+        if max_size < 0:
+            raise ValueError("`max_size` must be non-negative.")
+        if ttl_policies is not None and not isinstance(ttl_policies, dict):
+            raise TypeError("`ttl_policies` must be a dict or None.")
+
+        self.directory = Path(directory) if directory is not None else DEFAULT_CACHE_DIR
+        self.max_size = max_size
+        self.default_ttl = self._check_ttl(default_ttl)
+        self.ttl_policies: dict[str, float | None | list[tuple[re.Pattern, float | None]]] = dict()
+        for source, policy in (ttl_policies or dict()).items():
+            if isinstance(policy, dict):
+                self.ttl_policies[source] = [
+                    (re.compile(pattern), self._check_ttl(ttl)) for pattern, ttl in policy.items()
+                ]
+            else:
+                self.ttl_policies[source] = self._check_ttl(policy)
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.directory / "index.sqlite", check_same_thread=False)
+        with self._db:
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "key TEXT PRIMARY KEY, url TEXT, created REAL, accessed REAL, size INTEGER)"
+            )
+
+    # ==============================================================================================
+    @staticmethod
+    def _check_ttl(ttl: float | None) -> float | None:
+        """ Private, validates a TTL. """
+        if ttl is None:
+            return None
+        if not isinstance(ttl, (int, float)) or isinstance(ttl, bool):
+            raise TypeError("TTLs must be numbers or None.")
+        if ttl < 0:
+            raise ValueError("TTLs must be non-negative.")
+        return float(ttl)
+
+    # ==============================================================================================
+    def _path(self, key: str) -> Path:
+        """ Private, path of the file that holds the body for a key. """
+        return self.directory / key[:2] / key
+
+    # ==============================================================================================
+    def ttl(self, url: str) -> float | None:
+        """ Seconds that the response for ``url`` stays fresh under the current policies.
+
+        :param url: URL to look up
+        :type url: str
+        :return: TTL in seconds, or None if the response never expires
+        :rtype: float | None
+        """
+        normalized = normalize_url(url)
+        policy = self.ttl_policies.get(url_source(normalized), self.default_ttl)
+        if isinstance(policy, list):
+            for pattern, ttl in policy:
+                if pattern.search(normalized):
+                    return ttl
+            return self.default_ttl
+        return policy
+
+    # ==============================================================================================
+    def get(self, url: str) -> bytes | None:
+        """ Get the cached response body for a URL.
+
+        :param url: URL to look up
+        :type url: str
+        :return: The cached body, or None if there is no fresh entry for the URL
+        :rtype: bytes | None
+        """
+        key = hashlib.sha256(normalize_url(url).encode("utf-8")).hexdigest()
+        ttl = self.ttl(url)
+        now = time.time()
+        with self._lock:
+            row = self._db.execute("SELECT created FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            if ttl is not None and now - row[0] > ttl:
+                self._remove(key)
+                return None
+            try:
+                content = self._path(key).read_bytes()
+            except FileNotFoundError:
+                self._remove(key)
+                return None
+            with self._db:
+                self._db.execute("UPDATE entries SET accessed = ? WHERE key = ?", (now, key))
+        return content
+
+    # ==============================================================================================
+    def set(self, url: str, content: bytes | str) -> None:
+        """ Store a response body for a URL.
+
+        Nothing is stored if the TTL for the URL is 0.
+
+        :param url: URL the body was downloaded from
+        :type url: str
+        :param content: Response body. Strings are stored UTF-8 encoded.
+        :type content: bytes | str
+        :raises TypeError: If ``content`` is not bytes or a string
+        """
+        if isinstance(content, str):
+            content = content.encode("utf-8")
+        if not isinstance(content, bytes):
+            raise TypeError("`content` must be bytes or a string.")
+        if self.ttl(url) == 0:
+            return
+
+        normalized = normalize_url(url)
+        key = hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+        path = self._path(key)
+        now = time.time()
+        with self._lock:
+            path.parent.mkdir(exist_ok=True)
+            tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+            tmp_path.write_bytes(content)
+            tmp_path.replace(path)
+            with self._db:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO entries (key, url, created, accessed, size) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (key, normalized, now, now, len(content))
+                )
+            self._evict()
+
+    # ==============================================================================================
+    def get_or_fetch(self, url: str, fetch: Callable[[], bytes | str | None]) -> bytes | None:
+        """ Return the cached body for ``url``, or call ``fetch`` and cache what it returns.
+
+        :param url: URL to look up
+        :type url: str
+        :param fetch: Function that downloads the body. If it returns None (e.g. on a 404) or an
+            ``Uncached`` body (e.g. a non-2xx response, see ``response_content()``) the result is
+            not cached.
+        :type fetch: Callable[[], bytes | str | None]
+        :return: Response body, or None if ``fetch`` returned None
+        :rtype: bytes | None
+        """
+        content = self.get(url)
+        if content is not None:
+            return content
+        fetched = fetch()
+        if fetched is None:
+            return None
+        if isinstance(fetched, Uncached):
+            return bytes(fetched)
+        if isinstance(fetched, str):
+            fetched = fetched.encode("utf-8")
+        self.set(url, fetched)
+        return fetched
+
+    # ==============================================================================================
+    def invalidate(self, url: str) -> None:
+        """ Remove the cached response for a URL, if there is one.
+
+        :param url: URL to remove
+        :type url: str
+        """
+        key = hashlib.sha256(normalize_url(url).encode("utf-8")).hexdigest()
+        with self._lock:
+            self._remove(key)
+
+    # ==============================================================================================
+    def clear(self) -> None:
+        """ Remove every entry from the cache.
+        """
+        with self._lock:
+            keys = [row[0] for row in self._db.execute("SELECT key FROM entries")]
+            for key in keys:
+                self._remove(key)
+
+    # ==============================================================================================
+    @property
+    def size(self) -> int:
+        """ Total size of the cached bodies in bytes. """
+        with self._lock:
+            return int(self._db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0])
+
+    # ==============================================================================================
+    def __len__(self) -> int:
+        with self._lock:
+            return int(self._db.execute("SELECT COUNT(*) FROM entries").fetchone()[0])
+
+    # ==============================================================================================
+    def _remove(self, key: str) -> None:
+        """ Private, deletes an entry. Caller must hold the lock. """
+        self._path(key).unlink(missing_ok=True)
+        with self._db:
+            self._db.execute("DELETE FROM entries WHERE key = ?", (key,))
+
+    # ==============================================================================================
+    def _evict(self) -> None:
+        """ Private, evicts least recently used entries until the cache fits in ``max_size``.
+        Caller must hold the lock.
+        """
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_size:
+            return
+        rows = self._db.execute("SELECT key, size FROM entries ORDER BY accessed ASC").fetchall()
+        for key, size in rows:
+            if total <= self.max_size:
+                break
+            self._remove(key)
+            total -= size
@@ -0,0 +1,80 @@
+from typing import Any, Callable
+import copy
+import threading
+import time
+
+
+class SeasonCatalog:
+    """ In-memory cache of the seasons that each league has on a source.
+
+    Every year-based scraper method starts by looking up the league's valid seasons, which is a
+    page load or API request on its own. Each scraper keeps one of these so that lookup only
+    goes to the network the first time for each league, until the entry expires or is invalidated.
+
+    Example
+    -------
+    >>> fbref = FBref(season_ttl=60 * 60)
+    >>> fbref.get_valid_seasons("England Premier League")  # fetched
+    >>> fbref.get_valid_seasons("England Premier League")  # from the catalog
+    >>> fbref.season_catalog.invalidate("England Premier League")
+
+    :param ttl: Seconds that a league's seasons stay fresh, or None to keep them for the lifetime
+        of the catalog (default: 1 day)
+    :type ttl: float | None
+    :raises TypeError: If ``ttl`` is not a number or None
+    :raises ValueError: If ``ttl`` is negative
+    """
+
+    # ==============================================================================================
+    def __init__(self, ttl: float | None = 24 * 60 * 60) -> None:
+        if ttl is not None and (not isinstance(ttl, (int, float)) or isinstance(ttl, bool)):
+            raise TypeError("`ttl` must be a number or None.")
+        if ttl is not None and ttl < 0:
+            raise ValueError("`ttl` must be non-negative.")
+        self.ttl = ttl
+        self._entries: dict[str, tuple[float, Any]] = dict()
+        self._lock = threading.Lock()
+
+    # ==============================================================================================
+    def get_or_fetch(self, league: str, fetch: Callable[[], Any]) -> Any:
+        """ Return the seasons of ``league``, calling ``fetch`` to get them if they aren't in the
+        catalog or have expired.
+
+        A copy is returned, so callers can modify the result without changing the catalog.
+
+        :param league: League the seasons belong to
+        :type league: str
+        :param fetch: Function that downloads the seasons
+        :type fetch: Callable[[], Any]
+        :return: The seasons of the league, in whatever form ``fetch`` returns them
+        :rtype: Any
+        """
+        with self._lock:
+            entry = self._entries.get(league)
+        if entry is not None and (self.ttl is None or time.monotonic() - entry[0] <= self.ttl):
+            return copy.copy(entry[1])
+
+        seasons = fetch()
+        if self.ttl != 0:
+            with self._lock:
+                self._entries[league] = (time.monotonic(), seasons)
+        return copy.copy(seasons)
+
+    # ==============================================================================================
+    def invalidate(self, league: str | None = None) -> None:
+        """ Forget the seasons of ``league``, or of every league if ``league`` is None.
+
+        :param league: League to forget (default: None, all leagues)
+        :type league: str | None
+        """
+        with self._lock:
+            if league is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(league, None)
+
+    # ==============================================================================================
+    def __contains__(self, league: str) -> bool:
+        with self._lock:
+            entry = self._entries.get(league)
+        return entry is not None and (self.ttl is None or time.monotonic() - entry[0] <= self.ttl)
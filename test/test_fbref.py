@@ -1,16 +1,28 @@
 import sys
+import re
+import time
 import random
+import threading
+from io import StringIO
 import numpy as np
 import pandas as pd
 import pytest
+from bs4 import BeautifulSoup
+from tqdm import tqdm
 
 sys.path.append('./src/')
 from ScraperFC import FBref
 from ScraperFC.fbref import stats_categories
+from ScraperFC import fbref_match
 from ScraperFC.fbref_match import FBrefMatch
+from ScraperFC import fbref_helpers
+from ScraperFC.fbref_helpers import _read_table, _get_stats_table_tag, _CommentedTables,\
+    _get_ids_from_urls
 from ScraperFC.scraperfc_exceptions import NoMatchLinksException, InvalidLeagueException,\
     InvalidYearException
-from ScraperFC.utils import get_module_comps
+from ScraperFC.utils import get_module_comps, make_soup, html_parser, CheckpointStore
+from ScraperFC.utils.html_parser import HTML_PARSERS
+from ScraperFC.utils.rate_limiter import _rate_limiter
 
 no_matches = {
     "Belgium Pro League": [
@@ -33,6 +45,23 @@ comps = get_module_comps("FBREF")
 
 class TestFBref:
 
+    # ==============================================================================================
+    def test_wait_time(self):
+        fbref_url = "https://fbref.com/en/"
+        try:
+            FBref(wait_time=6)
+            bucket = _rate_limiter.bucket(fbref_url)
+            FBref(wait_time=6)
+            assert _rate_limiter.bucket(fbref_url) is bucket  # not reset by a second object
+            FBref(wait_time=0)
+            assert _rate_limiter.bucket(fbref_url) is None
+            with pytest.raises(ValueError):
+                FBref(wait_time=-1)
+            with pytest.raises(TypeError):
+                FBref(wait_time="6")  # type: ignore
+        finally:
+            FBref()
+
     # ==============================================================================================
     @pytest.mark.parametrize(
         'year, league, expected',
@@ -201,3 +230,350 @@ class TestFBref:
             assert type(value["squad"]) is pd.DataFrame
             assert type(value["opponent"]) is pd.DataFrame
             assert type(value["player"]) is pd.DataFrame
+
+    # ==============================================================================================
+    def test_context_manager_closes_pool(self):
+        with FBref() as scraper:
+            assert not scraper._browser_pool._closed
+        assert scraper._browser_pool._closed
+
+    # ==============================================================================================
+    def test_prefetch_html_keeps_order(self, monkeypatch):
+        fbref = FBref(pool_size=3)
+        lock = threading.Lock()
+        in_flight, max_in_flight = [0], [0]
+
+        def _get_html(url):
+            with lock:
+                in_flight[0] += 1
+                max_in_flight[0] = max(max_in_flight[0], in_flight[0])
+            time.sleep(random.random() * 0.01)
+            with lock:
+                in_flight[0] -= 1
+            return url.upper()
+
+        monkeypatch.setattr(fbref, "_get_html", _get_html)
+        urls = [f"https://fbref.com/en/matches/{i}" for i in range(20)]
+        assert list(fbref._prefetch_html(urls)) == [(url, url.upper()) for url in urls]
+        assert 1 < max_in_flight[0] <= 3
+
+    # ==============================================================================================
+    @pytest.mark.parametrize('parser', HTML_PARSERS)
+    def test_parse_match_page(self, parser, monkeypatch):
+        monkeypatch.setattr(html_parser, "_html_parser", parser)
+        def _stats_table(table_id, player_id):
+            return (
+                f'<table id="{table_id}"><thead>'
+                '<tr><th></th><th colspan="2">Performance</th></tr>'
+                '<tr><th>Player</th><th>Age</th><th>Gls</th></tr></thead><tbody>'
+                f'<tr><th><a href="/en/players/{player_id}/Name">Name</a></th>'
+                '<td>25-100</td><td>1</td></tr>'
+                '</tbody><tfoot><tr><th>Total</th><td></td><td>1</td></tr></tfoot></table>'
+            )
+
+        html = (
+            '<div id="content" role="main"><div>Premier League (Matchweek 1)</div>'
+            '<div class="scorebox">'
+            '<div><div><strong><a href="/en/squads/aaaa/Home">Home FC</a></strong></div>'
+            '<div class="scores"><div class="score">2</div></div></div>'
+            '<div><div><strong><a href="/en/squads/bbbb/Away">Away FC</a></strong></div>'
+            '<div class="scores"><div class="score">1*</div></div></div>'
+            '<div class="scorebox_meta"><div><strong>Friday August 11, 2023</strong></div>'
+            '<div><strong>Officials</strong>: <span>Anthony Taylor\xa0(Referee)</span> · '
+            '<span>Gary Beswick\xa0(AR1)</span> · <span>Jarred Gillett\xa0(VAR)</span></div>'
+            '</div></div>'
+            + _stats_table("stats_aaaa_summary", "p1") + _stats_table("stats_bbbb_summary", "p2")
+            + '<table id="shots_all"><thead><tr><th>Minute</th></tr></thead>'
+            '<tbody><tr><td>5</td></tr></tbody></table></div>'
+        )
+        match = FBref()._parse_match("https://fbref.com/en/matches/x", make_soup(html))
+        assert match.date == "Friday August 11, 2023"
+        assert match.stage == "Premier League (Matchweek 1)"
+        assert (match.home_team, match.away_team) == ("Home FC", "Away FC")
+        assert (match.home_id, match.away_id) == ("aaaa", "bbbb")
+        assert (match.home_goals, match.away_goals) == ("2", "1*")
+        assert list(match.home_player_stats) == ["summary"]
+        assert match.home_player_stats["summary"]["Player ID"].iloc[0] == "p1"
+        assert match.away_player_stats["summary"]["Player ID"].iloc[0] == "p2"
+        assert match.all_shots.shape == (1, 1)
+        assert match.home_shots.empty and match.away_shots.empty
+        assert (match.referee, match.ar1, match.ar2, match.fourth_official, match.var) == \
+            ("Anthony Taylor", "Gary Beswick", "", "", "Jarred Gillett")
+
+    # ==============================================================================================
+    @pytest.mark.parametrize(
+        'html, links',
+        [('<table><thead>'
+         '<tr><th aria-label="" colspan="2"></th><th colspan="2">Performance</th></tr>'
+         '<tr><th>Rk</th><th>Player</th><th>Gls</th><th>Min</th></tr></thead><tbody>'
+         '<tr><th>1</th><td><a href="/en/players/abc/Foo">Foo  Bar</a></td><td>3</td>'
+         '<td>1,234</td></tr>'
+         '<tr class="thead"><th>Rk</th><th>Player</th><th>Gls</th><th>Min</th></tr>'
+         '<tr><th>2</th><td><a href="/en/players/def/Baz">Baz</a></td><td></td><td>90</td></tr>'
+         '</tbody><tfoot><tr><th colspan="2">Squad Total</th><td>3</td><td>1,324</td></tr>'
+         '</tfoot></table>',
+         ['/en/players/abc/Foo', None, '/en/players/def/Baz', None]),
+         ('<table><tr><th>Rk</th><th>Squad</th><th>Pts</th></tr>'
+         '<tr><td>1</td><td rowspan="2"><a href="/en/squads/aa/A">A</a></td><td>90</td></tr>'
+         '<tr><td>2</td><td>80</td></tr></table>',
+         ['/en/squads/aa/A', None]),
+         ('<table><thead><tr><th>Min</th><th>Player</th></tr></thead><tbody>'
+         '<tr><td>5</td><td>X<span style="display:none">hidden</span></td></tr>'
+         '<tr style="display: none"><td>1</td><td>2</td></tr><tr><td>7</td></tr></tbody></table>',
+         [None, None]),
+         ('<table><tr><th>Squad<br>Name</th><th>Notes</th></tr>'
+         '<tr><td><a href="/en/squads/aa/A">A<br/>FC</a></td><td>x <br> y<br><br>z</td></tr>'
+         '<tr><td>B</td><td><br></td></tr></table>',
+         ['/en/squads/aa/A', None])]
+    )
+    @pytest.mark.parametrize('parser', HTML_PARSERS)
+    def test_read_table_matches_read_html(self, html, links, parser):
+        table_tag = BeautifulSoup(html, parser).find("table")
+        df, hrefs = _read_table(table_tag)
+        pd.testing.assert_frame_equal(df, pd.read_html(StringIO(html))[0])
+        assert hrefs == links
+        assert _get_ids_from_urls(hrefs, "player")[:2] == (
+            ["abc", None] if "players" in html else [None, None]
+        )
+
+    # ==============================================================================================
+    def test_commented_tables(self, monkeypatch):
+        def _table_div(table_id, attrs=""):
+            return f'<!-- <div class="table_container"><table{attrs} id="{table_id}"><tr><td>' \
+                f'{table_id}</td></tr></table></div> -->'
+
+        html = '<div><table id="stats_standard_for"></table>' + _table_div("stats_standard_9") \
+            + _table_div("stats_standard_against") + "<!-- not a table -->" \
+            + _table_div("stats_shooting_9", ' data-id="stats_keeper"') + "</div>"
+        soup = make_soup(html)
+        parsed = list()
+        monkeypatch.setattr(
+            fbref_helpers, "make_soup", lambda markup: parsed.append(markup) or make_soup(markup)
+        )
+        commented_tables = _CommentedTables(soup)
+
+        for _ in range(2):
+            table_tag = _get_stats_table_tag(
+                soup, {"name": "table", "attrs": {"id": re.compile("stats_standard_against")}},
+                commented_tables
+            )
+            assert table_tag is not None and table_tag.text == "stats_standard_against"
+        assert len(parsed) == 1
+
+        table_tag = _get_stats_table_tag(
+            soup, {"name": "table", "attrs": {"id": "stats_standard_9"}}, commented_tables
+        )
+        assert table_tag is not None and table_tag.text == "stats_standard_9"
+        assert _get_stats_table_tag(
+            soup, {"name": "table", "attrs": {"id": "stats_keeper"}}, commented_tables
+        ) is None
+        assert len(parsed) == 2
+
+        # data-id isn't mistaken for the table's id
+        table_tag = _get_stats_table_tag(
+            soup, {"name": "table", "attrs": {"id": "stats_shooting_9"}}, commented_tables
+        )
+        assert table_tag is not None and table_tag.text == "stats_shooting_9"
+        assert len(parsed) == 3
+
+    # ==============================================================================================
+    def test_valid_seasons_are_memoized(self, monkeypatch):
+        fbref = FBref()
+        loads = list()
+        html = '<table><tr><th data-stat="year_id" scope="row">' \
+            '<a href="/en/comps/9/2023-2024/2023-2024-Premier-League-Stats">2023-2024</a></th></tr>' \
+            '</table>'
+        monkeypatch.setattr(fbref, "_get_soup", lambda url: loads.append(url) or make_soup(html))
+
+        for _ in range(3):
+            seasons = fbref.get_valid_seasons("England Premier League")
+        assert seasons == {
+            "2023-2024": "https://fbref.com/en/comps/9/2023-2024/2023-2024-Premier-League-Stats"
+        }
+        assert len(loads) == 1
+
+        fbref.season_catalog.invalidate()
+        fbref.get_valid_seasons("England Premier League")
+        assert len(loads) == 2
+
+    # ==============================================================================================
+    def test_scrape_matches_resumes_from_checkpoint(self, monkeypatch, tmp_path):
+        fbref = FBref()
+        links = [f"https://fbref.com/en/matches/{i}" for i in range(5)]
+        scraped, failures = list(), [links[3]]
+
+        def _scrape_match(link):
+            if link in failures:
+                failures.remove(link)
+                raise ConnectionError("Cloudflare")
+            scraped.append(link)
+            return link.upper()
+
+        monkeypatch.setattr(fbref, "get_match_links", lambda year, league: links)
+        monkeypatch.setattr(fbref, "scrape_match", _scrape_match)
+        store = CheckpointStore(tmp_path / "checkpoints.sqlite")
+
+        with pytest.raises(ConnectionError):
+            fbref.scrape_matches("2023-2024", "England Premier League", checkpoint=store)
+        matches = fbref.scrape_matches("2023-2024", "England Premier League", checkpoint=store)
+        assert matches == [link.upper() for link in links]
+        assert scraped == links  # nothing was scraped twice
+
+    # ==============================================================================================
+    def test_scrape_new_matches(self, monkeypatch, tmp_path):
+        fbref = FBref()
+        links = [f"https://fbref.com/en/matches/{i:08x}/Home-Away" for i in range(4)]
+        scraped = list()
+        monkeypatch.setattr(fbref, "get_match_links", lambda year, league: links)
+        monkeypatch.setattr(fbref, "scrape_match", lambda link: scraped.append(link) or link)
+
+        # Known links are matched on the match ID, not the slug
+        known = {"https://fbref.com/en/matches/00000000/Old-Slug", links[1]}
+        new, unchanged = fbref.scrape_new_matches("2023-2024", "England Premier League", known)
+        assert new == [links[2], links[3]]
+        assert unchanged == {links[0], links[1]}
+
+        store = CheckpointStore(tmp_path / "checkpoints.sqlite")
+        store.save("fbref/matches/England Premier League/2023-2024", links[0], links[0])
+        new, unchanged = fbref.scrape_new_matches("2023-2024", "England Premier League", store)
+        assert new == links[1:]
+        new, unchanged = fbref.scrape_new_matches("2023-2024", "England Premier League", store)
+        assert new == [] and unchanged == set(links)
+
+    # ==============================================================================================
+    def test_match_parquet_round_trip(self, tmp_path):
+        pytest.importorskip("pyarrow")
+        columns = pd.MultiIndex.from_tuples([("", "Player"), ("Performance", "Gls")])
+        stats = pd.DataFrame([["A", 1], ["B", np.nan]], columns=columns)
+        shots = pd.DataFrame({"Minute": ["12", "45+1"], "xG": [0.1, 0.35]})
+        matches = [
+            FBrefMatch(
+                url=f"https://fbref.com/en/matches/{i:08x}/Home-Away", date="2024-01-01",
+                stage="Matchweek 1", home_team="Home", away_team="Away", home_id="1",
+                away_id="2", home_goals="1", away_goals="0",
+                home_player_stats={"Summary": stats, "Passing": stats.iloc[:1]},
+                away_player_stats={"Summary": stats}, all_shots=shots, home_shots=shots,
+                away_shots=pd.DataFrame(), referee="Ref", ar1=None, ar2=None,
+                fourth_official=None, var=None,
+            )
+            for i in range(2)
+        ]
+
+        restored = FBrefMatch.from_arrow(matches[0].to_arrow())
+        assert list(restored.home_player_stats) == ["Summary", "Passing"]
+        pd.testing.assert_frame_equal(restored.home_player_stats["Summary"], stats)
+        pd.testing.assert_frame_equal(restored.all_shots, shots)
+        assert restored.away_shots.empty and restored.ar1 is None
+
+        fbref_match.write_season_parquet(matches, tmp_path)
+        lazy = fbref_match.read_season_parquet(tmp_path)
+        assert [m.url for m in lazy] == [m.url for m in matches]
+        assert type(lazy[1]) is FBrefMatch and "all_shots" not in vars(lazy[1])
+        pd.testing.assert_frame_equal(lazy[1].all_shots, shots)
+        assert "all_shots" in vars(lazy[1]) and "home_shots" not in vars(lazy[1])
+        pd.testing.assert_frame_equal(lazy[1].away_player_stats["Summary"], stats)
+        eager = fbref_match.read_season_parquet(tmp_path, lazy=False)[0]
+        assert all(field in vars(eager) for field in fbref_match.TABLE_FIELDS)
+
+        # Writing in chunks keeps the earlier matches, and rewriting a match drops its old tables
+        chunked = tmp_path / "chunked"
+        fbref_match.write_season_parquet(matches[:1], chunked)
+        passing = chunked / "home_player_stats.Passing" / f"match_id={0:08x}"
+        assert passing.exists()
+        matches[0].home_player_stats = {"Summary": stats}
+        fbref_match.write_season_parquet(matches[1:] + matches[:1], chunked)
+        assert not passing.exists()
+        restored = fbref_match.read_season_parquet(chunked)
+        assert [m.url for m in restored] == [m.url for m in matches]
+        assert list(restored[0].home_player_stats) == ["Summary"]
+        assert list(restored[1].home_player_stats) == ["Summary", "Passing"]
+
+    # ==============================================================================================
+    def test_scrape_batch(self, monkeypatch, tmp_path, capsys):
+        fbref = FBref()
+        links = [f"https://fbref.com/en/matches/{i:08x}/Home-Away" for i in range(3)]
+        calls = list()
+        monkeypatch.setattr(
+            fbref, "get_valid_seasons", lambda league: {"2023-2024": "url", "2022-2023": "url"}
+        )
+        monkeypatch.setattr(
+            fbref, "get_match_links",
+            lambda year, league: links[:2] if league == "England Premier League" else links[1:]
+        )
+        monkeypatch.setattr(fbref, "scrape_match", lambda link: calls.append(link) or link)
+        monkeypatch.setattr(
+            fbref, "scrape_stats",
+            lambda year, league, category: calls.append(category) or {"player": category}
+        )
+        monkeypatch.setattr(
+            fbref, "scrape_league_table", lambda year, league: calls.append("table") or ["table"]
+        )
+
+        with pytest.raises(ValueError):
+            fbref.scrape_batch([("England Premier League", "2023-2024", "shots")])
+        with pytest.raises(InvalidYearException):
+            fbref.scrape_batch([("England Premier League", "1888-1889", "stats")])
+
+        jobs = [
+            ("England Premier League", "2023-2024", "matches"),
+            ("England EFL Championship", "2023-2024", "matches"),
+            ("England Premier League", "2023-2024", "league table"),
+            ("England Premier League", "2023-2024", "matches"),
+            ("England Premier League", "2022-2023", "stats"),
+        ]
+        store = CheckpointStore(tmp_path / "checkpoints.sqlite")
+        results = fbref.scrape_batch(jobs, checkpoint=store)
+        # The ETA comes from the fbref.com bucket, 1 request every 6 seconds after the first
+        pages = len(links) + 1 + len(stats_categories)
+        eta = tqdm.format_interval((pages - 1) * 6)
+        assert f"{pages} pages to load, about {eta} at" in capsys.readouterr().out
+        assert list(results) == jobs[:3] + jobs[4:]
+        assert results[jobs[0]] == links[:2] and results[jobs[1]] == links[1:]
+        assert results[jobs[2]] == ["table"]
+        assert results[jobs[4]]["misc"] == {"player": "misc"}
+        # The match shared by both leagues is only scraped once
+        assert calls == links + ["table"] + list(stats_categories)
+        assert sorted(store.keys("fbref/matches/England EFL Championship/2023-2024")) == links[1:]
+
+        # Everything comes from the checkpoint on the second run
+        calls.clear()
+        assert fbref.scrape_batch(jobs, checkpoint=store) == results
+        assert calls == list()
+
+    # ==============================================================================================
+    def test_scrape_schedule(self, monkeypatch):
+        header = (
+            '<tr{}><th>Wk</th><th>Date</th><th>Home</th><th>Score</th><th>Away</th>'
+            '<th>Attendance</th><th>Match Report</th></tr>'
+        )
+
+        def _fixture(wk, home, away, match_id=None):
+            score = f'<a href="/en/matches/{match_id}/{home}-{away}">1–0</a>' if match_id else ''
+            report = f'/en/matches/{match_id}/{home}-{away}' if match_id else '/en/stathead/x'
+            return (
+                f'<tr><th data-stat="gameweek">{wk}</th><td data-stat="date">2024-01-0{wk}</td>'
+                f'<td data-stat="home_team"><a href="/en/squads/{home}/{home}">{home}</a></td>'
+                f'<td class="{"center" if match_id else "center iz"}" data-stat="score">{score}</td>'
+                f'<td data-stat="away_team">{away}</td><td>{"1,000" if match_id else ""}</td>'
+                f'<td data-stat="match_report"><a href="{report}">Report</a></td></tr>'
+            )
+
+        html = (
+            '<table id="sched_2023-2024_9_1"><thead>' + header.format('') + '</thead><tbody>'
+            + _fixture(1, "A", "B", "m2") + '<tr class="spacer"><td colspan="7"></td></tr>'
+            + header.format(' class="thead"') + _fixture(2, "B", "A", "m1") + _fixture(3, "A", "C")
+            + '</tbody></table>'
+        )
+        fbref = FBref()
+        monkeypatch.setattr(fbref, "_get_fixtures_url", lambda year, league: "url")
+        monkeypatch.setattr(fbref, "_get_soup", lambda url: make_soup(html))
+
+        schedule = fbref.scrape_schedule("2023-2024", "England Premier League")
+        assert schedule["Home"].tolist() == ["A", "B", "A"]
+        assert schedule["Match URL"].tolist()[:2] == [
+            "https://fbref.com/en/matches/m2/A-B", "https://fbref.com/en/matches/m1/B-A"
+        ]
+        assert pd.isna(schedule["Match URL"].iloc[2])
+        # Links are kept in page order
+        assert fbref.get_match_links("2023-2024", "England Premier League") == \
+            schedule["Match URL"].tolist()[:2]
@@ -4,11 +4,14 @@ import random
 import numpy as np
 import pandas as pd
 import sys
+import threading
+import time
 
 sys.path.append('./src/')
 from ScraperFC import Sofascore
+from ScraperFC.sofascore import bin_heatmaps
 from ScraperFC.scraperfc_exceptions import InvalidLeagueException, InvalidYearException
-from ScraperFC.utils import get_module_comps
+from ScraperFC.utils import get_module_comps, CheckpointStore
 from ScraperFC.sofascore_player import SofascorePlayer
 
 comps = get_module_comps("SOFASCORE")
@@ -243,3 +246,416 @@ class TestSofascore:
         assert len(player_ids) == len(player_details)
         assert isinstance(player_details, list)
         assert all(isinstance(player, SofascorePlayer) for player in player_details)
+
+    # ==============================================================================================
+    def test_scrape_match_bundle(self, monkeypatch):
+        ss = Sofascore()
+        team = {"id": 1, "name": "Home", "slug": "home"}
+        player = {"player": {"id": 7, "name": "P"}, "statistics": {"goals": 1}}
+        responses = {
+            "": {"event": {"id": match_id, "homeTeam": team, "awayTeam": {"id": 2, "name": "Away", "slug": "away"}}},
+            "lineups": {"home": {"players": [player]}, "away": {"players": []}},
+            "statistics": {"statistics": []},
+            "graph": {"graphPoints": [{"minute": 1, "value": 5}]},
+            "shotmap": {"shotmap": [{"x": 1}]},
+            "average-positions": {
+                "home": [{"player": {"id": 7}, "averageX": 50}],
+                "away": [{"player": {"id": 8}, "averageX": 40}],
+            },
+            "player/7/heatmap": {"heatmap": [{"x": 1, "y": 2}]},
+        }
+        urls = list()
+
+        def _get_json(url):
+            urls.append(url)
+            prefix = f"https://api.sofascore.com/api/v1/event/{match_id}"
+            return responses[url.removeprefix(prefix).lstrip("/")]
+
+        monkeypatch.setattr(ss, "_get_json", _get_json)
+        with pytest.raises(ValueError):
+            ss.scrape_match_bundle(match_id, ["event", "odds"])
+
+        bundle = ss.scrape_match_bundle(match_url)
+        assert list(bundle) == [
+            "event", "lineups", "statistics", "graph", "shotmap", "average-positions", "heatmaps"
+        ]
+        assert len(urls) == len(set(urls)) == len(responses)  # every endpoint loaded once
+        assert bundle["heatmaps"] == {"P": {"id": 7, "heatmap": [(1, 2)]}}
+        assert bundle["lineups"]["teamName"].tolist() == ["Home"]
+        assert bundle["average-positions"]["team"].tolist() == ["Home", "Away"]
+        assert bundle["graph"].shape == (1, 2)
+
+        # Same outputs as the single scrapers
+        pd.testing.assert_frame_equal(bundle["shotmap"], ss.scrape_match_shots(match_id))
+        assert ss.scrape_match_bundle(match_id, ["event"]) == {"event": ss.get_match_dict(match_id)}
+
+    # ==============================================================================================
+    def test_scrape_heatmaps_concurrently(self, monkeypatch):
+        ss = Sofascore(pool_size=4)
+        lineups = {
+            team: {"players": [{"player": {"id": i, "name": f"P{i}"}} for i in range(n, n + 4)]}
+            for team, n in [("home", 0), ("away", 4)]
+        }
+        active, most_active = [0], [0]
+        lock = threading.Lock()
+
+        def _get_json(url):
+            if url.endswith("/lineups"):
+                return lineups
+            with lock:
+                active[0] += 1
+                most_active[0] = max(most_active[0], active[0])
+            time.sleep(0.05)
+            with lock:
+                active[0] -= 1
+            player_id = int(url.split("/")[-2])
+            return {"error": {}} if player_id == 7 else {"heatmap": [{"x": player_id, "y": 0}]}
+
+        monkeypatch.setattr(ss, "_get_json", _get_json)
+        heatmaps = ss.scrape_heatmaps(match_id)
+        assert list(heatmaps) == [f"P{i}" for i in range(8)]
+        assert heatmaps["P3"] == {"id": 3, "heatmap": [(3, 0)]}
+        assert heatmaps["P7"] == {"id": 7, "heatmap": []}
+        assert most_active[0] == 4
+
+    # ==============================================================================================
+    def test_scrape_player_details_concurrently(self, monkeypatch):
+        ss = Sofascore(pool_size=3)
+        player_ids = list(range(10))
+        monkeypatch.setattr(ss, "get_league_player_ids", lambda year, league: player_ids)
+        monkeypatch.setattr(
+            "ScraperFC.sofascore._get_player_career_stats_df", lambda *args: pd.DataFrame()
+        )
+
+        def _get_json(url):
+            player_id = int(url.split("/")[-1])
+            time.sleep(0.01 * (10 - player_id))  # later players finish first
+            if player_id == 4:
+                raise ConnectionError("browser went away")
+            return {"player": {"name": f"P{player_id}", "team": {"name": "T", "id": 1}}}
+
+        monkeypatch.setattr(ss, "_get_json", _get_json)
+        with pytest.warns(UserWarning, match="player 4"):
+            players = ss.scrape_player_details("24/25", "EPL")
+        assert [p.id for p in players] == player_ids
+        assert players[3].name == "P3" and players[3].error is None
+        assert players[4].name is None and "browser went away" in players[4].error
+
+        with pytest.warns(UserWarning):
+            streamed = list(ss.iter_player_details("24/25", "EPL"))
+        assert sorted(p.id for p in streamed) == player_ids
+        assert streamed[0].id != 0  # yielded as they finish
+
+    # ==============================================================================================
+    @pytest.mark.parametrize('pool_size', [1, 3])
+    def test_paginated_endpoints(self, monkeypatch, pool_size):
+        ss = Sofascore(pool_size=pool_size)
+        monkeypatch.setattr(ss, "get_valid_seasons", lambda league: {"23/24": 1})
+        urls = list()
+
+        def _get_json(url):
+            urls.append(url)
+            if "/events/last/" in url:
+                page = int(url.split("/")[-1])
+                return {"events": [{"id": 10 * page}, {"id": 10 * page + 1}]} if page < 4 else {}
+            offset = int(url.split("offset=")[1].split("&")[0])
+            player = {"player": {"id": offset, "name": "P"}, "team": {"id": 1, "name": "T"}}
+            return {"results": [player], "page": offset // 100 + 1, "pages": 5}
+
+        monkeypatch.setattr(ss, "_get_json", _get_json)
+        matches = ss.get_match_dicts("23/24", "England Premier League")
+        assert [m["id"] for m in matches] == [0, 1, 10, 11, 20, 21, 30, 31]
+
+        urls.clear()
+        stats = ss.scrape_player_league_stats("23/24", "England Premier League")
+        assert stats["player id"].tolist() == [0, 100, 200, 300, 400]
+        assert len(urls) == 5
+
+    # ==============================================================================================
+    def test_context_manager_closes_pool(self):
+        with Sofascore(pool_size=2) as scraper:
+            assert not scraper._browser_pool._closed
+        assert scraper._browser_pool._closed
+
+    # ==============================================================================================
+    def test_team_stats_built_once(self, monkeypatch):
+        ss = Sofascore()
+        monkeypatch.setattr(ss, "get_valid_seasons", lambda league: {"23/24": 1})
+
+        def _get_json(url):
+            if url.endswith("/teams"):
+                return {"teams": [{"id": 1, "name": "A"}, {"id": 2, "name": "B"}]}
+            if "/team/1/" in url:
+                return {}
+            if "/team/2/" in url:
+                return {"statistics": {"goalsScored": 50, "shots": 400, "teamId": 99}}
+            return {"statistics": [
+                {"period": "ALL", "groups": [
+                    {"groupName": "Expected", "statisticsItems": [{"name": "xG", "home": "1.2"}]},
+                    {"groupName": "Shots", "statisticsItems": [
+                        {"name": "Total shots", "home": "10"}, {"name": "On target", "home": "4"}
+                    ]},
+                ]},
+                {"period": "1ST", "groups": [
+                    {"groupName": "Shots", "statisticsItems": [{"name": "Total shots", "away": "3"}]}
+                ]},
+            ]}
+
+        monkeypatch.setattr(ss, "_get_json", _get_json)
+        league_stats = ss.scrape_team_league_stats("23/24", "England Premier League")
+        assert league_stats.columns.tolist() == ["teamName", "teamId", "goalsScored", "shots"]
+        assert league_stats["teamId"].tolist() == [1, 2]
+        assert league_stats.loc[1, "shots"] == 400 and pd.isna(league_stats.loc[0, "shots"])
+
+        match_stats = ss.scrape_team_match_stats(match_id)
+        assert match_stats.columns.tolist() == ["name", "home", "period", "group", "away"]
+        assert match_stats["group"].tolist() == ["Expected", "Shots", "Shots", "Shots"]
+        assert match_stats["period"].tolist() == ["ALL", "ALL", "ALL", "1ST"]
+
+    # ==============================================================================================
+    def test_crawl_season(self, monkeypatch, tmp_path):
+        ds = pytest.importorskip("pyarrow.dataset")
+        ss = Sofascore(pool_size=2)
+        matches = [
+            {"id": i, "status": {"type": "finished" if i != 4 else "notstarted"}} for i in range(5)
+        ]
+        monkeypatch.setattr(ss, "get_match_dicts", lambda year, league: matches)
+        fail = {3}
+        urls = list()
+
+        def _get_json(url):
+            match_id = int(url.split("/event/")[1].split("/")[0])
+            urls.append(match_id)
+            if match_id in fail:
+                raise RuntimeError("browser went away")
+            if url.endswith("/statistics"):
+                return {"statistics": [{"period": "ALL", "groups": [
+                    {"groupName": "Shots", "statisticsItems": [{"name": "Shots", "home": "3"}]}
+                ]}]}
+            if url.endswith("/shotmap"):
+                return {"shotmap": [
+                    {"player": {"id": 7, "name": "P"}, "xg": 0.1, "draw": {"start": {"x": 1}}},
+                    {"player": {"id": 8, "name": "Q"}, "xg": None, "isOwnGoal": True},
+                ]}
+            return {"error": {"code": 404, "message": "Not Found"}}
+
+        monkeypatch.setattr(ss, "_get_json", _get_json)
+        with pytest.warns(UserWarning):
+            done = ss.crawl_season("23/24", "EPL", tmp_path, ["statistics", "shotmap", "graph"])
+        assert sorted(done) == [0, 1, 2]
+        assert done[0] == {"statistics": 1, "shotmap": 2, "graph": 0}
+        assert not (tmp_path / "graph").exists()
+
+        shots = ds.dataset(tmp_path / "shotmap", partitioning="hive").to_table().to_pandas()
+        assert len(shots) == 6
+        assert {"player.id", "player.name", "draw.start.x", "match_id"} <= set(shots.columns)
+        assert sorted(shots["match_id"].unique()) == [0, 1, 2]
+
+        # Resuming only scrapes the match that failed
+        fail.clear()
+        urls.clear()
+        done = ss.crawl_season("23/24", "EPL", tmp_path, ["statistics", "shotmap", "graph"])
+        assert sorted(done) == [0, 1, 2, 3]
+        assert set(urls) == {3}
+        assert (tmp_path / "statistics" / "match_id=3" / "part-0.parquet").exists()
+
+        with pytest.raises(ValueError):
+            ss.crawl_season("23/24", "EPL", tmp_path, ["heatmaps"])
+
+    # ==============================================================================================
+    def test_heatmap_arrays_and_binning(self, monkeypatch):
+        ss = Sofascore()
+        lineups = {
+            "home": {"players": [{"player": {"id": 1, "name": "A"}}]},
+            "away": {"players": [{"player": {"id": 2, "name": "B"}}]},
+        }
+        points = {1: [{"x": 0, "y": 0}, {"x": 55.5, "y": 99.9}, {"x": 100, "y": 100}], 2: []}
+
+        def _get_json(url):
+            if url.endswith("/lineups"):
+                return lineups
+            player_id = int(url.split("/")[-2])
+            return {"heatmap": points[player_id]} if points[player_id] else {"error": {}}
+
+        monkeypatch.setattr(ss, "_get_json", _get_json)
+        heatmaps = ss.scrape_heatmaps(match_id, as_array=True)
+        assert heatmaps["A"]["heatmap"].dtype == np.float32
+        assert heatmaps["A"]["heatmap"].shape == (3, 2)
+        assert heatmaps["A"]["heatmap"].flags["C_CONTIGUOUS"]
+        assert heatmaps["B"]["heatmap"].shape == (0, 2)
+        with pytest.raises(TypeError):
+            ss.scrape_heatmaps(match_id, as_array=1)
+
+        lists = ss.scrape_heatmaps(match_id)
+        rng = np.random.default_rng(0)
+        season = [heatmaps, lists, {"C": {"id": 3, "heatmap": rng.uniform(0, 100, (500, 2))}}]
+        grids = bin_heatmaps(season, bins=(4, 5))
+        assert list(grids) == [1, 2, 3]
+        assert grids[1].sum() == 6 and grids[1][0, 0] == grids[1][2, 4] == grids[1][3, 4] == 2
+        assert not grids[2].any()
+        expected, _, _ = np.histogram2d(
+            season[2]["C"]["heatmap"][:, 0], season[2]["C"]["heatmap"][:, 1], bins=(4, 5),
+            range=[[0, 100], [0, 100]]
+        )
+        assert np.array_equal(grids[3], expected)
+        assert bin_heatmaps(heatmaps, bins=2)[1].shape == (2, 2)
+        assert bin_heatmaps([]) == dict()
+        with pytest.raises(ValueError):
+            bin_heatmaps(heatmaps, bins=0)
+
+    # ==============================================================================================
+    def test_track_live(self, monkeypatch):
+        ss = Sofascore()
+        polls = {1: 0, 2: 0}
+        timeline = {
+            # match 1: score changes on the 2nd poll, a quiet 3rd poll, finished on the 4th
+            1: [
+                ({"homeScore": 0, "status": "inprogress"}, [("Shots", "1")], [1], [10]),
+                ({"homeScore": 1, "status": "inprogress"}, [("Shots", "2")], [1, 2], [10, 11]),
+                ({"homeScore": 1, "status": "inprogress"}, [("Shots", "2")], [1, 2], [10, 11]),
+                ({"homeScore": 1, "status": "finished"}, [("Shots", "2")], [1, 2], [10, 11]),
+            ],
+            # match 2: postponed before kick off
+            2: [({"homeScore": None, "status": "postponed"}, [], [], [])],
+        }
+
+        def _get_live_json(url):
+            match_id, _, part = url.split("/event/")[1].partition("/")
+            match_id = int(match_id)
+            if part == "":
+                polls[match_id] += 1
+            event, stats, graph, shots = timeline[match_id][polls[match_id] - 1]
+            if part == "":
+                status = event["status"]
+                return {"event": {"id": match_id, **event, "status": {"type": status}}}
+            if part == "statistics":
+                items = [{"name": n, "home": v} for n, v in stats]
+                return {"statistics": [{"period": "ALL", "groups": [
+                    {"groupName": "Shots", "statisticsItems": items}
+                ]}]}
+            if part == "graph":
+                return {"graphPoints": [{"minute": m, "value": 5} for m in graph]}
+            if len(shots) == 0:
+                return {"error": {"code": 404, "message": "Not Found"}}
+            return {"shotmap": [{"id": shot, "xg": 0.1} for shot in shots]}
+
+        monkeypatch.setattr(ss, "_get_live_json", _get_live_json)
+        monkeypatch.setattr(ss, "_get_json", lambda url: pytest.fail("live polls skip the cache"))
+        updates = list(ss.track_live([1, "https://www.sofascore.com/a-b/xyz#id:2", 1], 0, 0))
+
+        assert polls == {1: 4, 2: 1}
+        match_1 = [(u["part"], u["changes"]) for u in updates if u["match_id"] == 1]
+        assert match_1[:4] == [
+            ("event", {"id": 1, "homeScore": 0, "status": {"type": "inprogress"}}),
+            ("statistics", [{"name": "Shots", "home": "1", "period": "ALL", "group": "Shots"}]),
+            ("graph", [{"minute": 1, "value": 5}]),
+            ("shotmap", [{"id": 10, "xg": 0.1}]),
+        ]
+        assert match_1[4:] == [
+            ("event", {"homeScore": 1}),
+            ("statistics", [{"name": "Shots", "home": "2", "period": "ALL", "group": "Shots"}]),
+            ("graph", [{"minute": 2, "value": 5}]),
+            ("shotmap", [{"id": 11, "xg": 0.1}]),
+            ("event", {"status": {"type": "finished"}}),
+        ]
+        assert [u["part"] for u in updates if u["match_id"] == 2] == ["event"]
+
+        with pytest.raises(ValueError):
+            ss.track_live([1], interval=30, max_interval=10)
+
+    # ==============================================================================================
+    def test_track_live_transient_errors(self, monkeypatch):
+        ss = Sofascore()
+        polls = {1: 0, 2: 0}
+        events = {
+            # match 1: rate limited and a server error, then recovers and finishes
+            1: [
+                {"error": {"code": 429, "message": "Too Many Requests"}},
+                {"error": {"code": 503, "message": "Service Unavailable"}},
+                {"event": {"id": 1, "homeScore": 0, "status": {"type": "inprogress"}}},
+                {"error": {"code": 403, "message": "Forbidden"}},
+                {"event": {"id": 1, "homeScore": 1, "status": {"type": "finished"}}},
+            ],
+            # match 2: never comes back
+            2: [{"error": {"code": 500, "message": "Internal Server Error"}}] * 3,
+        }
+
+        def _get_live_json(url):
+            match_id, _, part = url.split("/event/")[1].partition("/")
+            match_id = int(match_id)
+            if part != "":
+                return {"error": {"code": 404, "message": "Not Found"}}
+            polls[match_id] += 1
+            return events[match_id][polls[match_id] - 1]
+
+        monkeypatch.setattr(ss, "_get_live_json", _get_live_json)
+        with pytest.warns(UserWarning, match="3 polls in a row"):
+            updates = list(ss.track_live([1, 2], 0, 0, max_failures=3))
+
+        assert polls == {1: 5, 2: 3}
+        assert [u["changes"] for u in updates] == [
+            {"id": 1, "homeScore": 0, "status": {"type": "inprogress"}},
+            {"homeScore": 1, "status": {"type": "finished"}},
+        ]
+
+        with pytest.raises(ValueError):
+            ss.track_live([1], max_failures=0)
+
+    # ==============================================================================================
+    def test_crawl_season_stable_schema(self, monkeypatch, tmp_path):
+        pq = pytest.importorskip("pyarrow.parquet")
+        ss = Sofascore()
+        monkeypatch.setattr(
+            ss, "get_match_dicts",
+            lambda year, league: [{"id": i, "status": {"type": "finished"}} for i in (1, 2, 3)]
+        )
+        shots = {
+            1: [{"id": 1, "xg": 1, "situation": None}],
+            2: [{"id": 2, "xg": 0.35, "situation": "corner", "isOwnGoal": True}],
+            3: [{"id": 3, "xg": 0, "situation": 4}],
+        }
+
+        def _get_json(url):
+            match_id = int(url.split("/event/")[1].split("/")[0])
+            if url.endswith("/shotmap"):
+                return {"shotmap": shots[match_id]}
+            return {"error": {"code": 404, "message": "Not Found"}}
+
+        monkeypatch.setattr(ss, "_get_json", _get_json)
+        ss.crawl_season("23/24", "EPL", tmp_path, ["shotmap"])
+
+        table = pq.read_table(tmp_path / "shotmap")
+        assert str(table.schema.field("xg").type) == "double"
+        assert str(table.schema.field("situation").type) == "string"
+        table = table.sort_by("id")
+        assert table.column("xg").to_pylist() == [1.0, 0.35, 0.0]
+        assert table.column("situation").to_pylist() == [None, "corner", "4"]
+        assert table.column("isOwnGoal").to_pylist() == [None, True, None]
+        assert table.column("match_id").to_pylist() == [1, 2, 3]
+
+    # ==============================================================================================
+    def test_crawl_season_retries_error_responses(self, monkeypatch, tmp_path):
+        pytest.importorskip("pyarrow")
+        ss = Sofascore()
+        monkeypatch.setattr(
+            ss, "get_match_dicts", lambda year, league: [{"id": 1, "status": {"type": "finished"}}]
+        )
+        rate_limited = [True]
+
+        def _get_json(url):
+            if url.endswith("/shotmap"):
+                if rate_limited[0]:
+                    return {"error": {"code": 429, "message": "Too Many Requests"}}
+                return {"shotmap": [{"id": 1, "xg": 0.1}]}
+            return {"error": {"code": 404, "message": "Not Found"}}
+
+        monkeypatch.setattr(ss, "_get_json", _get_json)
+        with pytest.warns(UserWarning, match="shotmap"):
+            assert ss.crawl_season("23/24", "EPL", tmp_path, ["shotmap", "graph"]) == dict()
+        store = CheckpointStore(tmp_path / "_manifest.sqlite")
+        assert store.keys("sofascore/crawl/EPL/23/24") == list()
+        store.close()
+
+        rate_limited[0] = False
+        done = ss.crawl_season("23/24", "EPL", tmp_path, ["shotmap", "graph"])
+        assert done == {1: {"shotmap": 1, "graph": 0}}
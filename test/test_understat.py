@@ -90,6 +90,13 @@ class TestUnderstat:
             assert x.shape[0] > 0
             assert x.shape[1] > 0
 
+    # ==============================================================================================
+    def test_scrape_league_tables_without_teams(self, monkeypatch):
+        understat = Understat()
+        monkeypatch.setattr(understat, "scrape_season_data", lambda year, league: ([], {}, []))
+        tables = understat.scrape_league_tables("2023/2024", "EPL")
+        assert len(tables) == 3 and all(table.empty for table in tables)
+
     # ==============================================================================================
     def test_scrape_matches(self):
         understat = Understat()
@@ -0,0 +1,448 @@
+import sys
+import json
+import time
+import pytest
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+from bs4 import BeautifulSoup
+
+sys.path.append('./src/')
+from ScraperFC.utils import BrowserPool, ResponseCache, RateLimiter, TokenBucket, set_html_parser,\
+    get_html_parser, make_soup, SeasonCatalog, CheckpointStore, xpath_soup, xpath_soup_batch,\
+    flatten_dict_columns, records_to_arrow, get_rate_limit, write_partition
+from ScraperFC.utils.response_cache import normalize_url, url_source, response_content
+
+
+class FakeDriver:
+    """ Stand-in for a Botasaurus driver so the pool can be tested without launching Chrome.
+    """
+    def __init__(self):
+        self._browser = SimpleNamespace(stopped=False)
+        self.closed = False
+        self.page_text = ""
+
+    def get(self, url):
+        self.page_text = json.dumps({"url": url})
+
+    def close(self):
+        self.closed = True
+        self._browser.stopped = True
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    pool = BrowserPool(size=2)
+    pool.started = list()
+
+    def _start_session():
+        driver = FakeDriver()
+        pool.started.append(driver)
+        pool._sessions.append(driver)
+        return driver
+
+    monkeypatch.setattr(pool, "_start_session", _start_session)
+    return pool
+
+
+class TestBrowserPool:
+
+    # ==============================================================================================
+    @pytest.mark.parametrize(
+        'size, expected',
+        [(0, pytest.raises(ValueError)),
+         ('2', pytest.raises(TypeError))]
+    )
+    def test_invalid_size(self, size, expected):
+        with expected:
+            BrowserPool(size=size)
+
+    # ==============================================================================================
+    def test_sessions_are_reused(self, pool):
+        for i in range(5):
+            assert pool.get_json(f"https://example.com/{i}") == {"url": f"https://example.com/{i}"}
+        assert len(pool.started) == 1
+
+    # ==============================================================================================
+    def test_dead_session_is_replaced(self, pool):
+        pool.get_json("https://example.com/1")
+        pool.started[0]._browser.stopped = True
+        pool.get_json("https://example.com/2")
+        assert len(pool.started) == 2
+        assert pool.started[0].closed
+
+    # ==============================================================================================
+    def test_is_alive_without_browser_internals(self):
+        class _Driver:
+            gone = False
+
+            @property
+            def current_url(self):
+                if self.gone:
+                    raise ConnectionError("browser went away")
+                return "about:blank"
+
+        driver = _Driver()
+        assert BrowserPool._is_alive(driver)
+        driver.gone = True
+        assert not BrowserPool._is_alive(driver)
+
+    # ==============================================================================================
+    def test_crash_mid_request_reconnects(self, pool):
+        calls = list()
+
+        def _crash_once(driver):
+            calls.append(driver)
+            if len(calls) == 1:
+                driver._browser.stopped = True
+                raise ConnectionError("browser went away")
+            return "ok"
+
+        assert pool.run(_crash_once) == "ok"
+        assert calls[0] is not calls[1]
+
+    # ==============================================================================================
+    def test_close(self, pool):
+        with pool.session():
+            with pool.session():
+                pass
+        pool.close()
+        assert len(pool.started) == 2
+        assert all(driver.closed for driver in pool.started)
+        with pytest.raises(RuntimeError):
+            with pool.session():
+                pass
+
+    # ==============================================================================================
+    def test_close_while_borrowed(self, pool):
+        with pool.session() as borrowed:
+            with pool.session() as idle:
+                pass
+            pool.close()
+            assert idle.closed and not borrowed.closed
+            borrowed.get("https://example.com")
+        assert borrowed.closed
+        assert pool._sessions == list()
+
+
+class TestResponseCache:
+
+    # ==============================================================================================
+    @pytest.mark.parametrize(
+        'url, expected',
+        [('HTTPS://API.Sofascore.com:443/api/v1/event/1#id:1', 'https://api.sofascore.com/api/v1/event/1'),
+         ('https://fbref.com/en/?b=2&a=1', 'https://fbref.com/en/?a=1&b=2'),
+         ('http://api.clubelo.com', 'http://api.clubelo.com/')]
+    )
+    def test_normalize_url(self, url, expected):
+        assert normalize_url(url) == expected
+
+    # ==============================================================================================
+    @pytest.mark.parametrize(
+        'url, expected',
+        [('https://api.sofascore.com/api/v1/event/1', 'sofascore'),
+         ('https://www.transfermarkt.us/x', 'transfermarkt'),
+         ('http://api.clubelo.com/Arsenal', 'clubelo')]
+    )
+    def test_url_source(self, url, expected):
+        assert url_source(url) == expected
+
+    # ==============================================================================================
+    def test_read_through(self, tmp_path):
+        cache = ResponseCache(tmp_path)
+        calls = list()
+
+        def _fetch():
+            calls.append(1)
+            return "body"
+
+        assert cache.get_or_fetch("https://fbref.com/a?x=1&y=2", _fetch) == b"body"
+        assert cache.get_or_fetch("https://FBREF.com/a?y=2&x=1", _fetch) == b"body"
+        assert len(calls) == 1
+        assert cache.get_or_fetch("https://fbref.com/404", lambda: None) is None
+        assert cache.get("https://fbref.com/404") is None
+
+        # Entries survive a new cache object on the same directory
+        assert ResponseCache(tmp_path).get("https://fbref.com/a?x=1&y=2") == b"body"
+
+    # ==============================================================================================
+    @pytest.mark.parametrize('status_code, cached', [(200, True), (204, True), (403, False),
+                                                     (429, False), (503, False)])
+    def test_only_2xx_is_cached(self, tmp_path, status_code, cached):
+        cache = ResponseCache(tmp_path)
+        response = SimpleNamespace(status_code=status_code, content=b"page")
+        body = cache.get_or_fetch("https://transfermarkt.us/a", lambda: response_content(response))
+        assert body == b"page" and type(body) is bytes
+        assert (cache.get("https://transfermarkt.us/a") is not None) == cached
+
+    # ==============================================================================================
+    def test_ttl_policies(self, tmp_path):
+        cache = ResponseCache(
+            tmp_path, default_ttl=100,
+            ttl_policies={
+                "sofascore": {r"/event/\d+$": None, r"/seasons/": 0.05, r"/live": 0},
+                "clubelo": 10,
+            }
+        )
+        assert cache.ttl("https://api.sofascore.com/api/v1/event/123") is None
+        assert cache.ttl("https://api.sofascore.com/api/v1/unique-tournament/1/seasons/") == 0.05
+        assert cache.ttl("https://api.sofascore.com/api/v1/event/123/lineups") == 100
+        assert cache.ttl("http://api.clubelo.com/Arsenal") == 10
+
+        seasons_url = "https://api.sofascore.com/api/v1/unique-tournament/1/seasons/"
+        cache.set(seasons_url, "{}")
+        assert cache.get(seasons_url) == b"{}"
+        time.sleep(0.1)
+        assert cache.get(seasons_url) is None
+
+        cache.set("https://api.sofascore.com/api/v1/live", "{}")
+        assert cache.get("https://api.sofascore.com/api/v1/live") is None
+
+    # ==============================================================================================
+    def test_lru_eviction(self, tmp_path):
+        cache = ResponseCache(tmp_path, max_size=25)
+        cache.set("https://fbref.com/1", "a" * 10)
+        cache.set("https://fbref.com/2", "b" * 10)
+        cache.get("https://fbref.com/1")  # 2 is now the least recently used
+        cache.set("https://fbref.com/3", "c" * 10)
+        assert cache.get("https://fbref.com/2") is None
+        assert cache.get("https://fbref.com/1") == b"a" * 10
+        assert cache.get("https://fbref.com/3") == b"c" * 10
+        assert cache.size == 20
+        assert len(cache) == 2
+
+        cache.clear()
+        assert len(cache) == 0
+
+
+class TestRateLimiter:
+
+    # ==============================================================================================
+    @pytest.mark.parametrize(
+        'calls, period, burst, expected',
+        [(0, 1, 1, pytest.raises(ValueError)),
+         (1, 1, 0, pytest.raises(ValueError)),
+         ('1', 1, 1, pytest.raises(TypeError))]
+    )
+    def test_invalid_bucket(self, calls, period, burst, expected):
+        with expected:
+            TokenBucket(calls, period, burst)
+
+    # ==============================================================================================
+    def test_rate_holds_across_threads(self):
+        bucket = TokenBucket(calls=1, period=0.05, burst=2)
+        start = time.monotonic()
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            list(executor.map(lambda _: bucket.acquire(), range(6)))
+        elapsed = time.monotonic() - start
+        # 2 burst tokens are free, the other 4 requests wait for one token each
+        assert elapsed >= 4 * 0.05 * 0.9
+
+    # ==============================================================================================
+    def test_domains(self):
+        limiter = RateLimiter()
+        limiter.set_rate("sofascore.com", calls=1, period=1)
+        bucket = limiter.bucket("https://api.sofascore.com/api/v1/event/1")
+        assert bucket is not None
+        assert limiter.bucket("https://www.sofascore.com/") is bucket
+        assert limiter.bucket("https://fbref.com/en/") is None
+        assert limiter.wait("https://fbref.com/en/") == 0
+
+        limiter.remove_rate("sofascore.com")
+        assert limiter.bucket("https://api.sofascore.com/api/v1/event/1") is None
+
+    # ==============================================================================================
+    def test_default_limits(self):
+        sofascore = get_rate_limit("https://api.sofascore.com/api/v1/event/1")
+        assert sofascore is not None and sofascore.rate == 2
+        assert get_rate_limit("https://fbref.com/en/") is not None
+
+    # ==============================================================================================
+    def test_same_rate_keeps_bucket(self):
+        limiter = RateLimiter()
+        limiter.set_rate("fbref.com", calls=1, period=6)
+        bucket = limiter.bucket("https://fbref.com/en/")
+        bucket.acquire()  # type: ignore
+        limiter.set_rate("www.fbref.com", calls=10, period=60)  # same rate, tokens aren't reset
+        assert limiter.bucket("https://fbref.com/en/") is bucket
+        limiter.set_rate("fbref.com", calls=1, period=3)
+        assert limiter.bucket("https://fbref.com/en/") is not bucket
+
+
+class TestHtmlParser:
+
+    # ==============================================================================================
+    @pytest.mark.parametrize(
+        'parser, expected',
+        [('html5lib', pytest.raises(ValueError)),
+         (None, pytest.raises(TypeError))]
+    )
+    def test_invalid_parser(self, parser, expected):
+        with expected:
+            set_html_parser(parser)
+
+    # ==============================================================================================
+    def test_set_html_parser(self):
+        try:
+            set_html_parser("lxml")
+            assert get_html_parser() == "lxml"
+            assert make_soup("<p>a</p>").find("p").text == "a"
+        finally:
+            set_html_parser("html.parser")
+
+
+class TestSeasonCatalog:
+
+    # ==============================================================================================
+    @pytest.mark.parametrize(
+        'ttl, expected',
+        [(-1, pytest.raises(ValueError)),
+         ('1', pytest.raises(TypeError))]
+    )
+    def test_invalid_ttl(self, ttl, expected):
+        with expected:
+            SeasonCatalog(ttl=ttl)
+
+    # ==============================================================================================
+    def test_get_or_fetch(self):
+        catalog = SeasonCatalog(ttl=None)
+        calls = list()
+
+        def _fetch():
+            calls.append(1)
+            return {"2023-2024": "url"}
+
+        seasons = catalog.get_or_fetch("EPL", _fetch)
+        seasons["2024-2025"] = "changed"  # callers get a copy
+        assert catalog.get_or_fetch("EPL", _fetch) == {"2023-2024": "url"}
+        assert len(calls) == 1 and "EPL" in catalog
+
+        catalog.invalidate("EPL")
+        assert "EPL" not in catalog
+        catalog.get_or_fetch("EPL", _fetch)
+        assert len(calls) == 2
+
+    # ==============================================================================================
+    def test_expiry(self):
+        catalog = SeasonCatalog(ttl=0.05)
+        calls = list()
+        catalog.get_or_fetch("EPL", lambda: calls.append(1) or ["2024"])
+        time.sleep(0.1)
+        catalog.get_or_fetch("EPL", lambda: calls.append(1) or ["2024"])
+        assert len(calls) == 2
+
+        uncached = SeasonCatalog(ttl=0)
+        uncached.get_or_fetch("EPL", lambda: ["2024"])
+        assert "EPL" not in uncached
+
+
+class TestCheckpointStore:
+
+    # ==============================================================================================
+    def test_save_and_load(self, tmp_path):
+        with CheckpointStore(tmp_path / "checkpoints.sqlite") as store:
+            store.save("a", "1", {"x": 1})
+            store.save("a", "2", [2])
+            store.save("b", "1", "other")
+            store.save("a", "1", {"x": 3})  # replaces
+            assert store.load("a", "1") == {"x": 3}
+            with pytest.raises(KeyError):
+                store.load("a", "3")
+
+        # Results survive reopening the file
+        with CheckpointStore(tmp_path / "checkpoints.sqlite") as store:
+            assert store.items("a") == {"2": [2], "1": {"x": 3}}
+            assert store.keys("b") == ["1"]
+            store.clear("a")
+            assert store.items("a") == {}
+            assert store.keys("b") == ["1"]
+            store.clear()
+            assert store.keys("b") == []
+
+
+class TestXpathSoup:
+
+    # ==============================================================================================
+    @pytest.mark.parametrize('parser', ['html.parser', 'lxml'])
+    def test_batch_matches_single(self, parser):
+        html = (
+            "<html><head><title>t</title></head><body><div><p>a <i>1</i></p><p>b <i>2</i><br/>"
+            "</p><table><tr><td>x</td><td>y</td></tr><tr><td>z</td></tr></table></div>"
+            "<div><span>s</span>tail</div><!-- comment --></body></html>"
+        )
+        soup = make_soup(html) if parser == 'html.parser' else BeautifulSoup(html, parser)
+        elements = list(soup.descendants)
+        elements = elements[::-1] + elements[:5] + [soup]  # any order, repeats are fine
+        assert xpath_soup_batch(elements) == [xpath_soup(el) for el in elements]
+        assert xpath_soup_batch([]) == []
+
+
+class TestFlattenDictColumns:
+
+    # ==============================================================================================
+    def test_matches_apply_series(self):
+        df = pd.DataFrame({
+            "id": [1, 2, 3],
+            "player": [
+                {"id": 7, "name": "A", "team": {"id": 1}, "rating": 7.5},
+                {"id": 8, "name": None, "team": {"id": 2}, "shirt": 10},
+                {"id": 9, "name": "C", "team": None, "rating": 6},
+            ],
+            "stats": [{"goals": 1}, {"goals": 0}, {}],
+        }, index=[4, 5, 6])
+        expected = pd.concat(
+            [df["id"], df["player"].apply(pd.Series).add_prefix("player_"),
+             df["stats"].apply(pd.Series).add_prefix("stats_")],
+            axis=1
+        )
+        pd.testing.assert_frame_equal(flatten_dict_columns(df), expected)
+
+        expected = pd.concat([df["id"], df["player"].apply(pd.Series), df["stats"]], axis=1)
+        pd.testing.assert_frame_equal(flatten_dict_columns(df, ["player"], sep=None), expected)
+
+    # ==============================================================================================
+    def test_missing_rows_and_no_dicts(self):
+        df = pd.DataFrame({"a": [{"x": 1}, None], "b": [1, 2]})
+        flat = flatten_dict_columns(df)
+        assert flat.columns.tolist() == ["a_x", "b"]
+        assert flat["a_x"].isna().tolist() == [False, True]
+        assert flatten_dict_columns(pd.DataFrame({"b": [1]})).equals(pd.DataFrame({"b": [1]}))
+        with pytest.raises(TypeError):
+            flatten_dict_columns([{"a": 1}])
+
+
+class TestRecordsToArrow:
+
+    # ==============================================================================================
+    def test_records_to_arrow(self):
+        pytest.importorskip("pyarrow")
+        df = pd.DataFrame({
+            "player": [{"id": 1, "team": {"id": 5}}, None],
+            "coords": [[1, 2], None],
+            "value": [1, "1.5"],
+        })
+        table = records_to_arrow(df)
+        assert table.column_names == ["player.id", "player.team.id", "coords", "value"]
+        assert table.column("coords").to_pylist() == ["[1, 2]", None]
+        assert table.column("value").to_pylist() == ["1", "1.5"]
+        assert table.column("player.team.id").to_pylist() == [5, None]
+        with pytest.raises(TypeError):
+            records_to_arrow([{"a": 1}])
+
+    # ==============================================================================================
+    def test_write_partition(self, tmp_path):
+        pa = pytest.importorskip("pyarrow")
+        pq = pytest.importorskip("pyarrow.parquet")
+        schema = write_partition(pa.table({"a": [1, 2], "b": [None, None]}), tmp_path, "p=1")
+        schema = write_partition(pa.table({"a": [1.5], "c": ["x"]}), tmp_path, "p=2", schema)
+        assert schema == pa.schema([("a", pa.float64()), ("b", pa.null()), ("c", pa.string())])
+        assert pq.read_schema(tmp_path / "p=1" / "part-0.parquet") == schema
+
+        # Without a schema, e.g. when a crawl is resumed, it's read from the partitions
+        schema = write_partition(pa.table({"a": ["?"], "b": [True]}), tmp_path, "p=3")
+        assert schema == pa.schema([("a", pa.string()), ("b", pa.bool_()), ("c", pa.string())])
+        rows = sorted(pq.read_table(tmp_path).to_pylist(), key=lambda row: (row["p"], row["a"]))
+        assert [row["a"] for row in rows] == ["1", "2", "1.5", "?"]
+        assert [row["b"] for row in rows] == [None, None, None, True]
+        with pytest.raises(TypeError):
+            write_partition(pa.table({"a": [1]}), tmp_path, 4)